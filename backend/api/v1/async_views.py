@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.urls import URLPattern
+
+# Методы, которые выполняются в пуле потоков чтения.
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _run_view(view: Callable, request: Any, *args, **kwargs) -> Any:
+    """
+    Выполняет синхронное представление в потоке пула и отрисовывает
+    ответ DRF там же, закрывая устаревшие соединения с БД потока.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+@lru_cache(maxsize=None)
+def get_read_executor() -> ThreadPoolExecutor:
+    """
+    Возвращает пул потоков асинхронных представлений чтения размером
+    ASYNC_READ_THREADS, общий для процесса.
+    """
+    return ThreadPoolExecutor(max_workers=settings.ASYNC_READ_THREADS,
+                              thread_name_prefix='read-view')
+
+
+def async_view(view: Callable) -> Callable:
+    """
+    Оборачивает синхронное DRF-представление в асинхронное.
+
+    В Django 3.2 нет асинхронного ORM, а DRF не поддерживает
+    асинхронные представления, поэтому запросы к БД и кэшу
+    выполняются в отдельном пуле потоков (get_read_executor, размер
+    задаёт настройка ASYNC_READ_THREADS).
+    Под ASGI синхронные представления Django выполняет в одном
+    общем потоке, а такие представления – параллельно, и один
+    процесс uvicorn обслуживает несколько запросов одновременно.
+    В пуле выполняются только запросы READ_METHODS: запросы на запись
+    к тому же маршруту выполняются, как обычные синхронные
+    представления, в общем потоке.
+
+    Args:
+        view: Синхронное представление.
+
+    Returns:
+        Асинхронное представление.
+    """
+    run_read = sync_to_async(partial(_run_view, view),
+                             thread_sensitive=False,
+                             executor=get_read_executor())
+    run_write = sync_to_async(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        run = run_read if request.method in READ_METHODS else run_write
+        return await run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def read_view(view: Callable) -> Callable:
+    """
+    Возвращает асинхронную версию представления, если включена
+    настройка ASYNC_READ_VIEWS (профиль uvicorn), иначе само
+    представление.
+    """
+    return async_view(view) if settings.ASYNC_READ_VIEWS else view
+
+
+def read_route(url: URLPattern) -> URLPattern:
+    """Возвращает маршрут с представлением, обёрнутым в read_view."""
+    return URLPattern(url.pattern, read_view(url.callback),
+                      url.default_args, url.name)
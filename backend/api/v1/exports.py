@@ -0,0 +1,276 @@
+import csv
+import hashlib
+import json
+import os
+from datetime import timedelta
+from io import BytesIO
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Model, QuerySet, prefetch_related_objects
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import (PageBreak, Paragraph, SimpleDocTemplate,
+                                Spacer, Table, TableStyle)
+
+from core.constants.settings import (EXPORT_CHUNK_SIZE, EXPORT_DIR,
+                                     EXPORT_JOB_TTL)
+from core.models import ExportJob
+
+EXPORT_JOB_FIELDS = ('user_id', 'status', 'path')
+EXPORT_PENDING = 'pending'
+EXPORT_DONE = 'done'
+EXPORT_FAILED = 'failed'
+EXPORT_FONT_NAME = 'ExportFont'
+# Поля, зависящие от пользователя, не попадают в файл и в его хэш.
+EXPORT_EXCLUDED_FIELDS = ('is_favorited', 'is_in_compare_list')
+EXPORT_FIELDS = (
+    ('Локация', 'location'),
+    ('Электронная почта', 'email'),
+    ('Пол', 'sex'),
+    ('Возраст', 'age'),
+    ('Telegram', 'telegram'),
+    ('Телефон', 'phone_number'),
+    ('Направление', 'specialization'),
+    ('Курс', 'course'),
+    ('Грейд', 'education_level'),
+    ('График работы', 'schedule'),
+    ('Навыки', 'skills'),
+    ('Опыт работы', 'experience'),
+)
+CSV_EXPORT_COLUMNS = (
+    ('ID', lambda student: student.id),
+    ('Фамилия', lambda student: student.last_name),
+    ('Имя', lambda student: student.first_name),
+    ('Электронная почта', lambda student: student.email),
+    ('Локация', lambda student: student.location.name),
+    ('Пол', lambda student: student.get_sex_display()),
+    ('Возраст', lambda student: student.age),
+    ('Telegram', lambda student: student.telegram),
+    ('Телефон', lambda student: student.phone_number),
+    ('Направление', lambda student: student.specialization.name),
+    ('Курс', lambda student: student.course.name),
+    ('Грейд', lambda student: student.education_level.name),
+    ('График работы', lambda student: ', '.join(
+        schedule.name for schedule in student.schedule.all())),
+    ('Навыки', lambda student: ', '.join(
+        skill.name for skill in student.skills.all())),
+)
+CSV_EXPORT_RELATED = ('location', 'specialization', 'course',
+                      'education_level')
+CSV_EXPORT_PREFETCH = ('skills', 'schedule')
+
+
+def prepare_export_data(students: List[Dict]) -> List[Dict]:
+    """Убирает из данных StudentDetailSerializer поля пользователя."""
+    return [
+        {key: value for key, value in student.items()
+         if key not in EXPORT_EXCLUDED_FIELDS}
+        for student in students
+    ]
+
+
+def get_content_hash(students: List[Dict]) -> str:
+    """Возвращает SHA-256 данных экспорта, по которому именуется файл."""
+    content = json.dumps(students, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_export_path(content_hash: str) -> str:
+    """Возвращает путь к PDF-файлу в хранилище MEDIA_ROOT."""
+    return f'{EXPORT_DIR}/{content_hash}.pdf'
+
+
+def _expired_before():
+    return timezone.now() - timedelta(seconds=EXPORT_JOB_TTL)
+
+
+def get_export_job(job_id: str) -> Optional[Dict]:
+    """
+    Возвращает состояние задачи экспорта из БД или None, если задачи
+    нет или она старше EXPORT_JOB_TTL.
+    """
+    return ExportJob.objects.filter(
+        pk=job_id, created__gte=_expired_before()
+    ).values(*EXPORT_JOB_FIELDS).first()
+
+
+def create_export_job(job_id: str, user_id: int, status: str,
+                      path: str = '') -> Dict:
+    """
+    Создаёт задачу экспорта и возвращает её состояние. Заодно удаляет
+    задачи старше EXPORT_JOB_TTL.
+    """
+    ExportJob.objects.filter(created__lt=_expired_before()).delete()
+    ExportJob.objects.create(id=job_id, user_id=user_id, status=status,
+                             path=path)
+    return {'user_id': user_id, 'status': status, 'path': path}
+
+
+def update_export_job(job_id: str, **fields) -> None:
+    """Обновляет состояние задачи экспорта (status, path)."""
+    ExportJob.objects.filter(pk=job_id).update(**fields)
+
+
+def _get_font_name() -> str:
+    """
+    Регистрирует шрифт с кириллицей из PDF_FONT_PATH. Если файла нет,
+    используется встроенный Helvetica.
+    """
+    if EXPORT_FONT_NAME in pdfmetrics.getRegisteredFontNames():
+        return EXPORT_FONT_NAME
+    if not os.path.exists(settings.PDF_FONT_PATH):
+        return 'Helvetica'
+    pdfmetrics.registerFont(TTFont(EXPORT_FONT_NAME, settings.PDF_FONT_PATH))
+    return EXPORT_FONT_NAME
+
+
+def _format_value(value) -> str:
+    """Приводит значение поля сериализатора к строке для PDF."""
+    if isinstance(value, list):
+        return ', '.join(_format_value(item) for item in value)
+    if isinstance(value, dict):
+        return escape(str(value.get('name', '')))
+    if value is None:
+        return ''
+    return escape(str(value))
+
+
+def render_students_pdf(students: List[Dict]) -> bytes:
+    """
+    Формирует PDF с профилями студентов, каждый на отдельной странице.
+
+    Args:
+        students (list): Данные StudentDetailSerializer.
+
+    Returns:
+        bytes: Содержимое PDF-файла.
+    """
+    font_name = _get_font_name()
+    styles = getSampleStyleSheet()
+    title_style = styles['Title'].clone('ExportTitle', fontName=font_name)
+    text_style = styles['BodyText'].clone('ExportText', fontName=font_name)
+
+    story = []
+    for index, student in enumerate(students):
+        if index:
+            story.append(PageBreak())
+        story.append(Paragraph(
+            escape(f"{student['last_name']} {student['first_name']}"),
+            title_style))
+        story.append(Spacer(1, 5 * mm))
+        rows = [
+            [Paragraph(label, text_style),
+             Paragraph(_format_value(student.get(field)), text_style)]
+            for label, field in EXPORT_FIELDS
+        ]
+        table = Table(rows, colWidths=(45 * mm, 125 * mm))
+        table.setStyle(TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.25, '#cccccc'),
+        ]))
+        story.append(table)
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title='CareerHub').build(story)
+    return buffer.getvalue()
+
+
+class Echo:
+    """Псевдобуфер для csv.writer: возвращает строку вместо записи."""
+
+    @staticmethod
+    def write(value: str) -> str:
+        return value
+
+
+def iter_in_chunks(objects: Iterable[Model],
+                   chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Model]:
+    """
+    Отдаёт объекты пачками по chunk_size, загружая для каждой пачки
+    навыки и графики работы (CSV_EXPORT_PREFETCH).
+
+    QuerySet.iterator() в Django 3.2 не выполняет prefetch_related,
+    поэтому связи загружаются через prefetch_related_objects для
+    каждой пачки отдельно и в памяти не накапливаются.
+    """
+    chunk = []
+    for obj in objects:
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            prefetch_related_objects(chunk, *CSV_EXPORT_PREFETCH)
+            yield from chunk
+            chunk = []
+    if chunk:
+        prefetch_related_objects(chunk, *CSV_EXPORT_PREFETCH)
+        yield from chunk
+
+
+def iter_queryset(queryset: QuerySet,
+                  chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Model]:
+    """Потоково читает queryset студентов с загрузкой связей по пачкам."""
+    return iter_in_chunks(
+        queryset.select_related(*CSV_EXPORT_RELATED).iterator(
+            chunk_size=chunk_size),
+        chunk_size
+    )
+
+
+def stream_students_csv(students: Iterable[Model], filename: str,
+                        extra_columns=()) -> StreamingHttpResponse:
+    """
+    Возвращает потоковый CSV-ответ со студентами.
+
+    Строки формируются по мере чтения students, поэтому расход памяти
+    не зависит от количества студентов. Файл начинается с BOM, чтобы
+    Excel правильно открывал кириллицу.
+
+    Args:
+        students: Итератор студентов (см. iter_queryset).
+        filename (str): Имя файла без расширения.
+        extra_columns: Дополнительные колонки (заголовок, функция).
+
+    Returns:
+        StreamingHttpResponse: Ответ с CSV-файлом.
+    """
+    columns: List[tuple] = list(CSV_EXPORT_COLUMNS) + list(extra_columns)
+    writer = csv.writer(Echo())
+
+    def rows() -> Iterator[str]:
+        yield '\ufeff' + writer.writerow(
+            [header for header, _ in columns])
+        for student in students:
+            yield writer.writerow([value(student) for _, value in columns])
+
+    response = StreamingHttpResponse(rows(),
+                                     content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}.csv"')
+    return response
+
+
+def iter_ranked_students(queryset: QuerySet, ranking: List[int],
+                         chunk_size: int = EXPORT_CHUNK_SIZE
+                         ) -> Iterator[Model]:
+    """
+    Отдаёт студентов из queryset в порядке ranking, загружая их
+    пачками по chunk_size ID.
+
+    Args:
+        queryset (QuerySet): Студенты с применёнными фильтрами.
+        ranking (list): ID студентов в порядке подбора.
+        chunk_size (int): Размер пачки.
+    """
+    queryset = queryset.select_related(*CSV_EXPORT_RELATED)
+    for start in range(0, len(ranking), chunk_size):
+        ids = ranking[start:start + chunk_size]
+        students = queryset.in_bulk(ids)
+        chunk = [students[pk] for pk in ids if pk in students]
+        prefetch_related_objects(chunk, *CSV_EXPORT_PREFETCH)
+        yield from chunk
@@ -1,8 +1,32 @@
+from typing import Optional
+
 from rest_framework.permissions import BasePermission
 
+from core.identity_map import get_identity_map
 from vacancies.models import Vacancy
 
 
+def get_request_vacancy(request, vacancy_id) -> Optional[Vacancy]:
+    """
+    Возвращает вакансию с требуемыми навыками из карты идентичности
+    запроса.
+
+    Вакансия загружается один раз за запрос и используется
+    разрешением IsVacancyAuthorOrAdmin, MatchingStudentsViewSet и
+    MatchingStudentSerializer.
+
+    Args:
+        request: Запрос пользователя.
+        vacancy_id: ID вакансии.
+
+    Returns:
+        Vacancy | None: Вакансия или None, если её не существует.
+    """
+    return get_identity_map(request).get(
+        Vacancy.objects.prefetch_related('required_skills'), vacancy_id
+    )
+
+
 class IsAuthorOrAdmin(BasePermission):
     """
     Пользовательское разрешение для доступа только автору и администратору.
@@ -56,13 +80,12 @@ class IsVacancyAuthorOrAdmin(BasePermission):
         # Проверяем является ли пользователь автором вакансии.
         if request.user.is_anonymous:
             return False
-        vacancy_id = view.kwargs.get('vacancy_id')
-        try:
-            vacancy = Vacancy.objects.get(id=vacancy_id)
-        except Vacancy.DoesNotExist:
+        vacancy = get_request_vacancy(request, view.kwargs.get('vacancy_id'))
+        if vacancy is None:
             return False
 
-        return vacancy.author == request.user or request.user.is_admin
+        return (vacancy.author_id == request.user.id
+                or request.user.is_admin)
 
 
 class IsAdminUser(BasePermission):
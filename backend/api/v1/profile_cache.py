@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+
+from api.v1.serializers import StudentDetailSerializer
+from core.cache import TwoLevelCache
+from core.constants.settings import (STUDENT_PROFILE_CACHE_SIZE,
+                                     STUDENT_PROFILE_LOCAL_TTL)
+from core.constants.shared_info import REFERENCE_TAGS
+from students.models import Student
+
+student_profiles = TwoLevelCache('student_profile',
+                                 STUDENT_PROFILE_CACHE_SIZE,
+                                 STUDENT_PROFILE_LOCAL_TTL)
+
+
+def build_student_profile(request: Any, pk: int) -> Optional[Dict]:
+    """
+    Сериализует профиль студента без данных текущего пользователя.
+
+    Флаги is_favorited и is_in_compare_list в кэшированном профиле
+    всегда False и заменяются после чтения (get_student_profile).
+    """
+    student = Student.objects.filter(pk=pk).prefetch_related(
+        'skills', 'schedule').first()
+    if student is None:
+        return None
+    return StudentDetailSerializer(student, context={
+        'request': request,
+        'favorite_student_ids': set(),
+        'compare_student_ids': set(),
+    }).data
+
+
+def get_student_profile(request: Any, pk: int) -> Optional[Dict]:
+    """
+    Возвращает профиль студента (данные StudentDetailSerializer) из
+    двухуровневого кэша с флагами избранного и сравнения для
+    текущего пользователя.
+
+    Args:
+        request: Запрос текущего пользователя.
+        pk (int): ID студента.
+
+    Returns:
+        dict | None: Профиль или None, если студента нет.
+    """
+    profile = student_profiles.get(
+        pk, (f'student:{pk}', *REFERENCE_TAGS.values()),
+        lambda: build_student_profile(request, pk)
+    )
+    if profile is None:
+        return None
+    # Профиль из кэша процесса общий, поэтому флаги ставятся в копию.
+    profile = dict(profile)
+    StudentDetailSerializer(context={'request': request}).update_member_flags(
+        [profile])
+    return profile
@@ -0,0 +1,195 @@
+import gzip
+import json
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+from core.cache import LRUCache, make_versioned_key
+from core.constants.settings import (DASHBOARD_TOP_SKILLS,
+                                     READ_MODEL_CACHE_TTL)
+from core.db_router import use_primary
+from shared_info.models import (Course, EducationLevel, Location, Schedule,
+                                Skill, Specialization)
+from students.models import Student, StudentSkills
+from vacancies.models import ArchivedVacancy, Vacancy, VacancySkill
+
+READ_MODEL_KEY = 'read_model'
+REFERENCE_MODELS = (
+    ('skills', Skill),
+    ('locations', Location),
+    ('schedules', Schedule),
+    ('education_levels', EducationLevel),
+    ('specializations', Specialization),
+    ('courses', Course),
+)
+REFERENCE_VERSION = 'reference'
+STUDENT_FACETS = ('location', 'education_level', 'specialization', 'course',
+                  'schedule', 'skills')
+
+
+def get_read_model(key: str, versions, build: Callable[[], Any],
+                   refresh: bool = False) -> Any:
+    """
+    Возвращает предрассчитанную модель чтения из кэша.
+
+    Ключ содержит версии наборов данных versions, которые меняются
+    сигналами при записи, поэтому устаревшие значения не читаются.
+    При промахе значение строится функцией build и сохраняется.
+    Значение строится по основной базе: отстающая реплика сохранила
+    бы в кэш устаревшие данные под новой версией.
+
+    Args:
+        key (str): Ключ модели чтения.
+        versions: Наборы данных, от которых зависит значение.
+        build: Функция построения значения.
+        refresh (bool): Построить значение заново, даже если оно
+        уже есть в кэше.
+
+    Returns:
+        Значение модели чтения.
+    """
+    cache = caches[settings.CACHE_BACKEND]
+    cache_key = make_versioned_key(f'{READ_MODEL_KEY}:{key}', *versions)
+    value = None if refresh else cache.get(cache_key)
+    if value is None:
+        with use_primary():
+            value = build()
+        cache.set(cache_key, value, timeout=READ_MODEL_CACHE_TTL)
+    return value
+
+
+def build_reference_bundle() -> Dict[str, List[Dict]]:
+    """Собирает все справочники (навыки, локации и т.д.) в один словарь."""
+    return {
+        name: list(model.objects.order_by('name').values('id', 'name'))
+        for name, model in REFERENCE_MODELS
+    }
+
+
+def build_reference_payload() -> Dict[str, bytes]:
+    """
+    Сериализует набор справочников в JSON и сжимает его gzip.
+
+    Returns:
+        dict: Тело ответа в body и его сжатая версия в gzip.
+    """
+    body = json.dumps(get_reference_bundle(), ensure_ascii=False,
+                      separators=(',', ':')).encode()
+    return {'body': body, 'gzip': gzip.compress(body)}
+
+
+def build_facet_counts() -> Dict[str, List[Dict]]:
+    """Считает количество студентов по значениям каждого фильтра."""
+    facets = {}
+    for field in STUDENT_FACETS:
+        facets[field] = [
+            {'id': row[f'{field}__id'], 'name': row[f'{field}__name'],
+             'count': row['count']}
+            for row in Student.objects.filter(
+                **{f'{field}__isnull': False}
+            ).values(f'{field}__id', f'{field}__name').annotate(
+                count=Count('id', distinct=True)
+            ).order_by('-count', f'{field}__name')
+        ]
+    return facets
+
+
+def build_dashboard() -> Dict[str, Any]:
+    """
+    Собирает сводку для администратора: количество студентов и
+    вакансий, а также самые востребованные навыки со спросом
+    (вакансии) и предложением (студенты).
+    """
+    demand = list(
+        VacancySkill.objects.values('skill_id', 'skill__name').annotate(
+            vacancies=Count('vacancy_id')
+        ).order_by('-vacancies', 'skill__name')[:DASHBOARD_TOP_SKILLS]
+    )
+    supply = dict(
+        StudentSkills.objects.filter(
+            skill_id__in=[row['skill_id'] for row in demand]
+        ).values('skill_id').annotate(
+            students=Count('student_id')
+        ).values_list('skill_id', 'students')
+    )
+    return {
+        'students': Student.objects.count(),
+        'vacancies': Vacancy.objects.count(),
+        'archived_vacancies': ArchivedVacancy.objects.count(),
+        'top_skills': [
+            {'id': row['skill_id'], 'name': row['skill__name'],
+             'vacancies': row['vacancies'],
+             'students': supply.get(row['skill_id'], 0)}
+            for row in demand
+        ],
+    }
+
+
+def build_matching_ranking(vacancy_id: int) -> List[List[int]]:
+    """
+    Рассчитывает подбор студентов для вакансии.
+
+    Returns:
+        list: Пары [ID студента, количество совпавших навыков],
+        отсортированные по убыванию совпадений.
+    """
+    required_skill_ids = VacancySkill.objects.filter(
+        vacancy_id=vacancy_id).values('skill_id')
+    return [
+        list(row) for row in StudentSkills.objects.filter(
+            skill_id__in=required_skill_ids
+        ).values('student_id').annotate(
+            common=Count('skill_id', distinct=True)
+        ).order_by('-common', 'student_id').values_list(
+            'student_id', 'common')
+    ]
+
+
+def get_reference_bundle(refresh: bool = False) -> Dict[str, List[Dict]]:
+    return get_read_model('reference', (REFERENCE_VERSION,),
+                          build_reference_bundle, refresh)
+
+
+# Готовые ответы справочников в памяти процесса по версии reference.
+_reference_payloads = LRUCache(maxsize=2)
+
+
+def get_reference_payload(version: int,
+                          refresh: bool = False) -> Dict[str, bytes]:
+    """
+    Возвращает сериализованный и сжатый набор справочников.
+
+    Ответ хранится в общем кэше и в памяти процесса по версии
+    reference, поэтому повторные запросы не сериализуют и не сжимают
+    справочники заново.
+
+    Args:
+        version (int): Текущая версия reference.
+        refresh (bool): Построить ответ заново.
+    """
+    payload = None if refresh else _reference_payloads.get(version)
+    if payload is None:
+        payload = get_read_model('reference_payload', (REFERENCE_VERSION,),
+                                 build_reference_payload, refresh)
+        _reference_payloads.set(version, payload)
+    return payload
+
+
+def get_facet_counts(refresh: bool = False) -> Dict[str, List[Dict]]:
+    return get_read_model('facets', ('students', 'reference'),
+                          build_facet_counts, refresh)
+
+
+def get_dashboard(refresh: bool = False) -> Dict[str, Any]:
+    return get_read_model('dashboard', ('students', 'vacancies', 'reference'),
+                          build_dashboard, refresh)
+
+
+def get_matching_ranking(vacancy_id: int,
+                         refresh: bool = False) -> List[List[int]]:
+    return get_read_model(
+        f'matching:{vacancy_id}', ('students', f'vacancy:{vacancy_id}'),
+        lambda: build_matching_ranking(vacancy_id), refresh
+    )
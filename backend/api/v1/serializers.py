@@ -1,11 +1,17 @@
-from typing import Dict, List
+from typing import Any, Dict, List, Set
 
-from rest_framework.fields import IntegerField, SerializerMethodField
+from rest_framework.fields import (BooleanField, IntegerField, ListField,
+                                   SerializerMethodField)
 from rest_framework.serializers import (ModelSerializer, CharField,
-                                        ValidationError)
+                                        Serializer, ValidationError)
+
+from api.v1.permissions import get_request_vacancy
+from core.constants.students import STUDENT_BATCH_MAX_SIZE
+from core.images import SrcsetField
 
 from shared_info.models import (Schedule, EducationLevel, Course,
                                 Specialization, Location)
+from shared_info.registry import reference_registry
 from students.models import Student, Skill, FavoriteStudent, CompareStudent
 from users.serializers import CustomUserSerializer
 from vacancies.models import (Vacancy, VacancySkill, VacancyEducationLevel,
@@ -17,7 +23,24 @@ from vacancies.models import (Vacancy, VacancySkill, VacancyEducationLevel,
 # ----------------------------------------------------------------------------
 
 
-class SkillSerializer(ModelSerializer):
+class ReferenceSerializer(ModelSerializer):
+    """
+    Базовый сериализатор справочника.
+
+    Для вывода принимает объект модели или только его ID (например,
+    source='location_id'): тогда запись берётся из reference_registry
+    без запроса к БД.
+    """
+
+    def to_representation(self, instance: Any) -> Dict:
+        if isinstance(instance, int):
+            model = self.Meta.model
+            instance = (reference_registry.get(model, instance)
+                        or model.objects.get(pk=instance))
+        return super().to_representation(instance)
+
+
+class SkillSerializer(ReferenceSerializer):
     """
     Сериализатор для модели Skill.
 
@@ -34,7 +57,7 @@ class SkillSerializer(ModelSerializer):
         }
 
 
-class EducationLevelSerializer(ModelSerializer):
+class EducationLevelSerializer(ReferenceSerializer):
     """
     Сериализатор для модели EducationLevel.
 
@@ -51,7 +74,7 @@ class EducationLevelSerializer(ModelSerializer):
         }
 
 
-class CourseSerializer(ModelSerializer):
+class CourseSerializer(ReferenceSerializer):
     """
     Сериализатор для модели Course.
 
@@ -68,7 +91,7 @@ class CourseSerializer(ModelSerializer):
         }
 
 
-class SpecializationSerializer(ModelSerializer):
+class SpecializationSerializer(ReferenceSerializer):
     """
     Сериализатор для модели Specialization.
 
@@ -85,7 +108,7 @@ class SpecializationSerializer(ModelSerializer):
         }
 
 
-class ScheduleSerializer(ModelSerializer):
+class ScheduleSerializer(ReferenceSerializer):
     """
     Сериализатор для модели Schedule.
 
@@ -102,7 +125,7 @@ class ScheduleSerializer(ModelSerializer):
         }
 
 
-class LocationSerializer(ModelSerializer):
+class LocationSerializer(ReferenceSerializer):
     """
     Сериализатор для модели Location.
 
@@ -142,14 +165,29 @@ class StudentDetailSerializer(ModelSerializer):
         курса студента.
         - location (LocationSerializer, read-only): Сериализатор для
         местоположения студента.
+        - avatar_srcset (SrcsetField): Миниатюры фото в WebP и JPEG
+        в формате srcset или None, если они ещё не готовы.
+        - is_favorited (bool): Добавлен ли студент в избранное.
+        - is_in_compare_list (bool): Добавлен ли студент в сравнение.
+
+    Context:
+        - request: Запрос текущего пользователя.
+        - favorite_student_ids (set, optional): ID студентов в избранном
+        пользователя. Если не передано, загружается одним запросом.
+        - compare_student_ids (set, optional): ID студентов в списке
+        сравнения пользователя. Если не передано, загружается одним
+        запросом.
     """
     skills = SkillSerializer(many=True, read_only=True)
     sex = CharField(source='get_sex_display')
     schedule = ScheduleSerializer(many=True, read_only=True)
-    specialization = SpecializationSerializer(read_only=True)
-    education_level = EducationLevelSerializer(read_only=True)
-    course = CourseSerializer(read_only=True)
-    location = LocationSerializer(read_only=True)
+    specialization = SpecializationSerializer(source='specialization_id',
+                                              read_only=True)
+    education_level = EducationLevelSerializer(source='education_level_id',
+                                               read_only=True)
+    course = CourseSerializer(source='course_id', read_only=True)
+    location = LocationSerializer(source='location_id', read_only=True)
+    avatar_srcset = SrcsetField()
     is_favorited = SerializerMethodField()
     is_in_compare_list = SerializerMethodField()
 
@@ -158,6 +196,7 @@ class StudentDetailSerializer(ModelSerializer):
         fields = (
             'id',
             'avatar',
+            'avatar_srcset',
             'last_name',
             'first_name',
             'location',
@@ -176,19 +215,62 @@ class StudentDetailSerializer(ModelSerializer):
             'is_in_compare_list'
         )
 
+    def get_member_student_ids(self, key: str, model) -> Set[int]:
+        """
+        Возвращает множество ID студентов из избранного или списка
+        сравнения текущего пользователя.
+
+        Множество загружается одним запросом при первом обращении и
+        сохраняется в context под ключом key, поэтому при сериализации
+        списка проверка принадлежности выполняется без запросов к БД.
+        Представление может передать готовое множество через context.
+
+        Args:
+            key (str): Ключ в context (favorite_student_ids или
+            compare_student_ids).
+            model: Модель FavoriteStudent или CompareStudent.
+
+        Returns:
+            Set[int]: Множество ID студентов.
+        """
+        if key not in self.context:
+            request = self.context.get('request')
+            user = getattr(request, 'user', None)
+            self.context[key] = set(
+                model.objects.filter(user=user).values_list('student_id',
+                                                            flat=True)
+            ) if user and user.is_authenticated else set()
+        return self.context[key]
+
+    def update_member_flags(self, students: List[Dict]) -> None:
+        """
+        Заменяет is_favorited и is_in_compare_list в готовых данных
+        студентов (например, в ответе из кэша) значениями для текущего
+        пользователя.
+
+        Args:
+            students (List[Dict]): Данные сериализатора.
+        """
+        flags = (
+            ('is_favorited', 'favorite_student_ids', FavoriteStudent),
+            ('is_in_compare_list', 'compare_student_ids', CompareStudent),
+        )
+        for field, key, model in flags:
+            if field not in self.Meta.fields:
+                continue
+            student_ids = self.get_member_student_ids(key, model)
+            for student in students:
+                student[field] = student['id'] in student_ids
+
     def get_is_favorited(self, student: Student) -> bool:
         """Указывает, добавлен ли студент в избранные текущим пользователем."""
-        return ((user := self.context.get('request').user)
-                and user.is_authenticated
-                and FavoriteStudent.objects.filter(user=user,
-                                                   student=student).exists())
+        return student.id in self.get_member_student_ids(
+            'favorite_student_ids', FavoriteStudent)
 
     def get_is_in_compare_list(self, student: Student) -> bool:
         """Указывает, добавлен ли студент в сравнение текущим пользователем."""
-        return ((user := self.context.get('request').user)
-                and user.is_authenticated
-                and CompareStudent.objects.filter(user=user,
-                                                  student=student).exists())
+        return student.id in self.get_member_student_ids(
+            'compare_student_ids', CompareStudent)
 
 
 class StudentSerializer(StudentDetailSerializer):
@@ -209,6 +291,7 @@ class StudentSerializer(StudentDetailSerializer):
         fields = (
             'id',
             'avatar',
+            'avatar_srcset',
             'last_name',
             'first_name',
             'email',
@@ -220,6 +303,147 @@ class StudentSerializer(StudentDetailSerializer):
         )
 
 
+class StudentIdsSerializer(Serializer):
+    """
+    Сериализатор списка ID студентов для пакетных операций с избранным
+    и списком сравнения.
+
+    Attributes:
+        - student_ids (ListField): Список ID студентов. Повторы
+        отбрасываются с сохранением порядка.
+    """
+    student_ids = ListField(
+        child=IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=STUDENT_BATCH_MAX_SIZE
+    )
+
+    @staticmethod
+    def validate_student_ids(value: List[int]) -> List[int]:
+        """Удаляет повторяющиеся ID студентов."""
+        return list(dict.fromkeys(value))
+
+
+class CompareMatrixStudentSerializer(ModelSerializer):
+    """
+    Сериализатор студента для матрицы сравнения.
+
+    Связанные справочники передаются только ID, их названия один раз
+    выводятся в разделе attributes матрицы сравнения.
+
+    Attributes:
+        - sex (CharField, read-only): Пол студента в текстовом виде.
+        - avatar_srcset (SrcsetField): Миниатюры фото в формате srcset.
+    """
+    sex = CharField(source='get_sex_display', read_only=True)
+    avatar_srcset = SrcsetField()
+
+    class Meta:
+        model = Student
+        fields = (
+            'id',
+            'avatar',
+            'avatar_srcset',
+            'last_name',
+            'first_name',
+            'sex',
+            'age',
+            'location',
+            'specialization',
+            'course',
+            'education_level',
+        )
+        read_only_fields = fields
+
+
+class CompareMatrixSerializer(Serializer):
+    """
+    Сериализатор списка сравнения в виде матрицы.
+
+    Принимает список студентов с предзагруженными skills и schedule
+    и разворачивает его в матрицы «навыки × студенты» и
+    «графики × студенты». Каждое значение справочников выводится
+    один раз, ячейки матрицы – булевы значения в порядке students.
+
+    Context:
+        - request: Запрос текущего пользователя.
+        - vacancy (Vacancy, optional): Вакансия с предзагруженными
+        required_skills, относительно которой считается покрытие
+        навыков (coverage) каждого студента.
+    """
+    attribute_serializers = (
+        ('locations', 'location', LocationSerializer),
+        ('specializations', 'specialization', SpecializationSerializer),
+        ('courses', 'course', CourseSerializer),
+        ('education_levels', 'education_level', EducationLevelSerializer),
+    )
+
+    @staticmethod
+    def build_matrix(items: Dict, students_ids: List[Set[int]],
+                     required_ids: Set[int] = frozenset()) -> List[Dict]:
+        """
+        Строит строки матрицы для значений справочника.
+
+        Args:
+            items (Dict): Значения справочника по ID.
+            students_ids (List[Set[int]]): ID значений каждого студента.
+            required_ids (Set[int]): ID значений, требуемых вакансией.
+
+        Returns:
+            List[Dict]: Строки матрицы, требуемые значения идут первыми.
+        """
+        rows = sorted(items.values(),
+                      key=lambda item: (item.id not in required_ids,
+                                        item.name))
+        return [
+            {
+                'id': item.id,
+                'name': item.name,
+                'required': item.id in required_ids,
+                'students': [item.id in ids for ids in students_ids],
+            }
+            for item in rows
+        ]
+
+    def to_representation(self, students: List[Student]) -> Dict:
+        vacancy = self.context.get('vacancy')
+        required_skills = vacancy.required_skills.all() if vacancy else []
+        required_ids = {skill.id for skill in required_skills}
+
+        skills = {skill.id: skill for skill in required_skills}
+        schedules = {}
+        skill_ids, schedule_ids = [], []
+        for student in students:
+            student_skills = student.skills.all()
+            student_schedules = student.schedule.all()
+            skills.update((skill.id, skill) for skill in student_skills)
+            schedules.update((item.id, item) for item in student_schedules)
+            skill_ids.append({skill.id for skill in student_skills})
+            schedule_ids.append({item.id for item in student_schedules})
+
+        students_data = CompareMatrixStudentSerializer(
+            students, many=True, context=self.context).data
+        for data, ids in zip(students_data, skill_ids):
+            data['coverage'] = (
+                int(len(ids & required_ids) / len(required_ids) * 100)
+                if required_ids else None
+            )
+
+        attributes = {}
+        for key, field, serializer in self.attribute_serializers:
+            ids = dict.fromkeys(getattr(student, f'{field}_id')
+                                for student in students)
+            attributes[key] = serializer(list(ids), many=True).data
+
+        return {
+            'vacancy': vacancy.id if vacancy else None,
+            'students': students_data,
+            'attributes': attributes,
+            'skills': self.build_matrix(skills, skill_ids, required_ids),
+            'schedules': self.build_matrix(schedules, schedule_ids),
+        }
+
+
 # ----------------------------------------------------------------------------
 #                       Vacancies serializers
 # ----------------------------------------------------------------------------
@@ -240,12 +464,14 @@ class VacancyReadSerializer(ModelSerializer):
         Сериализатор для грейдов.
         - location (LocationSerializer, read-only): Сериализатор для
         местоположения вакансии.
+        - is_archived (BooleanField, read-only): Признак архивной вакансии.
     """
     required_skills = SkillSerializer(many=True)
     schedule = ScheduleSerializer(many=True)
     specialization = SpecializationSerializer(many=True)
     required_education_level = EducationLevelSerializer(many=True)
-    location = LocationSerializer()
+    location = LocationSerializer(source='location_id')
+    is_archived = BooleanField(read_only=True)
 
     class Meta:
         model = Vacancy
@@ -257,10 +483,14 @@ class VacancyReadSerializer(ModelSerializer):
             'text',
             'pub_date',
             'salary',
+            'salary_min',
+            'salary_max',
+            'currency',
             'specialization',
             'schedule',
             'required_education_level',
             'required_skills',
+            'is_archived',
         )
 
 
@@ -269,7 +499,8 @@ class VacancySmallReadSerializer(VacancyReadSerializer):
     Сериализатор для модели Vacancy с краткой информацией для
     карточного представления.
 
-    Полностью наследуется от VacancyReadSerializer.
+    Полностью наследуется от VacancyReadSerializer. Используется также
+    для архивных вакансий (ArchivedVacancy), у которых те же поля.
     """
 
     class Meta:
@@ -281,9 +512,13 @@ class VacancySmallReadSerializer(VacancyReadSerializer):
             'location',
             'pub_date',
             'salary',
+            'salary_min',
+            'salary_max',
+            'currency',
             'schedule',
             'required_education_level',
             'required_skills',
+            'is_archived',
         )
 
 
@@ -569,13 +804,14 @@ class MatchingStudentSerializer(StudentSerializer):
         Returns:
             int: Процентное соотношение скиллов студента к скиллам из вакансии.
         """
-        vacancy_id = self.context['vacancy_id']
-        vacancy = Vacancy.objects.get(id=vacancy_id)
-        required_skills = vacancy.required_skills.all()
+        vacancy = get_request_vacancy(self.context['request'],
+                                      self.context['vacancy_id'])
+        required_skill_ids = {skill.id
+                              for skill in vacancy.required_skills.all()}
 
-        student_skills = student.skills.all()
-        common_skills_count = len(set(required_skills) & set(student_skills))
-        total_required_skills = len(required_skills)
+        student_skill_ids = {skill.id for skill in student.skills.all()}
+        common_skills_count = len(required_skill_ids & student_skill_ids)
+        total_required_skills = len(required_skill_ids)
 
         if total_required_skills == 0:
             return 0  # Избегаем деления на ноль
@@ -589,6 +825,7 @@ class MatchingStudentSerializer(StudentSerializer):
         fields = (
             'id',
             'avatar',
+            'avatar_srcset',
             'last_name',
             'first_name',
             'email',
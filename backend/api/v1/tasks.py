@@ -0,0 +1,90 @@
+from celery import shared_task
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from api.v1.exports import (EXPORT_DONE, EXPORT_FAILED, get_export_path,
+                            render_students_pdf, update_export_job)
+from api.v1.read_models import (REFERENCE_VERSION, get_dashboard,
+                                get_facet_counts, get_matching_ranking,
+                                get_reference_bundle, get_reference_payload)
+from core.cache import get_cache_version
+from core.constants.vacancies import POPULAR_VACANCIES_LIMIT
+from vacancies.models import Vacancy
+
+
+@shared_task(acks_late=True)
+def precompute_reference_bundle(refresh=True) -> None:
+    """Рассчитывает и кэширует набор справочников и готовый ответ."""
+    get_reference_bundle(refresh)
+    get_reference_payload(get_cache_version(REFERENCE_VERSION), refresh)
+
+
+@shared_task(acks_late=True)
+def precompute_facet_counts(refresh=True) -> None:
+    """Рассчитывает и кэширует количество студентов по фильтрам."""
+    get_facet_counts(refresh)
+
+
+@shared_task(acks_late=True)
+def precompute_dashboard(refresh=True) -> None:
+    """Рассчитывает и кэширует сводку для администратора."""
+    get_dashboard(refresh)
+
+
+@shared_task(acks_late=True)
+def precompute_popular_matches(refresh=True,
+                               limit=POPULAR_VACANCIES_LIMIT) -> int:
+    """
+    Рассчитывает и кэширует подбор студентов для последних
+    опубликованных вакансий, к которым чаще всего обращаются.
+
+    :param refresh: Пересчитать подбор, даже если он уже в кэше.
+    :param limit: Количество вакансий.
+    :return: Количество обработанных вакансий.
+    """
+    vacancy_ids = Vacancy.objects.order_by('-pub_date').values_list(
+        'id', flat=True)[:limit]
+    for vacancy_id in vacancy_ids:
+        get_matching_ranking(vacancy_id, refresh)
+    return len(vacancy_ids)
+
+
+@shared_task(acks_late=True)
+def precompute_read_models(refresh=True) -> None:
+    """
+    Ставит в очередь расчёт всех моделей чтения.
+
+    По расписанию выполняется ночью с refresh=True, после запуска
+    воркера (в том числе после деплоя) – с refresh=False, чтобы
+    заполнить только отсутствующие в кэше значения.
+
+    :param refresh: Пересчитать значения, даже если они уже в кэше.
+    """
+    for task in (precompute_reference_bundle, precompute_facet_counts,
+                 precompute_dashboard, precompute_popular_matches):
+        task.delay(refresh)
+
+
+@shared_task(acks_late=True)
+def export_students_pdf(job_id, students, content_hash) -> str:
+    """
+    Формирует PDF с профилями студентов и сохраняет его в MEDIA_ROOT.
+
+    Файл называется по хэшу содержимого, поэтому одинаковые
+    экспорты формируются один раз.
+
+    :param job_id: ID задачи экспорта.
+    :param students: Данные StudentDetailSerializer.
+    :param content_hash: SHA-256 данных.
+    :return: Путь к файлу в хранилище.
+    """
+    path = get_export_path(content_hash)
+    try:
+        if not default_storage.exists(path):
+            path = default_storage.save(
+                path, ContentFile(render_students_pdf(students)))
+    except Exception:
+        update_export_job(job_id, status=EXPORT_FAILED)
+        raise
+    update_export_job(job_id, status=EXPORT_DONE, path=path)
+    return path
@@ -1,38 +1,69 @@
-from django.test import TestCase
-from rest_framework.test import APIClient
+import gzip
+import json
+import tempfile
+import threading
+from io import BytesIO, StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import HttpResponse
+from PIL import Image
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from api.v1.async_views import async_view
+from api.v1.profile_cache import student_profiles
+from api.v1.serializers import StudentDetailSerializer
+from api.v1.tasks import export_students_pdf
+from api.v1.views import StudentViewSet
+from core.cache import InvalidationListener, get_cache_version
+from core.db_router import ReplicaRouter, is_sticky, use_replica
+from core.models import StoredFile
+from students.tasks import make_student_avatar_thumbnails
 from users.models import User
-from students.models import Student
-from shared_info.models import Location, Specialization, Course, EducationLevel
+from students.models import Student, FavoriteStudent, CompareStudent
+from shared_info.models import (Location, Specialization, Course,
+                                EducationLevel, Skill)
+from shared_info.registry import reference_registry
 
 
-class StudentViewSetTestCase(TestCase):
+class StudentTestMixin:
     def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
-            email='test@yandex.ru',
-            password='123456',
-            first_name='Danya',
-            last_name='Nevskiy',
-        )
-        self.user.is_active = True
+        # Сигналы меняют версии кэша после фиксации транзакции.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client = APIClient()
+            self.user = User.objects.create_user(
+                email='test@yandex.ru',
+                password='123456',
+                first_name='Danya',
+                last_name='Nevskiy',
+            )
+            self.user.is_active = True
 
-        self.location = Location.objects.create(name='Москва')
-        self.specialization = Specialization.objects.create(name='Разработка')
-        self.course = Course.objects.create(name='Python-разработчик')
-        self.education_level = EducationLevel.objects.create(name='Junior')
-        self.student = Student.objects.create(
-            first_name='Иван',
-            last_name='Иванов',
-            location=self.location,
-            specialization=self.specialization,
-            course=self.course,
-            age=23,
-            education_level=self.education_level
-        )
+            self.location = Location.objects.create(name='Москва')
+            self.specialization = Specialization.objects.create(
+                name='Разработка')
+            self.course = Course.objects.create(name='Python-разработчик')
+            self.education_level = EducationLevel.objects.create(name='Junior')
+            self.student = Student.objects.create(
+                first_name='Иван',
+                last_name='Иванов',
+                location=self.location,
+                specialization=self.specialization,
+                course=self.course,
+                age=23,
+                education_level=self.education_level
+            )
+
+            self.authorized_client = APIClient()
+            self.authorized_client.force_authenticate(self.user)
 
-        self.authorized_client = APIClient()
-        self.authorized_client.force_authenticate(self.user)
 
+class StudentViewSetTestCase(StudentTestMixin, TestCase):
     def test_student_favorite(self):
         """Проверка на добавление и удаление пользователя из избранных"""
         response1 = self.authorized_client.post('/api/favorite/1/')
@@ -40,7 +71,7 @@ class StudentViewSetTestCase(TestCase):
 
         response2 = self.authorized_client.get('/api/favorite/')
         self.assertEqual(response2.status_code, 200)
-        favorite_students = response2.data
+        favorite_students = response2.data['results']
         self.assertTrue(
             any(student['id'] == self.student.id
                 for student in favorite_students)
@@ -53,8 +84,382 @@ class StudentViewSetTestCase(TestCase):
 
         response4 = self.authorized_client.get('/api/favorite/')
         self.assertEqual(response4.status_code, 200)
-        favorite_students_after_deletion = response4.data
+        favorite_students_after_deletion = response4.data['results']
         self.assertFalse(
             any(student['id'] == self.student.id
                 for student in favorite_students_after_deletion)
         )
+
+    def test_replica_routing_sticks_to_primary_after_write(self):
+        """Проверка чтения из реплики и закрепления за основной базой"""
+        caches[settings.CACHE_BACKEND].clear()
+        with mock.patch('core.db_router.replica_configured',
+                        return_value=True):
+            with use_replica():
+                self.assertEqual(ReplicaRouter.db_for_read(Student),
+                                 'replica')
+                self.assertEqual(ReplicaRouter.db_for_write(Student),
+                                 'default')
+            self.assertFalse(is_sticky(self.user.pk))
+            response = self.authorized_client.post(
+                f'/api/favorite/{self.student.id}/')
+            self.assertEqual(response.status_code, 201)
+            self.assertTrue(is_sticky(self.user.pk))
+        self.assertEqual(ReplicaRouter.db_for_read(Student), 'default')
+
+    def test_student_response_cache(self):
+        """Профиль кэшируется, а теги сбрасываются при изменениях"""
+        url = f'/api/students/{self.student.id}/'
+        self.authorized_client.get(url)
+        # Дата изменения студента, состояние избранного и списка
+        # сравнения пользователя и его отметки.
+        with self.assertNumQueries(5):
+            response = self.authorized_client.get(url)
+        self.assertFalse(response.data['is_favorited'])
+        self.assertGreaterEqual(student_profiles.stats()['local_hits'], 1)
+
+        FavoriteStudent.objects.create(user=self.user, student=self.student)
+        response = self.authorized_client.get(url)
+        self.assertTrue(response.data['is_favorited'])
+
+        self.location.name = 'Казань'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.location.save()
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.data['location']['name'], 'Казань')
+        item = reference_registry.get(Location, self.location.id)
+        self.assertEqual(item.name, 'Казань')
+        with self.assertRaises(AttributeError):
+            item.name = 'Москва'
+
+    def test_cache_version_bumped_on_commit(self):
+        """Версия кэша меняется только после фиксации транзакции"""
+        version = get_cache_version(f'student:{self.student.id}')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.save()
+            self.assertEqual(
+                get_cache_version(f'student:{self.student.id}'), version)
+        self.assertNotEqual(
+            get_cache_version(f'student:{self.student.id}'), version)
+
+    def test_invalidation_message_errors_are_logged(self):
+        """Неверное сообщение о сбросе не прерывает подписку"""
+        listener = InvalidationListener('test')
+        cache = mock.Mock()
+        listener.register(cache)
+        with self.assertLogs('core.cache', 'ERROR'):
+            listener._handle({'data': b'not json'})
+            listener._handle({'data': b'42'})
+        cache.invalidate.assert_not_called()
+        listener._handle({'data': b'["students"]'})
+        cache.invalidate.assert_called_once_with({'students'})
+
+    def test_student_profile_cache_key(self):
+        """ID профиля из URL приводится к числу"""
+        response = self.authorized_client.get('/api/students/abc/')
+        self.assertEqual(response.status_code, 404)
+        url = f'/api/students/0{self.student.id}/'
+        self.assertEqual(self.authorized_client.get(url).status_code, 200)
+        self.student.first_name = 'Пётр'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.save()
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.data['first_name'], 'Пётр')
+
+    def test_student_batch_favorite_and_compare(self):
+        """Проверка пакетного добавления и удаления студентов"""
+        for url in ('/api/favorite/batch/', '/api/compare/batch/'):
+            with self.subTest(url=url):
+                data = {'student_ids': [self.student.id, self.student.id]}
+                response = self.authorized_client.post(url, data,
+                                                       format='json')
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(response.data['student_ids'],
+                                 [self.student.id])
+                # Повторное добавление не создаёт дубликатов.
+                response = self.authorized_client.post(url, data,
+                                                       format='json')
+                self.assertEqual(response.status_code, 201)
+
+                response = self.authorized_client.post(
+                    url, {'student_ids': [self.student.id + 100]},
+                    format='json'
+                )
+                self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.user.favorite_students.count(), 1)
+        self.assertEqual(self.user.compare_students.count(), 1)
+
+        for url in ('/api/favorite/batch/', '/api/compare/batch/'):
+            response = self.authorized_client.delete(
+                url, {'student_ids': [self.student.id]}, format='json'
+            )
+            self.assertEqual(response.status_code, 204)
+        self.assertFalse(self.user.favorite_students.exists())
+        self.assertFalse(self.user.compare_students.exists())
+
+    def test_student_membership_flags_without_extra_queries(self):
+        """Флаги избранного и сравнения не дают запросов на студента"""
+        students = [self.student] + [
+            Student.objects.create(
+                first_name='Пётр',
+                last_name=f'Петров{index}',
+                email=f'petrov{index}@yandex.ru',
+                location=self.location,
+                specialization=self.specialization,
+                course=self.course,
+                age=25,
+                education_level=self.education_level
+            ) for index in range(3)
+        ]
+        FavoriteStudent.objects.create(user=self.user, student=students[1])
+        CompareStudent.objects.create(user=self.user, student=students[2])
+
+        request = APIRequestFactory().get('/api/students/')
+        request.user = self.user
+        queryset = Student.objects.select_related(
+            'location', 'specialization', 'course', 'education_level'
+        ).prefetch_related('skills', 'schedule')
+        reference_registry.all(Location)
+        # Студенты, навыки, графики и по одному запросу на каждое множество.
+        with self.assertNumQueries(5):
+            data = StudentDetailSerializer(
+                queryset, many=True, context={'request': request}
+            ).data
+        flags = {item['id']: (item['is_favorited'],
+                              item['is_in_compare_list']) for item in data}
+        self.assertEqual(flags[students[1].id], (True, False))
+        self.assertEqual(flags[students[2].id], (False, True))
+        self.assertEqual(flags[students[3].id], (False, False))
+
+    def test_student_favorites_pagination(self):
+        """Избранное выдаётся постранично в порядке добавления"""
+        students = [
+            Student.objects.create(
+                first_name='Пётр',
+                last_name=f'Петров{index}',
+                email=f'petrov{index}@yandex.ru',
+                location=self.location,
+                specialization=self.specialization,
+                course=self.course,
+                age=25,
+                education_level=self.education_level
+            ) for index in range(3)
+        ]
+        for student in students:
+            self.authorized_client.post(f'/api/favorite/{student.id}/')
+
+        response = self.authorized_client.get('/api/favorite/',
+                                              {'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            [student['id'] for student in response.data['results']],
+            [students[2].id, students[1].id]
+        )
+        self.assertTrue(all(student['is_favorited']
+                            for student in response.data['results']))
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_student_avatar_thumbnails(self):
+        """Миниатюры фото формируются задачей и отдаются в srcset."""
+        buffer = BytesIO()
+        Image.new('RGB', (640, 480), 'red').save(buffer, 'PNG')
+        self.student.avatar = SimpleUploadedFile('photo.png',
+                                                 buffer.getvalue())
+        self.student.save()
+        response = self.authorized_client.get(
+            f'/api/students/{self.student.id}/')
+        self.assertIsNone(response.data['avatar_srcset'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_student_avatar_thumbnails(self.student.id)
+        response = self.authorized_client.get(
+            f'/api/students/{self.student.id}/')
+        srcset = response.data['avatar_srcset']
+        self.assertEqual(srcset['webp'].count('.webp'), 3)
+        self.assertTrue(srcset['jpeg'].endswith('.jpeg 256w'))
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_avatar_storage_deduplicates_uploads(self):
+        """Одинаковые фото хранятся в одном файле с учётом ссылок."""
+        buffer = BytesIO()
+        Image.new('RGB', (32, 32), 'blue').save(buffer, 'PNG')
+        other = Student.objects.create(
+            first_name='Пётр',
+            last_name='Петров',
+            email='petrov@example.com',
+            location=self.location,
+            specialization=self.specialization,
+            course=self.course,
+            age=25,
+            education_level=self.education_level
+        )
+        for student in (self.student, other):
+            student.avatar = SimpleUploadedFile('photo.PNG',
+                                                buffer.getvalue())
+            student.save()
+        self.assertEqual(self.student.avatar.name, other.avatar.name)
+        self.assertTrue(self.student.avatar.name.endswith('.png'))
+        stored_file = StoredFile.objects.get(name=other.avatar.name)
+        self.assertEqual(stored_file.references, 2)
+
+        other.delete()
+        self.student.avatar = ''
+        self.student.save()
+        stored_file.refresh_from_db()
+        self.assertEqual(stored_file.references, 0)
+        call_command('collect_orphan_files', grace_hours=0,
+                     stdout=StringIO())
+        self.assertFalse(StoredFile.objects.exists())
+
+
+class ConditionalGetTestCase(StudentTestMixin, TestCase):
+    def test_student_conditional_get(self):
+        """Неизменённый профиль отдаётся ответом 304 по ETag"""
+        url = f'/api/students/{self.student.id}/'
+        response = self.authorized_client.get(url)
+        etag = response['ETag']
+        # Дата изменения студента, состояние избранного и списка
+        # сравнения пользователя.
+        with self.assertNumQueries(3):
+            response = self.authorized_client.get(url,
+                                                  HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.authorized_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        for change in (
+            lambda: self.student.skills.add(Skill.objects.create(name='Go')),
+            lambda: FavoriteStudent.objects.create(user=self.user,
+                                                   student=self.student),
+            lambda: FavoriteStudent.objects.filter(user=self.user).delete(),
+            lambda: self.authorized_client.post(
+                '/api/compare/batch/', {'student_ids': [self.student.id]},
+                format='json'),
+        ):
+            change()
+            response = self.authorized_client.get(url,
+                                                  HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            etag = response['ETag']
+
+    def test_member_state_not_cached(self):
+        """Состояние избранного читается из БД, а не из кэша процесса"""
+        url = f'/api/students/{self.student.id}/'
+        etag = self.authorized_client.get(url)['ETag']
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'worker',
+        }}):
+            self.authorized_client.post(
+                '/api/favorite/batch/', {'student_ids': [self.student.id]},
+                format='json')
+        response = self.authorized_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_favorited'])
+
+
+class CompressionTestCase(StudentTestMixin, TestCase):
+    @override_settings(RESPONSE_COMPRESSION_MIN_SIZE=0)
+    def test_response_compression(self):
+        """JSON-ответ сжимается gzip, если клиент его поддерживает"""
+        url = f'/api/students/{self.student.id}/'
+        plain = self.authorized_client.get(url)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        response = self.authorized_client.get(url,
+                                              HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], f'W/{plain["ETag"]}')
+        self.assertEqual(json.loads(gzip.decompress(response.content)),
+                         plain.json())
+        with override_settings(RESPONSE_COMPRESSION=False):
+            response = self.authorized_client.get(
+                url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.authorized_client.get(
+            url, HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class StudentExportTestCase(StudentTestMixin, TestCase):
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_compare_export_pdf(self):
+        """Экспорт списка сравнения в PDF через задачу и скачивание."""
+        CompareStudent.objects.create(user=self.user, student=self.student)
+        with mock.patch.object(export_students_pdf, 'delay',
+                               side_effect=export_students_pdf) as delay:
+            response = self.authorized_client.post('/api/compare/export/')
+        self.assertEqual(response.status_code, 202)
+        delay.assert_called_once()
+
+        job_id = response.data['job_id']
+        response = self.authorized_client.get(f'/api/exports/{job_id}/')
+        self.assertEqual(response.data['status'], 'done')
+        response = self.authorized_client.get(
+            f'/api/exports/{job_id}/download/')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content)
+                        .startswith(b'%PDF'))
+
+        # Повторный экспорт тех же данных не запускает задачу.
+        with mock.patch.object(export_students_pdf, 'delay') as delay:
+            response = self.authorized_client.post('/api/compare/export/')
+        delay.assert_not_called()
+        self.assertEqual(response.data['status'], 'done')
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_export_job_shared_with_worker(self):
+        """Состояние задачи видно, даже если у воркера свой кэш."""
+        CompareStudent.objects.create(user=self.user, student=self.student)
+        worker_caches = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'worker',
+        }}
+
+        def run_in_worker(*args):
+            with override_settings(CACHES=worker_caches):
+                export_students_pdf(*args)
+
+        with mock.patch.object(export_students_pdf, 'delay',
+                               side_effect=run_in_worker):
+            response = self.authorized_client.post('/api/compare/export/')
+        job_id = response.data['job_id']
+        response = self.authorized_client.get(f'/api/exports/{job_id}/')
+        self.assertEqual(response.data['status'], 'done')
+
+
+class AsyncReadViewTestCase(TransactionTestCase):
+    """
+    Проверка асинхронных представлений чтения. Запросы к БД идут из
+    другого потока, поэтому данные должны быть закоммичены.
+    """
+
+    def test_async_read_view(self):
+        student = Student.objects.create(
+            first_name='Иван',
+            last_name='Иванов',
+            location=Location.objects.create(name='Москва'),
+            specialization=Specialization.objects.create(name='Разработка'),
+            course=Course.objects.create(name='Python-разработчик'),
+            age=23,
+            education_level=EducationLevel.objects.create(name='Junior')
+        )
+        view = async_view(StudentViewSet.as_view({'get': 'retrieve'}))
+        request = APIRequestFactory().get(f'/api/students/{student.id}/')
+        response = async_to_sync(view)(request, pk=student.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['id'], student.id)
+
+    def test_async_view_uses_read_executor(self):
+        threads = []
+
+        def view(request):
+            threads.append(threading.current_thread().name)
+            return HttpResponse()
+
+        async_to_sync(async_view(view))(APIRequestFactory().get('/'))
+        self.assertTrue(threads[0].startswith('read-view'))
+        async_to_sync(async_view(view))(APIRequestFactory().post('/'))
+        self.assertFalse(threads[1].startswith('read-view'))
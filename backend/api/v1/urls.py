@@ -1,9 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from api.v1.async_views import read_route, read_view
 from api.v1.views import (StudentViewSet, VacancyViewSet,
                           MatchingStudentsViewSet, FavoriteStudentViewSet,
-                          CompareStudentViewSet)
+                          CompareStudentViewSet, DashboardViewSet,
+                          CacheStatsViewSet, DatabaseMetricsViewSet,
+                          ExportJobViewSet, ReferenceViewSet,
+                          TaskMetricsViewSet)
 from users.views import CustomUserViewSet
 
 router = DefaultRouter()
@@ -12,8 +16,16 @@ router.register(r'users', CustomUserViewSet)
 router.register(r'students', StudentViewSet)
 router.register(r'vacancies', VacancyViewSet, basename='vacancies')
 
+# Маршруты, GET-запросы к которым в профиле uvicorn обслуживаются
+# асинхронно в пуле потоков чтения (запись – в общем потоке).
+ASYNC_READ_ROUTES = ('student-list', 'student-detail', 'vacancies-list',
+                     'vacancies-detail')
+
 urlpatterns = [
-    path('', include(router.urls)),
+    path('', include([
+        read_route(url) if url.name in ASYNC_READ_ROUTES else url
+        for url in router.urls
+    ])),
     path(
         'activation_user/<str:uid>/<str:token>/',
         CustomUserViewSet.as_view({'get': 'activate'}), name='activate'
@@ -21,18 +33,48 @@ urlpatterns = [
     path('auth/', include('djoser.urls.jwt')),
     path(
         'matching/<int:vacancy_id>/',
-        MatchingStudentsViewSet.as_view({'get': 'list'}),
+        read_view(MatchingStudentsViewSet.as_view({'get': 'list'})),
         name='matching-students-list'
     ),
+    path(
+        'matching/<int:vacancy_id>/export/',
+        MatchingStudentsViewSet.as_view({'get': 'export'}),
+        name='matching-students-export'
+    ),
+    path('favorite/batch/', FavoriteStudentViewSet.as_view(
+        {'post': 'batch_post', 'delete': 'batch_delete'})
+         ),
     path('favorite/<int:student_id>/', FavoriteStudentViewSet.as_view(
         {'post': 'post', 'delete': 'delete'})
          ),
-    path('favorite/', FavoriteStudentViewSet.as_view(
-        {'get': 'get_favorites'})
+    path('favorite/', read_view(FavoriteStudentViewSet.as_view(
+        {'get': 'get_favorites'}))
+         ),
+    path('compare/batch/', CompareStudentViewSet.as_view(
+        {'post': 'batch_post', 'delete': 'batch_delete'})
          ),
     path('compare/<int:student_id>/', CompareStudentViewSet.as_view(
         {'post': 'post', 'delete': 'delete'})
          ),
-    path('compare/', CompareStudentViewSet.as_view({'get': 'get_compare'})),
+    path('compare/export/', CompareStudentViewSet.as_view(
+        {'post': 'export'})
+         ),
+    path('compare/', read_view(CompareStudentViewSet.as_view(
+        {'get': 'get_compare'}))
+         ),
+    path('exports/<str:job_id>/download/', ExportJobViewSet.as_view(
+        {'get': 'download'}), name='export-download'),
+    path('exports/<str:job_id>/', ExportJobViewSet.as_view(
+        {'get': 'retrieve'}), name='export-job'),
+    path('reference/', ReferenceViewSet.as_view({'get': 'list'}),
+         name='reference'),
+    path('dashboard/', DashboardViewSet.as_view({'get': 'list'}),
+         name='dashboard'),
+    path('tasks/metrics/', TaskMetricsViewSet.as_view({'get': 'list'}),
+         name='task-metrics'),
+    path('db/metrics/', DatabaseMetricsViewSet.as_view({'get': 'list'}),
+         name='db-metrics'),
+    path('cache/stats/', CacheStatsViewSet.as_view({'get': 'list'}),
+         name='cache-stats'),
 
 ]
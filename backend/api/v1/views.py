@@ -1,25 +1,60 @@
-from typing import Any, Tuple, Dict
-
+from datetime import datetime
+from typing import Any, Tuple, Dict, List, Optional
+from uuid import uuid4
+
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import BooleanField, Count, F, Max, Q, QuerySet, Value
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from django.urls import reverse
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import (IsAuthenticated,
+                                        IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.status import (HTTP_404_NOT_FOUND, HTTP_201_CREATED,
                                    HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST,
-                                   HTTP_200_OK)
+                                   HTTP_200_OK, HTTP_202_ACCEPTED)
 from rest_framework.viewsets import ReadOnlyModelViewSet, ModelViewSet, ViewSet
 
+from api.v1.exports import (EXPORT_DONE, EXPORT_PENDING, create_export_job,
+                            get_content_hash, get_export_job,
+                            get_export_path, iter_queryset,
+                            iter_ranked_students, prepare_export_data,
+                            stream_students_csv)
 from api.v1.permissions import (IsAuthorOrAdmin, IsVacancyAuthorOrAdmin,
-                                IsAdminUser)
+                                IsAdminUser, get_request_vacancy)
+from api.v1.profile_cache import get_student_profile, student_profiles
+from api.v1.read_models import (REFERENCE_VERSION, get_dashboard,
+                                get_facet_counts, get_matching_ranking,
+                                get_reference_payload)
 from api.v1.serializers import (StudentSerializer, StudentDetailSerializer,
                                 VacancySerializer, VacancyReadSerializer,
                                 MatchingStudentSerializer,
-                                VacancySmallReadSerializer)
+                                VacancySmallReadSerializer,
+                                StudentIdsSerializer,
+                                CompareMatrixSerializer)
+from api.v1.tasks import export_students_pdf
+from core.cache import CachedResponseMixin, get_cache_version
+from core.celery.celery_app import app as celery_app
+from core.celery.metrics import task_metrics
+from core.conditional import ConditionalGetMixin
+from core.db.metrics import connection_metrics
+from core.constants.shared_info import (REFERENCE_CACHE_MAX_AGE,
+                                        REFERENCE_TAGS)
+from core.db_router import ReplicaReadMixin
+from core.middleware import accepts_encoding
 from core.pagination import CustomPagination
 from students.models import Student, FavoriteStudent, CompareStudent
-from vacancies.models import Vacancy
+from vacancies.models import ArchivedVacancy, Vacancy
 
 
-class StudentViewSet(ReadOnlyModelViewSet):
+class StudentViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                     CachedResponseMixin, ReadOnlyModelViewSet):
     """
     Этот ViewSet предоставляет список и детальную информацию о студентах.
 
@@ -28,15 +63,72 @@ class StudentViewSet(ReadOnlyModelViewSet):
     Attributes:
         - queryset: Запрос, возвращающий все объекты Student.
         - pagination_class: Кастомный класс пагинации.
+        - cache_actions: Действия, ответы которых кэшируются.
+
+    Methods:
+        - retrieve(request, pk): Возвращает профиль студента.
+        - export(request, pk): Запускает экспорт профиля студента в PDF.
+        - export_csv(request): Возвращает каталог студентов потоковым
+        CSV-файлом.
+        - facets(request): Возвращает количество студентов по значениям
+        фильтров.
     """
     queryset = Student.objects.all()
     pagination_class = CustomPagination
+    cache_actions = ('list',)
+
+    def get_cache_tags(self) -> Tuple[str, ...]:
+        return ('students', *REFERENCE_TAGS.values())
+
+    def get_validator_tags(self) -> Tuple[str, ...]:
+        return ('reference',)
+
+    def get_validator_state(self) -> Tuple[Optional[datetime], Tuple]:
+        """
+        Возвращает состояние избранного и списка сравнения пользователя:
+        количество и наибольший ID записей меняются при любом добавлении
+        и удалении, в том числе через bulk_create. Каждый список
+        считается отдельным запросом по индексу user.
+        """
+        user = self.request.user
+        if not user.is_authenticated:
+            return None, ()
+        state = []
+        created = []
+        for model in (FavoriteStudent, CompareStudent):
+            rows = model.objects.filter(user_id=user.pk).aggregate(
+                count=Count('pk'), last_id=Max('pk'), created=Max('created'))
+            state.extend((rows['count'], rows['last_id']))
+            if rows['created'] is not None:
+                created.append(rows['created'])
+        return max(created, default=None), tuple(state)
+
+    def personalize_cached_data(self, data: Dict) -> Dict:
+        """Обновляет в ответе из кэша отметки избранного."""
+        self.get_serializer().update_member_flags(data['results'])
+        return data
+
+    def retrieve(self, request: Any, pk: str) -> Response:
+        """
+        Возвращает профиль студента из двухуровневого кэша
+        (см. get_student_profile).
+        """
+        # ID из URL приводится к числу, чтобы /01/ и /1/ читали один
+        # ключ кэша и сбрасывались одним тегом student:<id>.
+        try:
+            pk = int(pk)
+        except ValueError:
+            raise Http404
+        profile = get_student_profile(request, pk)
+        if profile is None:
+            raise Http404
+        return Response(profile)
 
     def get_permissions(self) -> Any:
         """
         Возвращает соответствующий permission в зависимости от действия.
         """
-        if self.action == 'list':
+        if self.action in ('list', 'facets', 'export_csv'):
             return (IsAdminUser(),)
         return (IsAuthenticatedOrReadOnly(),)
 
@@ -49,8 +141,32 @@ class StudentViewSet(ReadOnlyModelViewSet):
         elif self.action == 'retrieve':
             return StudentDetailSerializer
 
+    @action(methods=['post'], detail=True)
+    def export(self, request: Any, pk: int) -> Response:
+        """Запускает экспорт профиля студента в PDF."""
+        students = Student.objects.filter(pk=pk).prefetch_related(
+            'skills', 'schedule')
+        if not students:
+            raise Http404
+        return start_students_export(request, students)
+
+    @action(methods=['get'], detail=False, url_path='export')
+    def export_csv(self, request: Any) -> Any:
+        """Возвращает каталог студентов потоковым CSV-файлом."""
+        return stream_students_csv(
+            iter_queryset(Student.objects.order_by('id')), 'students')
+
+    @action(methods=['get'], detail=False)
+    def facets(self, request: Any) -> Response:
+        """
+        Возвращает количество студентов по значениям фильтров
+        (локация, грейд, направление, курс, график, навыки).
+        """
+        return Response(get_facet_counts())
+
 
-class VacancyViewSet(ModelViewSet):
+class VacancyViewSet(ReplicaReadMixin, ConditionalGetMixin,
+                     CachedResponseMixin, ModelViewSet):
     """
     Этот ViewSet предоставляет CRUD-функциональность для вакансий.
 
@@ -61,37 +177,210 @@ class VacancyViewSet(ModelViewSet):
         - serializer_class: Сериализатор, используемый для преобразования
         данных ваканций.
         - pagination_class: Кастомный класс пагинации.
+        - cache_actions: Действия, ответы которых кэшируются. Вакансия
+        доступна только автору, поэтому ответ хранится для каждого
+        пользователя.
 
     Permissions:
         - permission_classes: Список классов разрешений для ViewSet.
         Установлены стандартные разрешения Django REST framework.
 
+    Query params:
+        - salary_gte (int): Вакансии, где зарплата может быть не ниже
+        указанной.
+        - salary_lte (int): Вакансии, где зарплата может быть не выше
+        указанной.
+        - currency (str): Код валюты зарплаты (RUB, USD, EUR).
+        - ordering (str): Сортировка: salary, -salary, pub_date, -pub_date.
+        - include_archived (int): 1 – включить в список архивные вакансии.
+
     Methods:
+        - get_user_vacancies(self, model): Возвращает вакансии, доступные
+        пользователю.
+        - filter_salary(self, queryset): Фильтрует вакансии по зарплате.
+        - order_vacancies(self, queryset): Сортирует вакансии.
+        - get_modified_state(self): Возвращает дату изменения и количество
+        вакансий для условных запросов.
+        - list(self, request, *args, **kwargs): Возвращает список вакансий,
+        при необходимости вместе с архивными.
         - perform_create(self, serializer, **kwargs): Сохраняет
         автора вакансии.
         - update(self, request, *args, **kwargs): Обновляет вакансию.
     """
     permission_classes = (IsAuthorOrAdmin,)
     pagination_class = CustomPagination
+    cache_actions = ('retrieve',)
+    cache_vary_by_user = True
+    default_ordering = '-pub_date'
+    ordering_fields = {
+        'salary': F('salary_min').asc(nulls_last=True),
+        '-salary': F('salary_sort').desc(nulls_last=True),
+        'pub_date': F('pub_date').asc(),
+        '-pub_date': F('pub_date').desc(),
+    }
+
+    def get_cache_tags(self) -> Tuple[str, ...]:
+        return (f'vacancy:{self.kwargs["pk"]}', *REFERENCE_TAGS.values())
+
+    def get_validator_tags(self) -> Tuple[str, ...]:
+        return ('reference',)
+
+    def get_modified_state(self) -> Tuple[Optional[datetime], int]:
+        """
+        Дополняет состояние списка архивными вакансиями, если они
+        запрошены. Архивные вакансии не редактируются, поэтому для них
+        учитывается дата архивации.
+        """
+        updated_at, count = super().get_modified_state()
+        if (self.action != 'list'
+                or self.request.query_params.get('include_archived') != '1'):
+            return updated_at, count
+        archived = self.filter_salary(
+            self.get_user_vacancies(ArchivedVacancy)
+        ).order_by().aggregate(updated_at=Max('archived_at'),
+                               count=Count('pk'))
+        dates = [date for date in (updated_at, archived['updated_at'])
+                 if date is not None]
+        return max(dates, default=None), count + archived['count']
 
     def get_queryset(self) -> Any:
         """
-        Возвращает queryset вакансий в зависимости от пользователя.
+        Возвращает queryset активных вакансий в зависимости от пользователя.
 
         Если пользователь - администратор, возвращаются все вакансии.
         В противном случае возвращаются только вакансии,
-        принадлежащие пользователю.
+        принадлежащие пользователю. Архивные вакансии сюда не попадают.
 
         Returns:
             QuerySet: QuerySet вакансий в соответствии с правами
             доступа пользователя.
         """
+        return self.order_vacancies(
+            self.filter_salary(self.get_user_vacancies(Vacancy))
+        )
+
+    def get_user_vacancies(self, model: Any) -> QuerySet:
+        """
+        Возвращает вакансии модели Vacancy или ArchivedVacancy,
+        доступные текущему пользователю.
+        """
         user = self.request.user
-        if not user.is_anonymous:
-            if user.is_admin:
-                return Vacancy.objects.all()
+        if not user.is_anonymous and user.is_admin:
+            return model.objects.all()
+        return model.objects.filter(author=user)
+
+    def _get_salary_param(self, param: str) -> Any:
+        """Возвращает целочисленный параметр запроса или None."""
+        value = self.request.query_params.get(param)
+        if value in (None, ''):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError(
+                {param: 'Значение должно быть целым числом.'})
+
+    def filter_salary(self, queryset: QuerySet) -> QuerySet:
+        """
+        Фильтрует вакансии по разобранной зарплатной вилке.
 
-        return Vacancy.objects.filter(author=user)
+        Вакансия подходит под salary_gte, если её верхняя граница (или
+        нижняя, когда верхняя не указана) не ниже значения. Для
+        salary_lte аналогично проверяется нижняя граница.
+
+        Args:
+            queryset (QuerySet): Исходный QuerySet вакансий.
+
+        Returns:
+            QuerySet: Отфильтрованный QuerySet.
+        """
+        salary_gte = self._get_salary_param('salary_gte')
+        salary_lte = self._get_salary_param('salary_lte')
+        currency = self.request.query_params.get('currency')
+
+        if currency:
+            queryset = queryset.filter(currency=currency.upper())
+        if salary_gte is not None:
+            queryset = queryset.filter(
+                Q(salary_max__gte=salary_gte)
+                | Q(salary_max__isnull=True, salary_min__gte=salary_gte)
+            )
+        if salary_lte is not None:
+            queryset = queryset.filter(
+                Q(salary_min__lte=salary_lte)
+                | Q(salary_min__isnull=True, salary_max__lte=salary_lte)
+            )
+        return queryset.annotate(
+            salary_sort=Coalesce('salary_max', 'salary_min')
+        )
+
+    def get_ordering(self) -> Tuple[Any, ...]:
+        """
+        Возвращает сортировку из параметра запроса ordering.
+
+        Неизвестное значение – ошибка только для списка: остальным
+        действиям сортировка не нужна, и параметр игнорируется.
+        """
+        ordering = self.request.query_params.get('ordering',
+                                                 self.default_ordering)
+        if ordering not in self.ordering_fields:
+            if self.action == 'list':
+                raise ValidationError(
+                    {'ordering': f'Допустимые значения: '
+                                 f'{", ".join(self.ordering_fields)}.'})
+            ordering = self.default_ordering
+        return self.ordering_fields[ordering], F('id').desc()
+
+    def order_vacancies(self, queryset: QuerySet) -> QuerySet:
+        """Сортирует вакансии согласно параметру запроса ordering."""
+        return queryset.order_by(*self.get_ordering())
+
+    def list(self, request, *args: Tuple[Any],
+             **kwargs: Dict[Any, Any]) -> Response:
+        """
+        Возвращает список вакансий.
+
+        По умолчанию читаются только активные вакансии. С параметром
+        include_archived=1 активные и архивные вакансии объединяются
+        через UNION ALL: фильтрация, сортировка и пагинация выполняются
+        в БД, а объекты загружаются только для текущей страницы.
+
+        Args:
+            request: Запрос.
+            *args: Позиционные аргументы.
+            **kwargs: Ключевые аргументы.
+
+        Returns:
+            Response: Постраничный список вакансий.
+        """
+        if request.query_params.get('include_archived') != '1':
+            return super().list(request, *args, **kwargs)
+
+        columns = ('id', 'archived', 'pub_date', 'salary_min', 'salary_sort')
+        hot, archived = (
+            self.filter_salary(self.get_user_vacancies(model)).annotate(
+                archived=Value(model.is_archived, output_field=BooleanField())
+            ).values(*columns)
+            for model in (Vacancy, ArchivedVacancy)
+        )
+        rows = self.paginate_queryset(
+            self.order_vacancies(hot.union(archived, all=True))
+        )
+
+        objects = {}
+        for model in (Vacancy, ArchivedVacancy):
+            ids = [row['id'] for row in rows
+                   if bool(row['archived']) == model.is_archived]
+            queryset = model.objects.filter(id__in=ids).prefetch_related(
+                'schedule', 'required_education_level', 'required_skills'
+            )
+            for vacancy in queryset:
+                objects[(model.is_archived, vacancy.id)] = vacancy
+
+        vacancies = [objects[(bool(row['archived']), row['id'])]
+                     for row in rows]
+        serializer = self.get_serializer(vacancies, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def get_serializer_class(self) -> Any:
         """
@@ -138,7 +427,8 @@ class VacancyViewSet(ModelViewSet):
         return Response(serializer.data)
 
 
-class MatchingStudentsViewSet(ViewSet):
+class MatchingStudentsViewSet(ReplicaReadMixin, CachedResponseMixin,
+                              ViewSet):
     """
     Этот ViewSet предоставляет список студентов, подходящих
     для конкретной вакансии.
@@ -148,10 +438,14 @@ class MatchingStudentsViewSet(ViewSet):
     Attributes:
         - permission_classes: Список классов разрешений для ViewSet.
         - pagination_class: Кастомный класс пагинации.
+        - replica_actions: Действия, читающие из реплики.
+        - cache_actions: Действия, ответы которых кэшируются.
 
     Methods:
         - list(request, vacancy_id): Возвращает список студентов, подходящих
         для указанной вакансии.
+        - export(request, vacancy_id): Возвращает тот же список
+        потоковым CSV-файлом.
 
     Args:
         request: Запрос.
@@ -162,15 +456,30 @@ class MatchingStudentsViewSet(ViewSet):
     """
     permission_classes = (IsVacancyAuthorOrAdmin,)
     pagination_class = CustomPagination
+    replica_actions = ('list',)
+    cache_actions = ('list',)
 
-    @staticmethod
-    def list(request: Any, vacancy_id: int) -> Response:
-        vacancy = get_object_or_404(Vacancy, id=vacancy_id)
-        required_skills = vacancy.required_skills.all()
+    def get_cache_tags(self) -> Tuple[str, ...]:
+        return (f'vacancy:{self.kwargs["vacancy_id"]}', 'students',
+                *REFERENCE_TAGS.values())
 
-        matching_students = Student.objects.filter(
-            skills__in=required_skills)
+    @staticmethod
+    def get_ranking(request: Any, vacancy_id: int) -> Dict[int, int]:
+        """
+        Возвращает подбор студентов для вакансии: количество совпавших
+        навыков по ID студента в порядке убывания.
+        """
+        # Вакансия уже загружена разрешением IsVacancyAuthorOrAdmin.
+        vacancy = get_request_vacancy(request, vacancy_id)
+        if vacancy is None:
+            raise Http404
+        # Подбор для популярных вакансий предрассчитан задачей
+        # precompute_popular_matches.
+        return dict(get_matching_ranking(vacancy.id))
 
+    @staticmethod
+    def filter_students(request: Any, queryset: QuerySet) -> QuerySet:
+        """Фильтрует студентов по локации, грейду и графику работы."""
         filters = {}
         for param in ['location', 'education_level', 'schedule']:
             value = request.query_params.get(param)
@@ -178,24 +487,166 @@ class MatchingStudentsViewSet(ViewSet):
                 filters[param] = value
 
         if filters:
-            matching_students = matching_students.filter(**filters)
+            queryset = queryset.filter(**filters)
+        return queryset
+
+    def list(self, request: Any, vacancy_id: int) -> Response:
+        ranking = self.get_ranking(request, vacancy_id)
+
+        matching_students = self.filter_students(
+            request, Student.objects.filter(id__in=list(ranking))
+        ).prefetch_related('skills', 'schedule')
 
         matching_students = sorted(
             matching_students,
-            key=lambda student: len(
-                set(required_skills) & set(student.skills.all())),
-            reverse=True
+            key=lambda student: (-ranking[student.id], student.id)
         )
 
         serializer = MatchingStudentSerializer(
             matching_students,
             many=True,
-            context={'vacancy_id': vacancy_id}
+            context={'request': request, 'vacancy_id': vacancy_id}
         )
         return Response(serializer.data)
 
+    def export(self, request: Any, vacancy_id: int) -> Any:
+        """
+        Возвращает подбор студентов для вакансии потоковым CSV-файлом
+        с процентом совпадения навыков.
+        """
+        ranking = self.get_ranking(request, vacancy_id)
+        required_count = len(get_request_vacancy(
+            request, vacancy_id).required_skills.all())
+        students = iter_ranked_students(
+            self.filter_students(request, Student.objects.all()),
+            sorted(ranking, key=lambda pk: (-ranking[pk], pk))
+        )
+        return stream_students_csv(
+            students, f'matching-{vacancy_id}',
+            extra_columns=(('Совпадение, %', lambda student: (
+                ranking[student.id] * 100 // required_count)),)
+        )
+
+
+def get_export_job_data(request: Any, job_id: str, job: Dict) -> Dict:
+    """Возвращает состояние задачи экспорта для ответа API."""
+    data = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == EXPORT_DONE:
+        data['download_url'] = request.build_absolute_uri(
+            reverse('export-download', kwargs={'job_id': job_id}))
+    return data
+
+
+def start_students_export(request: Any, students: QuerySet) -> Response:
+    """
+    Запускает экспорт профилей студентов в PDF задачей celery.
+
+    Файл именуется по SHA-256 данных StudentDetailSerializer, поэтому
+    если такой экспорт уже формировался, задача сразу считается
+    выполненной и файл отдаётся из MEDIA_ROOT.
 
-class FavoriteStudentViewSet(ViewSet):
+    Args:
+        request: Запрос пользователя.
+        students (QuerySet): Экспортируемые студенты.
+
+    Returns:
+        Response: ID задачи и её состояние (HTTP 202).
+    """
+    data = prepare_export_data(StudentDetailSerializer(
+        students, many=True, context={'request': request}).data)
+    content_hash = get_content_hash(data)
+    path = get_export_path(content_hash)
+    job_id = uuid4().hex
+    if default_storage.exists(path):
+        job = create_export_job(job_id, request.user.id, EXPORT_DONE, path)
+    else:
+        job = create_export_job(job_id, request.user.id, EXPORT_PENDING)
+        export_students_pdf.delay(job_id, data, content_hash)
+    return Response(get_export_job_data(request, job_id, job),
+                    status=HTTP_202_ACCEPTED)
+
+
+def get_member_students(user, relation: str) -> QuerySet:
+    """
+    Возвращает студентов из избранного или списка сравнения пользователя.
+
+    Студенты выбираются одним JOIN-запросом и упорядочены по времени
+    добавления: сначала добавленные последними.
+
+    Args:
+        user: Текущий пользователь.
+        relation (str): Связь студента со списком: favorites
+        или compares.
+
+    Returns:
+        QuerySet: QuerySet студентов.
+    """
+    return Student.objects.filter(**{f'{relation}__user': user}).annotate(
+        added_at=F(f'{relation}__created')
+    ).order_by('-added_at', '-id')
+
+
+class StudentBatchMixin:
+    """
+    Миксин пакетного добавления и удаления студентов из избранного
+    или списка сравнения.
+
+    Список ID передаётся в теле запроса ({"student_ids": [1, 2, 3]}),
+    изменения применяются в одной транзакции одним bulk_create
+    (повторы пропускаются уникальным ограничением) и одним delete().
+
+    Attributes:
+        - membership_model: Модель связи пользователя и студента.
+        - batch_added_message (str): Сообщение при добавлении.
+        - batch_deleted_message (str): Сообщение при удалении.
+
+    Methods:
+        - batch_post(request): Добавляет студентов из списка.
+        - batch_delete(request): Удаляет студентов из списка.
+    """
+    membership_model = None
+    batch_added_message = 'Студенты добавлены'
+    batch_deleted_message = 'Студенты удалены'
+
+    def get_batch_student_ids(self, request) -> List[int]:
+        """Валидирует и возвращает список ID студентов из запроса."""
+        serializer = StudentIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data['student_ids']
+
+    def batch_post(self, request) -> Response:
+        """Добавляет студентов из списка."""
+        student_ids = self.get_batch_student_ids(request)
+        existing_ids = set(Student.objects.filter(
+            pk__in=student_ids).values_list('pk', flat=True))
+        missing_ids = [pk for pk in student_ids if pk not in existing_ids]
+        if missing_ids:
+            raise ValidationError(
+                {'student_ids': f'Студенты с ID {missing_ids} не найдены.'})
+
+        with transaction.atomic():
+            self.membership_model.objects.bulk_create(
+                (self.membership_model(user=request.user, student_id=pk)
+                 for pk in student_ids),
+                ignore_conflicts=True
+            )
+        return Response({'detail': self.batch_added_message,
+                         'student_ids': student_ids},
+                        status=HTTP_201_CREATED)
+
+    def batch_delete(self, request) -> Response:
+        """Удаляет студентов из списка."""
+        student_ids = self.get_batch_student_ids(request)
+        with transaction.atomic():
+            self.membership_model.objects.filter(
+                user=request.user, student_id__in=student_ids
+            ).delete()
+        return Response({'detail': self.batch_deleted_message,
+                         'student_ids': student_ids},
+                        status=HTTP_204_NO_CONTENT)
+
+
+class FavoriteStudentViewSet(StudentBatchMixin, ViewSet):
     """
     ViewSet для управления избранными студентами.
 
@@ -203,6 +654,8 @@ class FavoriteStudentViewSet(ViewSet):
         - get(request): Предоставляет список избранных студентов.
         - post(request, student_id): Добавляет студента в избранное.
         - delete(request, student_id): Удаляет студента из избранного.
+        - batch_post(request): Добавляет в избранное список студентов.
+        - batch_delete(request): Удаляет из избранного список студентов.
 
     Permissions:
         - Доступно только авторизованным пользователям.
@@ -220,17 +673,31 @@ class FavoriteStudentViewSet(ViewSet):
         - HTTP_404_NOT_FOUND: Если студент не найден в
         избранном (при удалении).
     """
-    @staticmethod
-    def get_favorites(request) -> Response:
-        """Предоставляет список избранных студентов."""
-        favorites = FavoriteStudent.objects.filter(user=request.user)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = CustomPagination
+    membership_model = FavoriteStudent
+    batch_added_message = 'Студенты добавлены в избранное'
+    batch_deleted_message = 'Студенты удалены из избранного'
 
-        student_ids = [favorite.student_id for favorite in favorites]
-        students = Student.objects.filter(pk__in=student_ids)
-        serializer = StudentSerializer(students, many=True,
-                                       context={'request': request})
+    def get_favorites(self, request) -> Response:
+        """
+        Предоставляет постраничный список избранных студентов.
 
-        return Response(serializer.data, status=HTTP_200_OK)
+        Студенты выбираются через JOIN с избранным пользователя и
+        упорядочены по времени добавления (сначала новые).
+        """
+        students = get_member_students(
+            request.user, 'favorites'
+        ).prefetch_related('skills', 'schedule')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(students, request, view=self)
+        serializer = StudentSerializer(
+            page, many=True,
+            context={'request': request,
+                     'favorite_student_ids': {
+                         student.id for student in page}}
+        )
+        return paginator.get_paginated_response(serializer.data)
 
     @staticmethod
     def post(request, student_id: int) -> Response:
@@ -260,14 +727,20 @@ class FavoriteStudentViewSet(ViewSet):
                         status=HTTP_404_NOT_FOUND)
 
 
-class CompareStudentViewSet(ViewSet):
+class CompareStudentViewSet(StudentBatchMixin, ViewSet):
     """
     ViewSet для управления списком сравнения студентов.
 
     Методы:
         - get_compare(request): Возвращает список студентов в списке сравнения.
+        - get_compare_matrix(request): Возвращает список сравнения в виде
+        матрицы навыков и графиков работы.
+        - export(request): Запускает экспорт списка сравнения в PDF.
         - post(request, student_id): Добавляет студента в список сравнения.
         - delete(request, student_id): Удаляет студента из списка сравнения.
+        - batch_post(request): Добавляет в список сравнения список студентов.
+        - batch_delete(request): Удаляет из списка сравнения список
+        студентов.
 
     Permissions:
         - Доступно только авторизованным пользователям.
@@ -287,16 +760,69 @@ class CompareStudentViewSet(ViewSet):
         - HTTP_404_NOT_FOUND: Если студент не найден в списке
         сравнения (при удалении).
     """
+    permission_classes = (IsAuthenticated,)
+    pagination_class = CustomPagination
+    membership_model = CompareStudent
+    batch_added_message = 'Студенты добавлены в список для сравнения'
+    batch_deleted_message = 'Студенты удалены из списка для сравнения'
+
+    def get_compare(self, request) -> Response:
+        """
+        Возвращает постраничный список студентов в списке сравнения,
+        упорядоченный по времени добавления (сначала новые).
+
+        С параметром mode=matrix возвращает матрицу сравнения
+        (см. get_compare_matrix).
+        """
+        if request.query_params.get('mode') == 'matrix':
+            return self.get_compare_matrix(request)
+
+        students = get_member_students(
+            request.user, 'compares'
+        ).prefetch_related('skills', 'schedule')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(students, request, view=self)
+        serializer = StudentDetailSerializer(
+            page, many=True,
+            context={'request': request,
+                     'compare_student_ids': {
+                         student.id for student in page}}
+        )
+        return paginator.get_paginated_response(serializer.data)
+
     @staticmethod
-    def get_compare(request) -> Response:
-        """Возвращает список студентов в списке сравнения."""
-        compare_students = CompareStudent.objects.filter(user=request.user)
-        student_ids = [compare.student_id for compare in compare_students]
-        students = Student.objects.filter(pk__in=student_ids)
-        serializer = StudentDetailSerializer(students,
-                                             many=True,
-                                             context={'request': request})
+    def export(request) -> Response:
+        """Запускает экспорт всего списка сравнения в PDF."""
+        students = get_member_students(
+            request.user, 'compares'
+        ).prefetch_related('skills', 'schedule')
+        return start_students_export(request, students)
+
+    @staticmethod
+    def get_compare_matrix(request) -> Response:
+        """
+        Возвращает список сравнения в виде матрицы.
 
+        Студенты загружаются одним запросом с предзагрузкой навыков и
+        графиков и разворачиваются в матрицы «навыки × студенты» и
+        «графики × студенты». С параметром vacancy_id для каждого
+        студента считается покрытие требуемых вакансией навыков.
+        """
+        context = {'request': request}
+        vacancy_id = request.query_params.get('vacancy_id')
+        if vacancy_id:
+            if not vacancy_id.isdigit():
+                raise ValidationError(
+                    {'vacancy_id': 'Значение должно быть целым числом.'})
+            vacancies = Vacancy.objects.prefetch_related('required_skills')
+            if not request.user.is_admin:
+                vacancies = vacancies.filter(author=request.user)
+            context['vacancy'] = get_object_or_404(vacancies, id=vacancy_id)
+
+        students = get_member_students(
+            request.user, 'compares'
+        ).prefetch_related('skills', 'schedule')
+        serializer = CompareMatrixSerializer(list(students), context=context)
         return Response(serializer.data, status=HTTP_200_OK)
 
     @staticmethod
@@ -319,10 +845,10 @@ class CompareStudentViewSet(ViewSet):
     def delete(request, student_id: int) -> Response:
         """Удаляет студента из списка сравнения."""
         student = get_object_or_404(Student, pk=student_id)
-        favorite = FavoriteStudent.objects.filter(user=request.user,
-                                                  student=student)
-        if favorite:
-            favorite.delete()
+        compare = CompareStudent.objects.filter(user=request.user,
+                                                student=student)
+        if compare:
+            compare.delete()
             return Response(
                 {"detail": "Студент удалён из списка для сравнения"},
                 status=HTTP_204_NO_CONTENT
@@ -331,3 +857,160 @@ class CompareStudentViewSet(ViewSet):
             {"detail": "Студент не найден в списке для сравнения"},
             status=HTTP_404_NOT_FOUND
         )
+
+
+class TaskMetricsViewSet(ViewSet):
+    """
+    Этот ViewSet предоставляет метрики задач celery: количество
+    запусков, ошибок и повторов, время выполнения и ожидания в очереди.
+
+    Доступен только администраторам.
+
+    Attributes:
+        - permission_classes: Список классов разрешений для ViewSet.
+
+    Methods:
+        - list(request): Возвращает метрики задач.
+    """
+    permission_classes = (IsAdminUser,)
+
+    @staticmethod
+    def list(request: Any) -> Response:
+        task_names = sorted(name for name in celery_app.tasks
+                            if not name.startswith('celery.'))
+        return Response(task_metrics.get(task_names))
+
+
+class DatabaseMetricsViewSet(ViewSet):
+    """
+    Этот ViewSet предоставляет метрики соединений с базами данных:
+    частоту и время открытия соединений и ожидание свободного
+    соединения в пуле.
+
+    Доступен только администраторам.
+
+    Attributes:
+        - permission_classes: Список классов разрешений для ViewSet.
+
+    Methods:
+        - list(request): Возвращает метрики соединений.
+    """
+    permission_classes = (IsAdminUser,)
+
+    @staticmethod
+    def list(request: Any) -> Response:
+        return Response(connection_metrics.get(connections.databases))
+
+
+class CacheStatsViewSet(ViewSet):
+    """
+    Этот ViewSet предоставляет статистику кэша профилей студентов:
+    попадания в кэш процесса и в общий кэш, промахи и долю попаданий.
+
+    Доступен только администраторам.
+
+    Attributes:
+        - permission_classes: Список классов разрешений для ViewSet.
+
+    Methods:
+        - list(request): Возвращает статистику кэша.
+    """
+    permission_classes = (IsAdminUser,)
+
+    @staticmethod
+    def list(request: Any) -> Response:
+        return Response({student_profiles.name: student_profiles.stats()})
+
+
+class ReferenceViewSet(ViewSet):
+    """
+    Этот ViewSet предоставляет все справочники (навыки, локации, графики,
+    грейды, направления и курсы) одним ответом.
+
+    Ответ сериализуется и сжимается один раз для каждой версии
+    reference. ETag содержит версию и кодирование ответа, поэтому
+    клиент с актуальной копией получает 304 без тела, а Cache-Control
+    разрешает хранить ответ REFERENCE_CACHE_MAX_AGE секунд. If-None-Match
+    сравнивается слабо: CompressionMiddleware делает ETag слабым, если
+    сжимает ответ brotli.
+
+    Methods:
+        - list(request): Возвращает справочники.
+    """
+
+    @staticmethod
+    def list(request: Any) -> HttpResponse:
+        version = get_cache_version(REFERENCE_VERSION)
+        gzipped = accepts_encoding(request, 'gzip')
+        # Сжатый и несжатый ответы различаются побайтно, поэтому у них
+        # разные сильные ETag.
+        etag = (f'"{REFERENCE_VERSION}-{version}-gzip"' if gzipped
+                else f'"{REFERENCE_VERSION}-{version}"')
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            payload = get_reference_payload(version)
+            response = HttpResponse(
+                payload['gzip'] if gzipped else payload['body'],
+                content_type='application/json')
+            if gzipped:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        patch_cache_control(response, public=True,
+                            max_age=REFERENCE_CACHE_MAX_AGE)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+class DashboardViewSet(ViewSet):
+    """
+    Этот ViewSet предоставляет сводку для администратора: количество
+    студентов и вакансий и самые востребованные навыки.
+
+    Attributes:
+        - permission_classes: Список классов разрешений для ViewSet.
+
+    Methods:
+        - list(request): Возвращает сводку.
+    """
+    permission_classes = (IsAdminUser,)
+
+    @staticmethod
+    def list(request: Any) -> Response:
+        return Response(get_dashboard())
+
+
+class ExportJobViewSet(ViewSet):
+    """
+    Этот ViewSet предоставляет состояние задач экспорта в PDF и
+    скачивание готовых файлов.
+
+    Задача доступна только пользователю, который её запустил.
+
+    Attributes:
+        - permission_classes: Список классов разрешений для ViewSet.
+
+    Methods:
+        - retrieve(request, job_id): Возвращает состояние задачи.
+        - download(request, job_id): Возвращает готовый PDF-файл.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    @staticmethod
+    def get_job(request: Any, job_id: str) -> Dict:
+        job = get_export_job(job_id)
+        if job is None or job['user_id'] != request.user.id:
+            raise Http404
+        return job
+
+    def retrieve(self, request: Any, job_id: str) -> Response:
+        job = self.get_job(request, job_id)
+        return Response(get_export_job_data(request, job_id, job))
+
+    def download(self, request: Any, job_id: str) -> Any:
+        job = self.get_job(request, job_id)
+        if job['status'] != EXPORT_DONE:
+            raise Http404
+        return FileResponse(default_storage.open(job['path']),
+                            as_attachment=True,
+                            filename=f'students-{job_id}.pdf',
+                            content_type='application/pdf')
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'djoser',
+    'core',
     'users',
     'shared_info',
     'students',
@@ -53,6 +54,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.db_router.ReplicaStickyMiddleware',
 
 ]
 
@@ -83,10 +86,18 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'careerhub.wsgi.application'
 
+# Постоянные соединения с проверкой перед использованием. Если задан
+# DB_POOL_MAX_SIZE, соединения PostgreSQL берутся из общего пула
+# процесса (core.db.postgresql), а CONN_MAX_AGE не используется.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 0))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+
 if DB_ENGINE == 'sqlite3':
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
+            'ENGINE': 'core.db.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
@@ -94,15 +105,43 @@ if DB_ENGINE == 'sqlite3':
 if DB_ENGINE == 'postgresql':
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.postgresql',
+            'ENGINE': 'core.db.postgresql',
             'NAME': os.getenv('DB_NAME', default='django'),
             'USER': os.getenv('POSTGRES_USER', default='django_user'),
             'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='django'),
             'HOST': os.getenv('DB_HOST', default='db'),
-            'PORT': os.getenv('DB_PORT', default=5432)
+            'PORT': os.getenv('DB_PORT', default=5432),
+            'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE else DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+            'POOL': {
+                'MAX_SIZE': DB_POOL_MAX_SIZE,
+                'TIMEOUT': DB_POOL_TIMEOUT,
+            } if DB_POOL_MAX_SIZE else None,
         }
     }
 
+# Реплика для чтения. В тестах указывает на основную базу (MIRROR).
+DB_REPLICA_NAME = os.getenv('DB_REPLICA_NAME')
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+
+if DB_ENGINE == 'sqlite3' and DB_REPLICA_NAME:
+    DATABASES['replica'] = {
+        'ENGINE': 'core.db.sqlite3',
+        'NAME': BASE_DIR / DB_REPLICA_NAME,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+if DB_ENGINE == 'postgresql' and DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -132,17 +171,30 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'backend_static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Шрифт с кириллицей для экспорта профилей студентов в PDF.
+PDF_FONT_PATH = os.getenv('PDF_FONT_PATH',
+                          '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -163,12 +215,49 @@ SWAGGER_SETTINGS = {
 
 FORCE_SCRIPT_NAME = "/"
 
-SESSION_ENGINE = "django.contrib.sessions.backends.cache"
-SESSION_CACHE_ALIAS = "default"
+# redis или locmem. Кэш хранит общее для процессов состояние (снимки
+# пользователей, версии тегов, очередь писем), поэтому locmem подходит
+# только для тестов и запуска в одном процессе.
+CACHE_ENGINE = os.getenv('CACHE_ENGINE', 'redis')
 
 CACHE_TTL = 3600
 CACHE_BACKEND = "default"
 
+# Общие пулы соединений с Redis для кэша и celery. Когда все соединения
+# заняты, поток ждёт свободное не дольше REDIS_POOL_TIMEOUT секунд.
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 50))
+REDIS_POOL_TIMEOUT = int(os.getenv('REDIS_POOL_TIMEOUT', 5))
+REDIS_HEALTH_CHECK_INTERVAL = 30
+
+if CACHE_ENGINE == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'TIMEOUT': CACHE_TTL,
+        }
+    }
+
+if CACHE_ENGINE == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://redis:6379/1'),
+            'TIMEOUT': CACHE_TTL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'CONNECTION_POOL_CLASS': 'redis.BlockingConnectionPool',
+                'CONNECTION_POOL_KWARGS': {
+                    'max_connections': REDIS_MAX_CONNECTIONS,
+                    'timeout': REDIS_POOL_TIMEOUT,
+                    'health_check_interval': REDIS_HEALTH_CHECK_INTERVAL,
+                },
+            },
+        }
+    }
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cache"
+SESSION_CACHE_ALIAS = "default"
+
 DJOSER = {
     'LOGIN_FIELD': 'email',
     'HIDE_USERS': False,
@@ -198,7 +287,34 @@ EMAIL_USE_SSL = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL')
+# Для локальной проверки писем:
+# django.core.mail.backends.console.EmailBackend или
+# django.core.mail.backends.filebased.EmailBackend (в EMAIL_FILE_PATH).
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND',
+                          'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')
+# Письма активации копятся EMAIL_BATCH_WINDOW секунд и отправляются
+# пачками по EMAIL_BATCH_SIZE через одно соединение. 0 - без ожидания.
+EMAIL_BATCH_WINDOW = int(os.getenv('EMAIL_BATCH_WINDOW', 5))
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', 100))
+# Ограничение celery на количество пачек писем в единицу времени.
+EMAIL_RATE_LIMIT = os.getenv('EMAIL_RATE_LIMIT', '30/m')
 
 CELERY_BROKER_URL = 'redis://redis:6379/0'
 
+# Вакансии старше указанного количества дней переносятся в архив.
+VACANCY_ARCHIVE_AFTER_DAYS = int(os.getenv('VACANCY_ARCHIVE_AFTER_DAYS', 180))
+
+# Асинхронные представления чтения для запуска под uvicorn
+# (infra/docker-compose.asgi.yml).
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+# Размер пула потоков для запросов к БД и кэшу из этих представлений
+# в одном процессе.
+ASYNC_READ_THREADS = int(os.getenv('ASYNC_READ_THREADS', 16))
+
+# Сжатие JSON-ответов (brotli или gzip) от указанного размера в байтах.
+RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True') == 'True'
+RESPONSE_COMPRESSION_MIN_SIZE = int(
+    os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+
 CORS_ALLOW_ALL_ORIGINS = True
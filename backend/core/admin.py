@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from core.models import StoredFile
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    """
+    Класс администратора для модели StoredFile.
+
+    Параметры:
+        - list_display: Поля, которые будут отображаться в списке файлов.
+        - search_fields: Поля, по которым можно выполнять поиск файлов.
+        - readonly_fields: Поля, недоступные для редактирования.
+
+    Модель:
+        - StoredFile.
+    """
+    list_display = ('id', 'name', 'references', 'created')
+    search_fields = ('name',)
+    readonly_fields = ('name', 'references', 'created')
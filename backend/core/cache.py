@@ -0,0 +1,463 @@
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import urlencode
+from django_redis import get_redis_connection
+from rest_framework.response import Response
+
+from core.constants.settings import (CACHE_INVALIDATION_CHANNEL,
+                                     CACHE_STATS_FLUSH_EVERY,
+                                     REPLICA_STICKY_SECONDS)
+from core.db_router import reads_from_replica
+from core.metrics import CacheCounters
+
+CACHE_VERSION_KEY = 'version'
+CACHE_STATS_KEY = 'cache:stats'
+CACHE_STATS_COUNTERS = ('local_hits', 'shared_hits', 'misses')
+RESPONSE_CACHE_KEY = 'response'
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Ограниченный по размеру кэш в памяти процесса (least recently used).
+
+    Используется как первый уровень перед общим кэшем (Redis): хранит
+    небольшое количество горячих значений в каждом воркере. При
+    переполнении вытесняются значения, к которым дольше всего
+    не обращались. Потокобезопасен.
+
+    Attributes:
+        - maxsize (int): Максимальное количество значений.
+        - hits (int): Количество попаданий.
+        - misses (int): Количество промахов.
+
+    Methods:
+        - get(key, default=None): Возвращает значение по ключу.
+        - set(key, value): Сохраняет значение.
+        - delete(key): Удаляет значение.
+        - clear(): Очищает кэш.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def items(self) -> List[tuple]:
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def get_cache_version(name: str) -> int:
+    """
+    Возвращает текущую версию набора данных name в общем кэше.
+
+    Версия входит в ключи закэшированных значений, поэтому смена
+    версии делает все старые значения недоступными без их удаления.
+
+    Args:
+        name (str): Название набора данных, например students.
+
+    Returns:
+        int: Версия набора данных.
+    """
+    cache = caches[settings.CACHE_BACKEND]
+    key = f'{CACHE_VERSION_KEY}:{name}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_cache_versions(*names: str) -> List[int]:
+    """Возвращает версии наборов данных names одним запросом к кэшу."""
+    keys = [f'{CACHE_VERSION_KEY}:{name}' for name in names]
+    stored = caches[settings.CACHE_BACKEND].get_many(keys)
+    return [stored.get(key) or get_cache_version(name)
+            for key, name in zip(keys, names)]
+
+
+def bump_cache_version(*names: str) -> None:
+    """
+    Меняет версии наборов данных names, сбрасывая их кэш, и сообщает
+    об этом кэшам процессов (TwoLevelCache).
+
+    Внутри транзакции версии меняются после её фиксации: иначе другой
+    процесс успел бы прочитать из БД старые данные и сохранить их под
+    новой версией.
+    """
+    def bump() -> None:
+        caches[settings.CACHE_BACKEND].set_many(
+            {f'{CACHE_VERSION_KEY}:{name}': time.time_ns()
+             for name in names},
+            timeout=None
+        )
+        invalidation_listener.publish(names)
+
+    transaction.on_commit(bump)
+
+
+def can_cache(versions: Iterable[int]) -> bool:
+    """
+    Проверяет, можно ли сохранить в кэш значение, прочитанное при
+    версиях versions.
+
+    Реплика может ещё не получить изменения, которые только что
+    сменили версию, и такое значение нельзя сохранять под новой
+    версией.
+    """
+    if not reads_from_replica():
+        return True
+    return all(time.time_ns() - version >= REPLICA_STICKY_SECONDS * 10 ** 9
+               for version in versions)
+
+
+def make_versioned_key(key: str, *names: str) -> str:
+    """
+    Возвращает ключ кэша с текущими версиями наборов данных names.
+
+    Args:
+        key (str): Базовый ключ.
+        names (str): Наборы данных, от которых зависит значение.
+
+    Returns:
+        str: Ключ вида key:v1:v2.
+    """
+    versions = ':'.join(str(version)
+                        for version in get_cache_versions(*names))
+    return f'{key}:{versions}'
+
+
+class CachedResponseMixin:
+    """
+    Миксин ViewSet, кэширующий ответы GET-запросов в общем кэше.
+
+    Ответ хранится отдельно для каждого пути, роли пользователя (или
+    самого пользователя, если cache_vary_by_user) и набора параметров
+    запроса. В ключ входят версии тегов из get_cache_tags(), например
+    student:<id> или ref:skills: сигналы моделей меняют версии тегов
+    (bump_cache_version), и старые ответы больше не читаются.
+
+    Ответ проверяется в кэше после аутентификации и проверки
+    разрешений. Данные конкретного пользователя (например, избранное)
+    в ответ из кэша подставляет personalize_cached_data().
+
+    Attributes:
+        - cache_actions: Действия, ответы которых кэшируются.
+        - cache_timeout: Время хранения ответа (по умолчанию CACHE_TTL).
+        - cache_vary_by_user: Хранить ответы для каждого пользователя.
+
+    Methods:
+        - get_cache_tags(): Возвращает теги ответа текущего запроса.
+        - personalize_cached_data(data): Дополняет ответ из кэша
+        данными текущего пользователя.
+    """
+    cache_actions = ('retrieve',)
+    cache_timeout = None
+    cache_vary_by_user = False
+
+    def get_cache_tags(self) -> Iterable[str]:
+        return ()
+
+    def personalize_cached_data(self, data: Any) -> Any:
+        return data
+
+    def get_response_cache_key(self, request: Any, versions: List[int]) -> str:
+        user = request.user
+        if self.cache_vary_by_user:
+            vary = f'user:{user.pk}'
+        else:
+            vary = f'role:{getattr(user, "role", "anonymous")}'
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        params_hash = hashlib.md5(params.encode()).hexdigest()
+        versions = ':'.join(str(version) for version in versions)
+        return (f'{RESPONSE_CACHE_KEY}:{request.path}:{vary}:{params_hash}:'
+                f'{versions}')
+
+    def cache_response(self, handler: Callable) -> Callable:
+        """Оборачивает обработчик действия чтением ответа из кэша."""
+
+        @wraps(handler)
+        def cached_handler(request, *args, **kwargs):
+            cache = caches[settings.CACHE_BACKEND]
+            versions = get_cache_versions(*self.get_cache_tags())
+            key = self.get_response_cache_key(request, versions)
+            data = cache.get(key)
+            if data is not None:
+                return Response(self.personalize_cached_data(data))
+
+            response = handler(request, *args, **kwargs)
+            if response.status_code == 200 and can_cache(versions):
+                timeout = (self.cache_timeout if self.cache_timeout
+                           is not None else settings.CACHE_TTL)
+                cache.set(key, response.data, timeout=timeout)
+            return response
+
+        return cached_handler
+
+    def initial(self, request: Any, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        if request.method == 'GET' and self.action in self.cache_actions:
+            # ViewSet уже связал метод GET с обработчиком действия.
+            self.get = self.cache_response(self.get)
+
+
+class InvalidationListener:
+    """
+    Рассылка сброса версий между процессами через Redis pub/sub.
+
+    bump_cache_version() публикует изменённые наборы данных в канал
+    CACHE_INVALIDATION_CHANNEL, а поток-подписчик каждого процесса
+    удаляет зависящие от них значения из кэшей TwoLevelCache. С кэшем
+    в памяти процесса (locmem) кэши сбрасываются напрямую.
+
+    Methods:
+        - register(cache): Подключает кэш процесса к рассылке. Кэш
+        должен иметь методы invalidate(names) и clear_local().
+        - publish(names): Сбрасывает наборы данных names во всех
+        процессах.
+        - is_ready(): Проверяет, что процесс получает сообщения о
+        сбросе и кэшу процесса можно доверять.
+    """
+
+    def __init__(self, channel: str = CACHE_INVALIDATION_CHANNEL):
+        self.channel = channel
+        self.subscribed = False
+        self._caches: List[Any] = []
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    @staticmethod
+    def uses_redis() -> bool:
+        return settings.CACHE_ENGINE == 'redis'
+
+    def register(self, cache: Any) -> None:
+        self._caches.append(cache)
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        names = set(names)
+        for cache in self._caches:
+            cache.invalidate(names)
+
+    def publish(self, names: Iterable[str]) -> None:
+        names = list(names)
+        self.invalidate(names)
+        if self.uses_redis():
+            get_redis_connection(settings.CACHE_BACKEND).publish(
+                self.channel, json.dumps(names))
+
+    def is_ready(self) -> bool:
+        if not self.uses_redis():
+            return True
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._listen, daemon=True)
+                self._thread.start()
+        return self.subscribed
+
+    def _handle(self, message: Dict) -> None:
+        """
+        Сбрасывает наборы данных из сообщения. Неверное сообщение
+        пропускается и не прерывает подписку.
+        """
+        try:
+            names = json.loads(message['data'])
+        except (KeyError, TypeError, ValueError):
+            logger.exception('Неверное сообщение о сбросе кэша: %r',
+                             message)
+            return
+        if not isinstance(names, list):
+            logger.error('Неверное сообщение о сбросе кэша: %r', message)
+            return
+        self.invalidate(names)
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = get_redis_connection(
+                    settings.CACHE_BACKEND).pubsub(
+                    ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Сообщения, отправленные до подписки, потеряны.
+                for cache in self._caches:
+                    cache.clear_local()
+                self.subscribed = True
+                for message in pubsub.listen():
+                    self._handle(message)
+            except Exception:
+                logger.exception('Подписка на сброс кэша прервана.')
+            self.subscribed = False
+            for cache in self._caches:
+                cache.clear_local()
+            time.sleep(1)
+
+
+invalidation_listener = InvalidationListener()
+
+
+class TwoLevelCache:
+    """
+    Двухуровневый кэш: LRUCache процесса перед общим кэшем (Redis).
+
+    Значение зависит от тегов (версий наборов данных, см.
+    bump_cache_version). В общем кэше оно хранится под ключом с
+    версиями тегов, а в LRU процесса – до сообщения о сбросе одного
+    из тегов (InvalidationListener), но не дольше local_ttl секунд.
+    Пока процесс не подписан на сообщения, LRU не используется.
+
+    Значения из LRU общие для всех потоков процесса и не должны
+    изменяться. Статистика попаданий копится в процессе и
+    переносится в общий кэш каждые CACHE_STATS_FLUSH_EVERY обращений.
+
+    Attributes:
+        - name (str): Имя кэша, префикс ключей и статистики.
+        - local (LRUCache): Кэш процесса.
+        - local_ttl (int): Время хранения значения в LRU в секундах.
+        - timeout (int): Время хранения значения в общем кэше.
+
+    Methods:
+        - get(key, tags, build): Возвращает значение, при промахе
+        строит его функцией build.
+        - invalidate(names): Удаляет из LRU значения с тегами names.
+        - stats(): Возвращает статистику попаданий всех процессов.
+    """
+
+    def __init__(self, name: str, maxsize: int, local_ttl: int,
+                 timeout: Optional[int] = None):
+        self.name = name
+        self.local = LRUCache(maxsize)
+        self.local_ttl = local_ttl
+        self.timeout = timeout
+        self.counters = CacheCounters(CACHE_STATS_KEY)
+        self._generation = 0
+        self._pending = Counter()
+        self._lock = Lock()
+        invalidation_listener.register(self)
+
+    def get(self, key: Hashable, tags: Iterable[str],
+            build: Callable[[], Any]) -> Any:
+        """
+        Возвращает значение по ключу key.
+
+        Args:
+            key: Ключ значения.
+            tags: Теги, от которых зависит значение.
+            build: Функция построения значения. Если она вернула None,
+            значение не кэшируется.
+
+        Returns:
+            Значение или None.
+        """
+        tags = tuple(tags)
+        use_local = invalidation_listener.is_ready()
+        if use_local:
+            entry = self.local.get(key)
+            if (entry is not None and entry[0] == tags
+                    and time.monotonic() - entry[1] < self.local_ttl):
+                self._record('local_hits')
+                return entry[2]
+
+        generation = self._generation
+        versions = get_cache_versions(*tags)
+        shared_key = ':'.join(
+            [self.name, str(key), *(str(version) for version in versions)])
+        cache = caches[settings.CACHE_BACKEND]
+        value = cache.get(shared_key)
+        if value is not None:
+            self._record('shared_hits')
+        else:
+            self._record('misses')
+            value = build()
+            if value is None or not can_cache(versions):
+                return value
+            cache.set(shared_key, value, timeout=(
+                self.timeout if self.timeout is not None
+                else settings.CACHE_TTL))
+
+        # Сброс, пришедший во время чтения, мог относиться к value.
+        if use_local and generation == self._generation:
+            self.local.set(key, (tags, time.monotonic(), value))
+        return value
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        names = set(names)
+        self._generation += 1
+        for key, (tags, _, _) in self.local.items():
+            if names.intersection(tags):
+                self.local.delete(key)
+
+    def clear_local(self) -> None:
+        self._generation += 1
+        self.local.clear()
+
+    def _record(self, counter: str) -> None:
+        with self._lock:
+            self._pending[counter] += 1
+            if sum(self._pending.values()) < CACHE_STATS_FLUSH_EVERY:
+                return
+        self.flush_stats()
+
+    def flush_stats(self) -> None:
+        """Переносит статистику процесса в общий кэш."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        for counter, value in pending.items():
+            self.counters.incr(self.name, counter, value)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Возвращает количество попаданий в LRU, в общий кэш и промахов
+        по всем процессам и долю попаданий.
+        """
+        self.flush_stats()
+        stats = self.counters.values(self.name, CACHE_STATS_COUNTERS)
+        total = sum(stats.values())
+        hits = stats['local_hits'] + stats['shared_hits']
+        stats['hit_ratio'] = round(hits / total, 4) if total else 0
+        stats['local_hit_ratio'] = (round(stats['local_hits'] / total, 4)
+                                    if total else 0)
+        stats['local_size'] = len(self.local)
+        return stats
@@ -1,24 +1,88 @@
 import os
+from smtplib import SMTPException
 
-import requests
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_ready
+from kombu import Queue
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import get_connection
+from django.db import DatabaseError
 
 from careerhub.settings import DEFAULT_FROM_EMAIL
+from core.celery import metrics  # noqa: F401
+from core.constants.settings import EMAIL_MAX_RETRIES, EMAIL_RETRY_BACKOFF
+from core.mail import EmailOutbox, build_message
+from users.utils import activate_user_by_token, ActivationError
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'careerhub.settings')
 
 app = Celery('careerhub')
 app.config_from_object('django.conf:settings')
 app.conf.broker_url = settings.CELERY_BROKER_URL
+# Соединения с брокером берутся из пула и проверяются перед
+# использованием, а не открываются для каждой публикации задачи.
+app.conf.broker_pool_limit = settings.REDIS_MAX_CONNECTIONS
+app.conf.broker_transport_options = {
+    'max_connections': settings.REDIS_MAX_CONNECTIONS,
+    'health_check_interval': settings.REDIS_HEALTH_CHECK_INTERVAL,
+}
 app.autodiscover_tasks()
+app.autodiscover_tasks(['api.v1'])
+# Активация, письма и тяжёлые вычисления обрабатываются разными
+# воркерами (см. infra/docker-compose.yml), поэтому долгие задачи
+# не задерживают активацию аккаунтов.
+app.conf.task_default_queue = 'default'
+app.conf.task_queues = (
+    Queue('default'),
+    Queue('activation'),
+    Queue('email'),
+    Queue('compute'),
+)
+app.conf.task_routes = {
+    'core.celery.celery_app.activate_user': {'queue': 'activation'},
+    'core.celery.celery_app.send_activation_email': {'queue': 'email'},
+    'core.celery.celery_app.flush_email_outbox': {'queue': 'email'},
+    'core.celery.celery_app.send_email_batch': {'queue': 'email'},
+    'vacancies.tasks.*': {'queue': 'compute'},
+    'api.v1.tasks.*': {'queue': 'compute'},
+    'students.tasks.*': {'queue': 'compute'},
+    'users.tasks.*': {'queue': 'compute'},
+}
+# Prefetch задаётся каждому воркеру отдельно (см. infra/docker-compose.yml).
+# После выполнения подтверждаются только повторяемые вычислительные
+# задачи (acks_late в их декораторах): письма и активация
+# подтверждаются при получении, чтобы падение воркера после отправки
+# не отправило пачку писем повторно.
+app.conf.beat_schedule = {
+    'archive-vacancies': {
+        'task': 'vacancies.tasks.archive_vacancies',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'precompute-read-models': {
+        'task': 'api.v1.tasks.precompute_read_models',
+        'schedule': crontab(hour=4, minute=0),
+    },
+}
+
+
+@worker_ready.connect
+def warm_read_models(sender=None, **kwargs):
+    """
+    Прогревает кэш моделей чтения после запуска воркера, чтобы первые
+    запросы после деплоя или сброса кэша не считались с нуля.
+    """
+    sender.app.send_task('api.v1.tasks.precompute_read_models',
+                         kwargs={'refresh': False})
 
 
 @app.task()
 def send_activation_email(activation_link, recipient_list):
     """
-    Отправляет письмо со ссылкой активации пользователю.
+    Ставит письмо со ссылкой активации в очередь пакетной отправки.
+
+    Первое письмо в окне EMAIL_BATCH_WINDOW планирует выгрузку очереди,
+    остальные письма окна уходят вместе с ним через одно соединение.
 
     :param activation_link: Ссылка для активации аккаунта.
     :param recipient_list: Список получателей письма.
@@ -29,20 +93,91 @@ def send_activation_email(activation_link, recipient_list):
                'начать пользоваться сервисом.')
     message += (f'\nАктивируйте ваш аккаунт, перейдя по следующей '
                 f'ссылке:\nhttps://tracker-hiring.ddns.net{activation_link}')
-    from_email = DEFAULT_FROM_EMAIL
-    send_mail(subject, message, from_email, recipient_list)
+    email = {'subject': subject, 'body': message,
+             'from_email': DEFAULT_FROM_EMAIL, 'to': recipient_list}
+
+    window = settings.EMAIL_BATCH_WINDOW
+    if not window:
+        send_email_batch.delay([email])
+        return
+    outbox = EmailOutbox()
+    outbox.push(email)
+    if outbox.schedule_flush(window):
+        flush_email_outbox.apply_async(countdown=window)
 
 
 @app.task()
+def flush_email_outbox():
+    """
+    Выгружает очередь писем пачками по EMAIL_BATCH_SIZE и ставит
+    каждую пачку в задачу send_email_batch.
+
+    :return: Количество поставленных пачек.
+    """
+    outbox = EmailOutbox()
+    if not outbox.lock():
+        # Выгрузка уже идёт и может не забрать письма, добавленные в
+        # конце, поэтому очередь проверяется ещё раз позже.
+        flush_email_outbox.apply_async(
+            countdown=settings.EMAIL_BATCH_WINDOW)
+        return 0
+    # Письма, добавленные после этой точки, запланируют новую выгрузку.
+    outbox.unschedule_flush()
+    batches = 0
+    try:
+        while True:
+            messages = outbox.pop(settings.EMAIL_BATCH_SIZE)
+            if not messages:
+                return batches
+            send_email_batch.delay(messages)
+            batches += 1
+    finally:
+        outbox.unlock()
+
+
+@app.task(bind=True, rate_limit=settings.EMAIL_RATE_LIMIT,
+          max_retries=EMAIL_MAX_RETRIES)
+def send_email_batch(self, messages):
+    """
+    Отправляет пачку писем через одно соединение с почтовым сервером.
+
+    При ошибке SMTP или сети задача перезапускается с экспоненциальной
+    паузой только для неотправленных писем.
+
+    :param messages: Письма в виде словарей subject, body,
+    from_email и to.
+    :return: Количество отправленных писем.
+    """
+    sent = 0
+    try:
+        with get_connection() as connection:
+            for message in messages:
+                connection.send_messages([build_message(message)])
+                sent += 1
+    except (SMTPException, OSError) as error:
+        raise self.retry(
+            args=(messages[sent:],), exc=error,
+            countdown=EMAIL_RETRY_BACKOFF * 2 ** self.request.retries
+        )
+    return sent
+
+
+@app.task(autoretry_for=(DatabaseError,), retry_backoff=True,
+          retry_kwargs={'max_retries': 5})
 def activate_user(uid, token):
     """
     Активирует пользователя с заданным UID и токеном.
 
+    Токен проверяется и пользователь активируется прямо в воркере,
+    без HTTP-запроса к backend. Повторная активация ничего не меняет,
+    при ошибках БД задача перезапускается с экспоненциальной паузой.
+
     :param uid: Уникальный идентификатор пользователя.
     :param token: Токен активации.
-    :return: Ответ, указывающий на успешную активацию или ошибку.
+    :return: Результат активации: activated, already_active или
+    описание ошибки для неверного UID или токена.
     """
-    payload = {'uid': uid, 'token': token}
-    url = "http://backend:8000/api/users/activation/"
-    response = requests.post(url, data=payload)
-    return response
+    try:
+        return activate_user_by_token(uid, token)
+    except ActivationError as error:
+        return str(error)
@@ -0,0 +1,109 @@
+import time
+from typing import Dict, Iterable
+
+from celery.signals import (before_task_publish, task_failure, task_postrun,
+                            task_prerun, task_retry)
+
+from core.metrics import CacheCounters
+
+TASK_METRICS_KEY = 'celery:metrics'
+TASK_METRICS_COUNTERS = ('started', 'succeeded', 'failed', 'retried',
+                         'runtime_ms', 'wait_ms')
+TASK_METRICS_MAXIMUMS = ('runtime_max_ms', 'wait_max_ms')
+PUBLISHED_AT_HEADER = 'published_at'
+
+_started_at: Dict[str, float] = {}
+
+
+class TaskMetrics(CacheCounters):
+    """
+    Хранилище метрик задач celery в общем кэше (CACHE_BACKEND).
+
+    Для каждой задачи хранятся счётчики запусков, успешных завершений,
+    ошибок и повторов, суммарное и максимальное время выполнения и
+    ожидания в очереди (в миллисекундах). Счётчики увеличиваются
+    атомарно, поэтому метрики воркеров суммируются.
+
+    Methods:
+        - incr(task_name, counter, value=1): Увеличивает счётчик.
+        - observe(task_name, name, value_ms): Учитывает длительность.
+        - get(task_names): Возвращает метрики указанных задач.
+    """
+
+    def __init__(self, key: str = TASK_METRICS_KEY):
+        super().__init__(key)
+
+    def get(self, task_names: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Возвращает метрики задач, которые запускались хотя бы раз.
+
+        Args:
+            task_names: Имена задач.
+
+        Returns:
+            dict: Метрики по имени задачи, включая среднее время
+            выполнения и ожидания.
+        """
+        task_names = list(task_names)
+        counters = TASK_METRICS_COUNTERS + TASK_METRICS_MAXIMUMS
+        stored = self.cache.get_many(
+            self._key(task_name, counter)
+            for task_name in task_names for counter in counters
+        )
+        metrics = {}
+        for task_name in task_names:
+            values = {counter: stored.get(self._key(task_name, counter), 0)
+                      for counter in counters}
+            if not values['started']:
+                continue
+            finished = (values['succeeded'] + values['failed']
+                        + values['retried'])
+            values['runtime_avg_ms'] = (values['runtime_ms'] // finished
+                                        if finished else 0)
+            values['wait_avg_ms'] = values['wait_ms'] // values['started']
+            metrics[task_name] = values
+        return metrics
+
+
+task_metrics = TaskMetrics()
+
+
+@before_task_publish.connect
+def mark_published(headers=None, **kwargs):
+    """Добавляет в заголовки задачи время постановки в очередь."""
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect
+def record_start(task_id=None, task=None, **kwargs):
+    """Учитывает запуск задачи и время её ожидания в очереди."""
+    _started_at[task_id] = time.perf_counter()
+    task_metrics.incr(task.name, 'started')
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at:
+        wait_ms = max(int((time.time() - published_at) * 1000), 0)
+        task_metrics.observe(task.name, 'wait', wait_ms)
+
+
+@task_postrun.connect
+def record_finish(task_id=None, task=None, state=None, **kwargs):
+    """Учитывает время выполнения и успешное завершение задачи."""
+    started_at = _started_at.pop(task_id, None)
+    if started_at is not None:
+        runtime_ms = int((time.perf_counter() - started_at) * 1000)
+        task_metrics.observe(task.name, 'runtime', runtime_ms)
+    if state == 'SUCCESS':
+        task_metrics.incr(task.name, 'succeeded')
+
+
+@task_failure.connect
+def record_failure(sender=None, **kwargs):
+    """Учитывает завершение задачи с ошибкой."""
+    task_metrics.incr(sender.name, 'failed')
+
+
+@task_retry.connect
+def record_retry(sender=None, **kwargs):
+    """Учитывает повторный запуск задачи."""
+    task_metrics.incr(sender.name, 'retried')
@@ -0,0 +1,119 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date, quote_etag
+
+from core.cache import get_cache_versions
+
+
+def touch(model: Any, pks: Iterable[int]) -> None:
+    """
+    Обновляет дату изменения updated_at объектов model с ID pks.
+
+    Используется, когда объект меняется без вызова save(): при
+    изменении связей многие-ко-многим или обновлении через QuerySet.
+    """
+    pks = list(pks)
+    if pks:
+        model.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+
+
+class ConditionalGetMixin:
+    """
+    Миксин ViewSet, отвечающий 304 Not Modified на условные GET-запросы
+    (If-None-Match, If-Modified-Since) без сериализации ответа.
+
+    Валидаторы считаются одним запросом по полю updated_at: для объекта
+    это дата его изменения, для списка — наибольшая дата изменения и
+    количество объектов после фильтрации (удаление меняет количество,
+    добавление и изменение — дату). Ответ зависит и от данных, которые
+    не меняют updated_at, поэтому в ETag входят пользователь, версии
+    тегов из get_validator_tags() (справочники) и состояние из
+    get_validator_state() (избранное пользователя), а Last-Modified
+    учитывает время смены версий и дату из get_validator_state().
+
+    Attributes:
+        - conditional_actions: Действия, поддерживающие условные запросы.
+
+    Methods:
+        - get_validator_tags(): Возвращает теги, от которых зависит ответ.
+        - get_validator_state(): Возвращает дату изменения и значения
+        данных из БД, от которых зависит ответ помимо его объектов.
+        - get_modified_state(): Возвращает дату последнего изменения и
+        количество объектов ответа.
+    """
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_tags(self) -> Iterable[str]:
+        return ()
+
+    def get_validator_state(self) -> Tuple[Optional[datetime], Tuple]:
+        return None, ()
+
+    def get_modified_state(self) -> Tuple[Optional[datetime], int]:
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        state = queryset.order_by().aggregate(updated_at=Max('updated_at'),
+                                              count=Count('pk'))
+        return state['updated_at'], state['count']
+
+    def get_validators(self, request: Any) -> Optional[Tuple[str, int]]:
+        """
+        Возвращает ETag и Last-Modified (timestamp) ответа или None,
+        если объекта нет и ответ сформирует обработчик (404).
+        """
+        try:
+            updated_at, count = self.get_modified_state()
+        except (TypeError, ValueError):
+            return None
+        if self.action == 'retrieve' and not count:
+            return None
+        versions = get_cache_versions(*self.get_validator_tags())
+        extra_updated_at, extra_state = self.get_validator_state()
+        modified = [version / 10 ** 9 for version in versions]
+        modified.extend(date.timestamp() for date in (updated_at,
+                                                      extra_updated_at)
+                        if date is not None)
+        values = (*versions, *extra_state)
+        state = (f'{request.user.pk}:{updated_at and updated_at.isoformat()}:'
+                 f'{count}:{":".join(str(value) for value in values)}')
+        etag = quote_etag(hashlib.md5(state.encode()).hexdigest())
+        return etag, int(max(modified, default=0))
+
+    def conditional_response(self, handler: Callable) -> Callable:
+        """Оборачивает обработчик действия проверкой валидаторов."""
+
+        @wraps(handler)
+        def conditional_handler(request, *args, **kwargs):
+            validators = self.get_validators(request)
+            if validators is None:
+                return handler(request, *args, **kwargs)
+            etag, last_modified = validators
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = handler(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+                # Ответ зависит от пользователя и проверяется при
+                # каждом запросе.
+                patch_cache_control(response, private=True, no_cache=True)
+                patch_vary_headers(response, ('Authorization',))
+            return response
+
+        return conditional_handler
+
+    def initial(self, request: Any, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        if request.method == 'GET' and self.action in self.conditional_actions:
+            self.get = self.conditional_response(self.get)
@@ -3,3 +3,27 @@
 # -------------------------
 
 PAGINATION_PAGE_SIZE: int = 10
+EMAIL_MAX_RETRIES: int = 5
+EMAIL_RETRY_BACKOFF: int = 10
+EMAIL_OUTBOX_LOCK_TIMEOUT: int = 60
+READ_MODEL_CACHE_TTL: int = 60 * 60 * 24
+DASHBOARD_TOP_SKILLS: int = 10
+EXPORT_DIR: str = 'exports'
+EXPORT_JOB_TTL: int = 60 * 60 * 24
+EXPORT_JOB_ID_LENGTH: int = 32
+EXPORT_JOB_STATUS_LENGTH: int = 16
+EXPORT_CHUNK_SIZE: int = 500
+AVATAR_THUMBNAIL_DIR: str = 'avatars/thumbnails'
+AVATAR_THUMBNAIL_SIZES: tuple = (64, 128, 256)
+AVATAR_THUMBNAIL_QUALITY: int = 85
+STORED_FILE_NAME_LENGTH: int = 255
+STORED_FILE_GC_GRACE_HOURS: int = 24
+PRIMARY_DATABASE: str = 'default'
+REPLICA_DATABASE: str = 'replica'
+REPLICA_STICKY_SECONDS: int = 10
+CACHE_INVALIDATION_CHANNEL: str = 'cache:invalidate'
+CACHE_STATS_FLUSH_EVERY: int = 100
+STUDENT_PROFILE_CACHE_SIZE: int = 1024
+STUDENT_PROFILE_LOCAL_TTL: int = 60
+COMPRESSIBLE_CONTENT_TYPES: tuple = ('application/json',)
+COMPRESSION_BROTLI_QUALITY: int = 5
@@ -8,3 +8,15 @@ SPECIALIZATION_NAME_LENGTH: int = 100
 SCHEDULE_NAME_LENGTH: int = 100
 COURSE_NAME_LENGTH: int = 100
 LOCATION_LENGTH: int = 100
+# Теги кэша ответов по имени модели справочника (см. CachedResponseMixin).
+REFERENCE_TAGS: dict = {
+    'skill': 'ref:skills',
+    'educationlevel': 'ref:education_levels',
+    'specialization': 'ref:specializations',
+    'schedule': 'ref:schedules',
+    'course': 'ref:courses',
+    'location': 'ref:locations',
+}
+# Как часто проверять версию справочников без рассылки сброса (секунды).
+REFERENCE_REGISTRY_CHECK_INTERVAL: int = 1
+REFERENCE_CACHE_MAX_AGE: int = 60 * 60
@@ -12,3 +12,4 @@ PORTFOLIO_LENGTH: int = 200
 EXPERIENCE_LENGTH: int = 2000
 STUDENT_MIN_AGE: int = 18
 STUDENT_MAX_AGE: int = 100
+STUDENT_BATCH_MAX_SIZE: int = 100
@@ -8,3 +8,6 @@ NAME_LENGTH: int = 150
 PHONE_NUMBER_LENGTH: int = 20
 ROLE_LENGTH: int = 20
 TELEGRAM_LENGTH: int = 100
+USER_SNAPSHOT_CACHE_SIZE: int = 1024
+USER_SNAPSHOT_CACHE_TTL: int = 300
+USER_SNAPSHOT_LOCAL_TTL: int = 30
@@ -6,3 +6,8 @@ VACANCY_NAME_LENGTH: int = 100
 VACANCY_SALARY_LENGTH: int = 100
 VACANCY_SCHEDULE_LENGTH: int = 100
 VACANCY_TEXT_LENGTH: int = 10000
+VACANCY_CURRENCY_LENGTH: int = 3
+VACANCY_BACKFILL_CHUNK_SIZE: int = 2000
+VACANCY_ARCHIVE_BATCH_SIZE: int = 500
+POPULAR_VACANCIES_LIMIT: int = 100
+SALARY_MAX_AMOUNT: int = 100_000_000
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from core.db.metrics import connection_metrics
+
+
+class InstrumentedDatabaseMixin:
+    """
+    Миксин DatabaseWrapper с проверкой постоянных соединений и учётом
+    их открытия в connection_metrics.
+
+    Если в настройках базы задан CONN_HEALTH_CHECKS (в Django он
+    появился только в 4.1), соединение, пережившее запрос, проверяется
+    при первом использовании в следующем запросе и переоткрывается,
+    если сервер его уже закрыл.
+    """
+    health_check_needed = False
+
+    def get_new_connection(self, conn_params: Dict) -> Any:
+        started_at = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        open_ms = int((time.perf_counter() - started_at) * 1000)
+        connection_metrics.incr(self.alias, 'opened')
+        connection_metrics.observe(self.alias, 'open', open_ms)
+        return connection
+
+    def close_if_unusable_or_obsolete(self) -> None:
+        super().close_if_unusable_or_obsolete()
+        self.health_check_needed = (
+            self.connection is not None
+            and self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+        )
+
+    def ensure_connection(self) -> None:
+        if self.health_check_needed and not self.in_atomic_block:
+            self.health_check_needed = False
+            if not self.is_usable():
+                connection_metrics.incr(self.alias, 'unusable')
+                self.close()
+        super().ensure_connection()
+
+
+class ConnectionPool:
+    """
+    Пул соединений, общий для всех потоков процесса.
+
+    Число соединений ограничено max_size: если все заняты, поток ждёт
+    освобождения не дольше timeout секунд. Свободные соединения
+    хранятся в порядке освобождения и выдаются начиная с последнего.
+
+    Attributes:
+        - isolation_level: Уровень изоляции новых соединений.
+
+    Methods:
+        - acquire(): Занимает место в пуле и возвращает свободное
+        соединение или None, если его нужно открыть.
+        - release(connection): Возвращает соединение в пул.
+    """
+
+    def __init__(self, max_size: int, timeout: float):
+        self.timeout = timeout
+        self.isolation_level = None
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Optional[Any]:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError('Нет свободных соединений с базой данных.')
+        with self._lock:
+            return self._idle.pop() if self._idle else None
+
+    def release(self, connection: Optional[Any]) -> None:
+        if connection is not None:
+            with self._lock:
+                self._idle.append(connection)
+        self._slots.release()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, options: Dict) -> ConnectionPool:
+    """
+    Возвращает пул соединений базы alias, создавая его при первом
+    обращении.
+
+    Args:
+        alias (str): Псевдоним базы данных.
+        options (dict): Настройки POOL: MAX_SIZE и TIMEOUT.
+    """
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(options['MAX_SIZE'],
+                                           options.get('TIMEOUT', 30))
+        return _pools[alias]
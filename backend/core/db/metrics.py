@@ -0,0 +1,120 @@
+import logging
+import time
+from collections import Counter
+from threading import Lock
+from typing import Dict, Iterable, Tuple
+
+from core.constants.settings import CACHE_STATS_FLUSH_EVERY
+from core.metrics import CacheCounters
+
+CONNECTION_METRICS_KEY = 'db:metrics'
+CONNECTION_METRICS_COUNTERS = ('opened', 'reused', 'unusable', 'open_ms',
+                               'wait_ms')
+CONNECTION_METRICS_MAXIMUMS = ('open_max_ms', 'wait_max_ms')
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionMetrics(CacheCounters):
+    """
+    Метрики соединений с базами данных по псевдониму из DATABASES.
+
+    Хранятся количество открытых соединений и время их открытия,
+    количество соединений, взятых из пула, время ожидания свободного
+    соединения в пуле и количество соединений, не прошедших проверку.
+
+    Метрики учитываются при каждом получении соединения, поэтому они
+    копятся в памяти процесса и переносятся в общий кэш каждые
+    CACHE_STATS_FLUSH_EVERY событий и при чтении метрик. Ошибка кэша
+    записывается в журнал и не мешает открыть соединение.
+
+    Methods:
+        - flush(): Переносит метрики процесса в общий кэш.
+        - get(aliases): Возвращает метрики указанных баз данных.
+    """
+
+    def __init__(self, key: str = CONNECTION_METRICS_KEY):
+        super().__init__(key)
+        self._pending: Counter = Counter()
+        self._maximums: Dict[Tuple[str, str], int] = {}
+        self._since: Dict[str, float] = {}
+        self._events = 0
+        self._lock = Lock()
+
+    def incr(self, name: str, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self._pending[(name, counter)] += value
+        self._record(name)
+
+    def observe(self, name: str, counter: str, value_ms: int) -> None:
+        key = (name, f'{counter}_max_ms')
+        with self._lock:
+            self._pending[(name, f'{counter}_ms')] += value_ms
+            self._maximums[key] = max(self._maximums.get(key, 0), value_ms)
+        self._record(name)
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            # Время первого учтённого события нужно для расчёта частоты.
+            self._since.setdefault(name, time.time())
+            self._events += 1
+            if self._events < CACHE_STATS_FLUSH_EVERY:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Переносит метрики процесса в общий кэш."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            maximums, self._maximums = self._maximums, {}
+            since, self._since = self._since, {}
+            self._events = 0
+        try:
+            for name, started_at in since.items():
+                self.cache.add(self._key(name, 'since'), started_at,
+                               timeout=None)
+            for (name, counter), value in pending.items():
+                super().incr(name, counter, value)
+            for (name, counter), value in maximums.items():
+                self.set_max(name, counter, value)
+        except Exception:
+            logger.exception('Не удалось сохранить метрики соединений.')
+
+    def get(self, aliases: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Возвращает метрики соединений.
+
+        Args:
+            aliases: Псевдонимы баз данных.
+
+        Returns:
+            dict: Метрики по псевдониму, включая среднее время открытия
+            и ожидания и количество открытий в минуту.
+        """
+        self.flush()
+        aliases = list(aliases)
+        counters = (CONNECTION_METRICS_COUNTERS + CONNECTION_METRICS_MAXIMUMS
+                    + ('since',))
+        stored = self.cache.get_many(
+            self._key(alias, counter)
+            for alias in aliases for counter in counters
+        )
+        metrics = {}
+        for alias in aliases:
+            values = {counter: stored.get(self._key(alias, counter), 0)
+                      for counter in counters}
+            since = values.pop('since')
+            if not since:
+                continue
+            minutes = max((time.time() - since) / 60, 1)
+            values['opened_per_minute'] = round(values['opened'] / minutes, 2)
+            values['open_avg_ms'] = (values['open_ms'] // values['opened']
+                                     if values['opened'] else 0)
+            acquired = values['opened'] + values['reused']
+            values['wait_avg_ms'] = (values['wait_ms'] // acquired
+                                     if acquired else 0)
+            metrics[alias] = values
+        return metrics
+
+
+connection_metrics = ConnectionMetrics()
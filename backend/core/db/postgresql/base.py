@@ -0,0 +1,85 @@
+import time
+from typing import Any, Dict, Optional
+
+from django.db.backends.postgresql import base
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from core.db.base import ConnectionPool, InstrumentedDatabaseMixin, get_pool
+from core.db.metrics import connection_metrics
+
+Database = base.Database
+
+
+class DatabaseWrapper(InstrumentedDatabaseMixin, base.DatabaseWrapper):
+    """
+    Бэкенд PostgreSQL с необязательным пулом соединений.
+
+    Пул включается настройкой POOL базы данных, например
+    {'MAX_SIZE': 20, 'TIMEOUT': 30}. Закрытое Django соединение
+    возвращается в пул, а не разрывается, и его получает следующий
+    запрос любого потока процесса. С пулом CONN_MAX_AGE должен быть 0,
+    иначе потоки не возвращают соединения между запросами.
+    """
+
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        options = self.settings_dict.get('POOL')
+        return get_pool(self.alias, options) if options else None
+
+    def _is_reusable(self, connection: Any) -> bool:
+        """Проверяет, что соединение из пула не закрыто сервером."""
+        if connection.closed:
+            return False
+        if not self.settings_dict.get('CONN_HEALTH_CHECKS', False):
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def get_new_connection(self, conn_params: Dict) -> Any:
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        started_at = time.perf_counter()
+        try:
+            connection = pool.acquire()
+        except TimeoutError as error:
+            raise Database.OperationalError(str(error)) from error
+        connection_metrics.observe(
+            self.alias, 'wait', int((time.perf_counter() - started_at) * 1000))
+
+        if connection is not None:
+            if self._is_reusable(connection):
+                connection_metrics.incr(self.alias, 'reused')
+                # Соединение в пуле уже в режиме autocommit, поэтому
+                # исходный уровень изоляции берётся из пула.
+                self.isolation_level = self.settings_dict['OPTIONS'].get(
+                    'isolation_level', pool.isolation_level)
+                return connection
+            connection_metrics.incr(self.alias, 'unusable')
+            connection.close()
+
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            pool.release(None)
+            raise
+        pool.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self) -> None:
+        pool = self.pool
+        if pool is None:
+            return super()._close()
+        connection = self.connection
+        if (not connection.closed and connection.info.transaction_status
+                != TRANSACTION_STATUS_IDLE):
+            try:
+                connection.rollback()
+            except Database.Error:
+                connection.close()
+        pool.release(None if connection.closed else connection)
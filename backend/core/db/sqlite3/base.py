@@ -0,0 +1,7 @@
+from django.db.backends.sqlite3 import base
+
+from core.db.base import InstrumentedDatabaseMixin
+
+
+class DatabaseWrapper(InstrumentedDatabaseMixin, base.DatabaseWrapper):
+    """Бэкенд SQLite с учётом открытия соединений."""
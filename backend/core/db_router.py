@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+from core.constants.settings import (PRIMARY_DATABASE, REPLICA_DATABASE,
+                                     REPLICA_STICKY_SECONDS)
+
+REPLICA_STICKY_KEY = 'db:sticky'
+
+_read_database: ContextVar[Optional[str]] = ContextVar(
+    'read_database', default=None)
+
+
+def replica_configured() -> bool:
+    """Проверяет, задана ли реплика в настройках DATABASES."""
+    return REPLICA_DATABASE in settings.DATABASES
+
+
+def reads_from_replica() -> bool:
+    """Проверяет, направлено ли сейчас чтение в реплику."""
+    return _read_database.get() == REPLICA_DATABASE and replica_configured()
+
+
+@contextmanager
+def use_database(alias: str) -> Iterator[None]:
+    """Направляет чтение внутри блока в базу данных alias."""
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+def use_primary():
+    """Направляет чтение внутри блока в основную базу данных."""
+    return use_database(PRIMARY_DATABASE)
+
+
+def use_replica():
+    """Направляет чтение внутри блока в реплику."""
+    return use_database(REPLICA_DATABASE)
+
+
+def _sticky_key(user_id: int) -> str:
+    return f'{REPLICA_STICKY_KEY}:{user_id}'
+
+
+def mark_sticky(user_id: int) -> None:
+    """
+    Закрепляет чтение пользователя за основной базой на
+    REPLICA_STICKY_SECONDS после записи.
+    """
+    caches[settings.CACHE_BACKEND].set(_sticky_key(user_id), True,
+                                       timeout=REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id: int) -> bool:
+    """Проверяет, писал ли пользователь в базу в последние секунды."""
+    return bool(caches[settings.CACHE_BACKEND].get(_sticky_key(user_id)))
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор чтения и записи между основной базой и репликой.
+
+    Запись всегда выполняется в основную базу. Чтение уходит в реплику
+    только внутри use_replica() (см. ReplicaReadMixin), поэтому
+    задачи celery, админка и запросы на изменение читают из основной
+    базы. Если реплика не задана, все запросы идут в основную базу.
+    """
+
+    @staticmethod
+    def db_for_read(model: Any, **hints: Any) -> Optional[str]:
+        if reads_from_replica():
+            return REPLICA_DATABASE
+        return PRIMARY_DATABASE
+
+    @staticmethod
+    def db_for_write(model: Any, **hints: Any) -> str:
+        return PRIMARY_DATABASE
+
+    @staticmethod
+    def allow_relation(obj1: Any, obj2: Any, **hints: Any) -> bool:
+        databases = (PRIMARY_DATABASE, REPLICA_DATABASE)
+        return obj1._state.db in databases and obj2._state.db in databases
+
+    @staticmethod
+    def allow_migrate(db: str, app_label: str, **hints: Any) -> bool:
+        return db == PRIMARY_DATABASE
+
+
+class ReplicaReadMixin:
+    """
+    Миксин ViewSet, направляющий безопасные запросы на чтение в реплику.
+
+    Реплика используется для действий из replica_actions с методами
+    GET/HEAD/OPTIONS, если пользователь не писал в базу последние
+    REPLICA_STICKY_SECONDS секунд (см. ReplicaStickyMiddleware).
+    Так пользователь сразу видит свои изменения, даже если реплика
+    отстаёт. Разрешения проверяются до переключения, поэтому объекты
+    для них загружаются из основной базы.
+
+    Attributes:
+        - replica_actions: Действия, читающие из реплики.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def should_use_replica(self, request: Any) -> bool:
+        user = request.user
+        return (request.method in SAFE_METHODS
+                and self.action in self.replica_actions
+                and replica_configured()
+                and not (user.is_authenticated and is_sticky(user.pk)))
+
+    def initial(self, request: Any, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        if self.should_use_replica(request):
+            self._replica_token = _read_database.set(REPLICA_DATABASE)
+
+    def finalize_response(self, request: Any, response: Any,
+                          *args: Any, **kwargs: Any) -> Any:
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _read_database.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaStickyMiddleware:
+    """
+    Закрепляет пользователя за основной базой после успешного запроса
+    на изменение (POST, PUT, PATCH, DELETE).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (request.method not in SAFE_METHODS
+                and response.status_code < 400 and replica_configured()):
+            # DRF сохраняет пользователя из токена в исходном запросе.
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                mark_sticky(user.pk)
+        return response
@@ -0,0 +1,71 @@
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Model, QuerySet
+
+IDENTITY_MAP_ATTR = '_identity_map'
+
+
+class IdentityMap:
+    """
+    Карта идентичности объектов в рамках одного запроса.
+
+    Хранит загруженные объекты по ключу (модель, pk), поэтому
+    разрешения, представления и сериализаторы, обрабатывающие один
+    запрос, получают один и тот же экземпляр вместе с уже
+    загруженными через prefetch_related связями. Отсутствующие
+    объекты тоже запоминаются, чтобы не повторять запрос.
+
+    Methods:
+        - get(queryset, pk): Возвращает объект по pk или None.
+    """
+
+    def __init__(self):
+        self._objects: Dict[Tuple[str, Hashable], Optional[Model]] = {}
+
+    def get(self, queryset: QuerySet, pk: Any) -> Optional[Model]:
+        """
+        Возвращает объект по pk, загружая его из queryset один раз
+        за запрос.
+
+        Связи, указанные в select_related/prefetch_related, загружаются
+        при первом обращении, поэтому все вызовы для одной модели
+        должны передавать одинаковый queryset.
+
+        Args:
+            queryset (QuerySet): Queryset для загрузки объекта.
+            pk: Первичный ключ объекта.
+
+        Returns:
+            Model | None: Объект или None, если его не существует.
+        """
+        model = queryset.model
+        try:
+            pk = model._meta.pk.to_python(pk)
+        except ValidationError:
+            return None
+        key = (model._meta.label, pk)
+        if key not in self._objects:
+            self._objects[key] = queryset.filter(pk=pk).first()
+        return self._objects[key]
+
+
+def get_identity_map(request) -> IdentityMap:
+    """
+    Возвращает карту идентичности, привязанную к запросу.
+
+    Карта хранится на исходном HttpRequest, поэтому общая для
+    DRF Request в разрешениях, представлении и context сериализатора.
+
+    Args:
+        request: Запрос Django или DRF.
+
+    Returns:
+        IdentityMap: Карта идентичности запроса.
+    """
+    request = getattr(request, '_request', request)
+    identity_map = getattr(request, IDENTITY_MAP_ATTR, None)
+    if identity_map is None:
+        identity_map = IdentityMap()
+        setattr(request, IDENTITY_MAP_ATTR, identity_map)
+    return identity_map
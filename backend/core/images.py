@@ -0,0 +1,118 @@
+import hashlib
+from io import BytesIO
+from typing import Dict, Optional
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Model
+from PIL import Image, ImageOps
+from rest_framework.fields import Field
+
+from core.constants.settings import (AVATAR_THUMBNAIL_DIR,
+                                     AVATAR_THUMBNAIL_QUALITY,
+                                     AVATAR_THUMBNAIL_SIZES)
+
+AVATAR_THUMBNAIL_FORMATS = (
+    ('webp', 'WEBP'),
+    ('jpeg', 'JPEG'),
+)
+AVATAR_SOURCE_KEY = 'source'
+
+
+def make_thumbnails(image_file) -> Dict[str, Dict[str, str]]:
+    """
+    Формирует квадратные миниатюры изображения в WebP и JPEG для
+    каждого размера из AVATAR_THUMBNAIL_SIZES.
+
+    Файлы называются по SHA-256 содержимого, поэтому их можно
+    кэшировать навсегда, а одинаковые миниатюры не дублируются.
+
+    Args:
+        image_file: Открытый файл изображения.
+
+    Returns:
+        dict: Пути к миниатюрам в хранилище по формату и размеру,
+        например {'webp': {'64': 'avatars/thumbnails/<hash>.webp'}}.
+    """
+    thumbnails = {}
+    with Image.open(image_file) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        for size in AVATAR_THUMBNAIL_SIZES:
+            thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+            for extension, image_format in AVATAR_THUMBNAIL_FORMATS:
+                buffer = BytesIO()
+                thumbnail.save(buffer, image_format,
+                               quality=AVATAR_THUMBNAIL_QUALITY)
+                content = buffer.getvalue()
+                name = (f'{AVATAR_THUMBNAIL_DIR}/'
+                        f'{hashlib.sha256(content).hexdigest()}.{extension}')
+                if not default_storage.exists(name):
+                    name = default_storage.save(name, ContentFile(content))
+                thumbnails.setdefault(extension, {})[str(size)] = name
+    return thumbnails
+
+
+def avatar_changed(instance: Model) -> bool:
+    """Проверяет, соответствуют ли миниатюры текущему аватару."""
+    return ((instance.avatar.name or '')
+            != instance.avatar_thumbnails.get(AVATAR_SOURCE_KEY, ''))
+
+
+def update_avatar_thumbnails(model, pk: int) -> bool:
+    """
+    Пересчитывает миниатюры аватара объекта модели model.
+
+    Миниатюры сохраняются через QuerySet.update только если аватар не
+    изменился во время обработки, сигналы post_save не отправляются.
+
+    Args:
+        model: Модель с полями avatar и avatar_thumbnails.
+        pk (int): ID объекта.
+
+    Returns:
+        bool: Были ли сохранены новые миниатюры.
+    """
+    instance = model.objects.filter(pk=pk).only(
+        'avatar', 'avatar_thumbnails').first()
+    if instance is None or not avatar_changed(instance):
+        return False
+    thumbnails = {}
+    if instance.avatar:
+        with instance.avatar.open('rb') as image_file:
+            thumbnails = make_thumbnails(image_file)
+        thumbnails[AVATAR_SOURCE_KEY] = instance.avatar.name
+    updated = model.objects.filter(
+        pk=pk, avatar=instance.avatar.name
+    ).update(avatar_thumbnails=thumbnails)
+    return bool(updated)
+
+
+class SrcsetField(Field):
+    """
+    Поле сериализатора с наборами миниатюр аватара в формате srcset
+    для каждого формата: {'webp': 'url 64w, url 128w', 'jpeg': ...}.
+
+    Пока миниатюры не готовы, возвращает None.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = 'avatar_thumbnails'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_url(self, name: str) -> str:
+        url = default_storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def to_representation(self, thumbnails: Dict) -> Optional[Dict]:
+        if AVATAR_SOURCE_KEY not in thumbnails:
+            return None
+        return {
+            extension: ', '.join(
+                f'{self.get_url(name)} {size}w' for size, name in sorted(
+                    thumbnails[extension].items(),
+                    key=lambda item: int(item[0]))
+            )
+            for extension, _ in AVATAR_THUMBNAIL_FORMATS
+        }
@@ -0,0 +1,96 @@
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.mail import EmailMessage
+from django.db import transaction
+
+from core.constants.settings import EMAIL_OUTBOX_LOCK_TIMEOUT
+from core.models import OutboxEmail
+
+EMAIL_OUTBOX_KEY = 'email:outbox'
+
+
+def build_message(message: Dict) -> EmailMessage:
+    """
+    Собирает EmailMessage из словаря, который передаётся между
+    задачами celery.
+
+    Args:
+        message (dict): Письмо с ключами subject, body, from_email и to.
+
+    Returns:
+        EmailMessage: Письмо для отправки через backend почты.
+    """
+    return EmailMessage(message['subject'], message['body'],
+                        message['from_email'], message['to'])
+
+
+class EmailOutbox:
+    """
+    Очередь писем, ожидающих пакетной отправки.
+
+    Письма хранятся в БД (OutboxEmail) и забираются в порядке
+    добавления, поэтому их видят все процессы. Блокировка выборки и
+    отметка о запланированной выгрузке хранятся в общем кэше
+    (CACHE_BACKEND): без общего кэша меняется только размер пачек,
+    письма не теряются.
+
+    Methods:
+        - push(message): Добавляет письмо в очередь.
+        - pop(limit): Забирает из очереди не больше limit писем.
+        - lock(): Захватывает блокировку на выборку писем.
+        - unlock(): Снимает блокировку.
+        - schedule_flush(window): Отмечает запланированную выгрузку.
+        - unschedule_flush(): Снимает отметку о запланированной выгрузке.
+    """
+
+    def __init__(self, key: str = EMAIL_OUTBOX_KEY):
+        self.key = key
+        self.cache = caches[settings.CACHE_BACKEND]
+
+    def _key(self, name) -> str:
+        return f'{self.key}:{name}'
+
+    @staticmethod
+    def push(message: Dict) -> None:
+        OutboxEmail.objects.create(message=message)
+
+    def pop(self, limit: int) -> List[Dict]:
+        """
+        Забирает из очереди не больше limit писем в порядке добавления.
+
+        Письма выбираются и удаляются в одной транзакции. Строки,
+        заблокированные другой выборкой, пропускаются (PostgreSQL).
+
+        Args:
+            limit (int): Максимальное количество писем.
+
+        Returns:
+            list: Письма в порядке добавления.
+        """
+        with transaction.atomic():
+            rows = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .order_by('id').values_list('id', 'message')[:limit]
+            )
+            OutboxEmail.objects.filter(
+                id__in=[pk for pk, _ in rows]).delete()
+        return [message for _, message in rows]
+
+    def lock(self) -> bool:
+        return self.cache.add(self._key('lock'), 1,
+                              timeout=EMAIL_OUTBOX_LOCK_TIMEOUT)
+
+    def unlock(self) -> None:
+        self.cache.delete(self._key('lock'))
+
+    def schedule_flush(self, window: int) -> bool:
+        """
+        Отмечает, что выгрузка очереди уже запланирована на window
+        секунд, и возвращает True только для первого вызова в окне.
+        """
+        return self.cache.add(self._key('scheduled'), 1, timeout=window)
+
+    def unschedule_flush(self) -> None:
+        self.cache.delete(self._key('scheduled'))
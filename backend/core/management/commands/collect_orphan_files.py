@@ -0,0 +1,93 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.constants.settings import (EXPORT_CHUNK_SIZE,
+                                     STORED_FILE_GC_GRACE_HOURS)
+from core.models import StoredFile
+from core.signals import get_stored_file_fields
+from core.storage import avatar_storage
+
+
+class Command(BaseCommand):
+    """
+    Удаляет из хранилища ContentAddressedStorage файлы, на которые
+    не ссылается ни один объект.
+
+    Файлы, загруженные меньше grace-hours часов назад, не удаляются:
+    объект, для которого загружен файл, мог ещё не сохраниться.
+    С --rebuild количество ссылок предварительно пересчитывается
+    по всем полям с этим хранилищем.
+    """
+    help = 'Удаляет файлы хранилища, на которые нет ссылок.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours',
+            type=int,
+            default=STORED_FILE_GC_GRACE_HOURS,
+            help='Не удалять файлы, загруженные позже указанного '
+                 'количества часов назад.'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Пересчитать количество ссылок перед удалением.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только вывести файлы, которые будут удалены.'
+        )
+
+    @staticmethod
+    def rebuild_references() -> None:
+        """Пересчитывает количество ссылок на файлы по всем моделям."""
+        references = Counter()
+        for model in apps.get_models():
+            for field in get_stored_file_fields(model):
+                references.update(
+                    name for name in model._base_manager.exclude(
+                        **{field.attname: ''}
+                    ).values_list(field.attname, flat=True).iterator()
+                    if name
+                )
+        existing = set(StoredFile.objects.values_list('name', flat=True))
+        StoredFile.objects.bulk_create(
+            (StoredFile(name=name) for name in references
+             if name not in existing),
+            batch_size=EXPORT_CHUNK_SIZE
+        )
+        stored_files = []
+        for stored_file in StoredFile.objects.only(
+                'id', 'name', 'references').iterator():
+            count = references.get(stored_file.name, 0)
+            if stored_file.references != count:
+                stored_file.references = count
+                stored_files.append(stored_file)
+        StoredFile.objects.bulk_update(stored_files, ('references',),
+                                       batch_size=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.rebuild_references()
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        orphans = StoredFile.objects.filter(references=0,
+                                            created__lt=cutoff)
+        deleted = 0
+        for stored_file in orphans.iterator():
+            if options['dry_run']:
+                self.stdout.write(stored_file.name)
+                continue
+            # Файл мог снова получить ссылку после выборки.
+            removed, _ = StoredFile.objects.filter(
+                pk=stored_file.pk, references=0).delete()
+            if removed:
+                avatar_storage.delete(stored_file.name)
+                deleted += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено файлов: {deleted}')
+        )
@@ -0,0 +1,69 @@
+from threading import Lock
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django_redis import get_redis_connection
+
+# Сравнение и запись максимума одной командой Redis.
+SET_MAX_SCRIPT = """
+local current = tonumber(redis.call('get', KEYS[1]) or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('set', KEYS[1], ARGV[1])
+end
+"""
+
+
+class CacheCounters:
+    """
+    Счётчики в общем кэше (CACHE_BACKEND), общие для всех процессов.
+
+    Счётчики и максимумы обновляются атомарно, поэтому значения
+    воркеров суммируются. Длительности хранятся в миллисекундах: сумма
+    в <name>_ms и максимум в <name>_max_ms.
+
+    Methods:
+        - incr(name, counter, value=1): Увеличивает счётчик.
+        - observe(name, counter, value_ms): Учитывает длительность.
+        - set_max(name, counter, value): Сохраняет значение, если оно
+        больше сохранённого.
+        - values(name, counters): Возвращает значения счётчиков.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._max_lock = Lock()
+
+    @property
+    def cache(self):
+        return caches[settings.CACHE_BACKEND]
+
+    def _key(self, name: str, counter: str) -> str:
+        return f'{self.key}:{name}:{counter}'
+
+    def incr(self, name: str, counter: str, value: int = 1) -> None:
+        key = self._key(name, counter)
+        self.cache.add(key, 0, timeout=None)
+        self.cache.incr(key, value)
+
+    def observe(self, name: str, counter: str, value_ms: int) -> None:
+        self.incr(name, f'{counter}_ms', value_ms)
+        self.set_max(name, f'{counter}_max_ms', value_ms)
+
+    def set_max(self, name: str, counter: str, value: int) -> None:
+        key = self._key(name, counter)
+        if settings.CACHE_ENGINE == 'redis':
+            get_redis_connection(settings.CACHE_BACKEND).eval(
+                SET_MAX_SCRIPT, 1, self.cache.make_key(key), value)
+            return
+        # Кэш в памяти процесса общий только для его потоков.
+        with self._max_lock:
+            if value > self.cache.get(key, 0):
+                self.cache.set(key, value, timeout=None)
+
+    def values(self, name: str, counters: Iterable[str]) -> Dict[str, int]:
+        counters = list(counters)
+        stored = self.cache.get_many(self._key(name, counter)
+                                     for counter in counters)
+        return {counter: stored.get(self._key(name, counter), 0)
+                for counter in counters}
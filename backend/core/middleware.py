@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from core.constants.settings import (COMPRESSION_BROTLI_QUALITY,
+                                     COMPRESSIBLE_CONTENT_TYPES)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def accepts_encoding(request, encoding: str) -> bool:
+    """
+    Проверяет, принимает ли клиент кодирование encoding по заголовку
+    Accept-Encoding. Кодирование с q=0 считается запрещённым, а «*»
+    разрешает кодирования, не названные явно.
+    """
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, *params = (part.strip() for part in item.split(';'))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+    quality = accepted.get(encoding, accepted.get('*', 0.0))
+    return quality > 0
+
+
+def compress_brotli(content: bytes) -> bytes:
+    return brotli.compress(content, quality=COMPRESSION_BROTLI_QUALITY)
+
+
+class CompressionMiddleware:
+    """
+    Сжимает JSON-ответы brotli или gzip в зависимости от Accept-Encoding.
+
+    Сжимаются только ответы с типом из COMPRESSIBLE_CONTENT_TYPES
+    размером не меньше RESPONSE_COMPRESSION_MIN_SIZE байт: маленькие
+    ответы сжатие почти не уменьшает. Brotli используется, если
+    установлен пакет brotli и клиент его поддерживает. Потоковые ответы
+    (выгрузки CSV) и уже сжатые ответы не изменяются. Сжатие
+    отключается настройкой RESPONSE_COMPRESSION.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (not settings.RESPONSE_COMPRESSION or response.streaming
+                or response.has_header('Content-Encoding')
+                or response.get('Content-Type', '').split(';')[0]
+                not in COMPRESSIBLE_CONTENT_TYPES
+                or len(response.content)
+                < settings.RESPONSE_COMPRESSION_MIN_SIZE):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if brotli is not None and accepts_encoding(request, 'br'):
+            encoding, compress = 'br', compress_brotli
+        elif accepts_encoding(request, 'gzip'):
+            encoding, compress = 'gzip', compress_string
+        else:
+            return response
+
+        content = compress(response.content)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # Сжатое тело отличается от исходного побайтно, поэтому сильный
+        # ETag становится слабым (так же делает GZipMiddleware).
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        return response
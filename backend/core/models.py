@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import F
+
+from core.constants.settings import (EXPORT_JOB_ID_LENGTH,
+                                     EXPORT_JOB_STATUS_LENGTH,
+                                     STORED_FILE_NAME_LENGTH)
+
+
+class StoredFile(models.Model):
+    """
+    Модель для учёта ссылок на файлы в хранилище
+    ContentAddressedStorage.
+
+    Одинаковые загрузки сохраняются в один файл, поэтому файл можно
+    удалить только когда на него не ссылается ни один объект.
+
+    Attributes:
+        - name: Путь к файлу в хранилище (SHA-256 содержимого).
+        - references: Количество объектов, ссылающихся на файл.
+        - created: Дата первой загрузки файла.
+
+    Methods:
+        - incr(name): Увеличивает количество ссылок на файл.
+        - decr(name): Уменьшает количество ссылок на файл.
+    """
+    name = models.CharField(
+        max_length=STORED_FILE_NAME_LENGTH,
+        unique=True,
+        verbose_name='Путь к файлу'
+    )
+    references = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество ссылок'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата загрузки'
+    )
+
+    class Meta:
+        verbose_name = 'Файл хранилища'
+        verbose_name_plural = 'Файлы хранилища'
+        indexes = (
+            models.Index(fields=('references', 'created'),
+                         name='stored_file_orphan_idx'),
+        )
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def incr(cls, name: str) -> None:
+        cls.objects.get_or_create(name=name)
+        cls.objects.filter(name=name).update(references=F('references') + 1)
+
+    @classmethod
+    def decr(cls, name: str) -> None:
+        cls.objects.filter(name=name, references__gt=0).update(
+            references=F('references') - 1)
+
+
+class OutboxEmail(models.Model):
+    """
+    Модель письма, ожидающего пакетной отправки (см. EmailOutbox).
+
+    Очередь хранится в БД, а не в кэше, чтобы письма, добавленные
+    веб-процессом, были видны воркеру celery при любом CACHE_ENGINE.
+
+    Attributes:
+        - message: Письмо с ключами subject, body, from_email и to.
+        - created: Дата добавления в очередь.
+    """
+    message = models.JSONField(
+        verbose_name='Письмо'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата добавления'
+    )
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Письма в очереди'
+
+    def __str__(self):
+        return ', '.join(self.message.get('to', ()))
+
+
+class ExportJob(models.Model):
+    """
+    Модель задачи экспорта студентов в PDF.
+
+    Состояние хранится в БД, чтобы воркер celery, который формирует
+    файл, и веб-процесс, который отвечает на запросы состояния,
+    видели одну и ту же задачу при любом CACHE_ENGINE.
+
+    Attributes:
+        - id: ID задачи (UUID в шестнадцатеричном виде).
+        - user: Пользователь, запустивший экспорт.
+        - status: Состояние задачи: pending, done или failed.
+        - path: Путь к готовому файлу в хранилище.
+        - created: Дата запуска экспорта.
+    """
+    id = models.CharField(
+        primary_key=True,
+        max_length=EXPORT_JOB_ID_LENGTH
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        verbose_name='Пользователь'
+    )
+    status = models.CharField(
+        max_length=EXPORT_JOB_STATUS_LENGTH,
+        verbose_name='Состояние'
+    )
+    path = models.CharField(
+        max_length=STORED_FILE_NAME_LENGTH,
+        blank=True,
+        verbose_name='Путь к файлу'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Дата запуска'
+    )
+
+    class Meta:
+        verbose_name = 'Задача экспорта'
+        verbose_name_plural = 'Задачи экспорта'
+
+    def __str__(self):
+        return f'{self.id} ({self.status})'
@@ -0,0 +1,25 @@
+from typing import Any, Optional
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSON-парсер на orjson. Если orjson не установлен, используется
+    стандартный JSONParser.
+    """
+
+    def parse(self, stream: Any, media_type: Optional[str] = None,
+              parser_context: Optional[dict] = None) -> Any:
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,33 @@
+from typing import Any, Optional
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер на orjson.
+
+    orjson сериализует большие ответы (например, вакансии с длинным
+    описанием) в несколько раз быстрее стандартного json. Типы, которые
+    orjson не поддерживает (Decimal, ленивые строки, QuerySet),
+    преобразуются энкодером DRF. Если orjson не установлен,
+    используется стандартный JSONRenderer.
+    """
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None,
+               renderer_context: Optional[dict] = None) -> bytes:
+        if orjson is None:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        if data is None:
+            return b''
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.encoder_class().default,
+                            option=option)
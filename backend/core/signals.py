@@ -0,0 +1,81 @@
+from django.apps import apps
+from django.db.models import FileField
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from core.models import StoredFile
+from core.storage import ContentAddressedStorage
+
+PREVIOUS_FILES_ATTR = '_previous_stored_files'
+
+
+def get_stored_file_fields(model):
+    """Возвращает поля модели, файлы которых хранятся по содержимому."""
+    return [field for field in model._meta.concrete_fields
+            if isinstance(field, FileField)
+            and isinstance(field.storage, ContentAddressedStorage)]
+
+
+def _get_name(instance, field) -> str:
+    value = instance.__dict__.get(field.attname)
+    return getattr(value, 'name', value) or ''
+
+
+def remember_file_names(sender, instance, update_fields=None, **kwargs):
+    """
+    Запоминает пути файлов, сохранённые в БД до изменения объекта.
+
+    Отложенные поля и поля вне update_fields не сохраняются,
+    поэтому не учитываются.
+    """
+    attnames = [
+        field.attname for field in get_stored_file_fields(sender)
+        if field.attname in instance.__dict__
+        and (update_fields is None or field.name in update_fields)
+    ]
+    previous = dict.fromkeys(attnames, '')
+    if attnames and not instance._state.adding:
+        stored = sender._base_manager.filter(pk=instance.pk).values(
+            *attnames).first()
+        previous.update(stored or {})
+    instance.__dict__[PREVIOUS_FILES_ATTR] = previous
+
+
+def count_file_references(sender, instance, **kwargs):
+    """Переносит ссылку со старого файла на новый при сохранении."""
+    previous = instance.__dict__.pop(PREVIOUS_FILES_ATTR, {})
+    for field in get_stored_file_fields(sender):
+        if field.attname not in previous:
+            continue
+        old_name = previous[field.attname] or ''
+        new_name = _get_name(instance, field)
+        if old_name == new_name:
+            continue
+        if new_name:
+            StoredFile.incr(new_name)
+        if old_name:
+            StoredFile.decr(old_name)
+
+
+def release_file_references(sender, instance, **kwargs):
+    """Убирает ссылки удалённого объекта на файлы."""
+    for field in get_stored_file_fields(sender):
+        name = _get_name(instance, field)
+        if name:
+            StoredFile.decr(name)
+
+
+def connect_stored_file_fields() -> None:
+    """
+    Подключает учёт ссылок на файлы ко всем моделям с полями,
+    использующими ContentAddressedStorage.
+    """
+    for model in apps.get_models():
+        if not get_stored_file_fields(model):
+            continue
+        uid = f'stored_files_{model._meta.label}'
+        pre_save.connect(remember_file_names, sender=model,
+                         dispatch_uid=uid)
+        post_save.connect(count_file_references, sender=model,
+                          dispatch_uid=uid)
+        post_delete.connect(release_file_references, sender=model,
+                            dispatch_uid=uid)
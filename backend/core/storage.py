@@ -0,0 +1,38 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, именующее файлы по SHA-256 содержимого.
+
+    Хэш считается по частям файла (File.chunks()), поэтому файл
+    целиком в память не загружается. Если файл с таким содержимым
+    уже есть, он не записывается повторно и объекты ссылаются на
+    один файл. Каждый файл учитывается в StoredFile, количество
+    ссылок ведут сигналы (см. core.signals), а удаляются файлы без
+    ссылок командой collect_orphan_files.
+    """
+
+    def _save(self, name, content):
+        from core.models import StoredFile
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(directory, f'{digest.hexdigest()}{extension}')
+
+        if not self.exists(name):
+            name = super()._save(name, content)
+        StoredFile.objects.get_or_create(name=name)
+        return name
+
+
+avatar_storage = ContentAddressedStorage()
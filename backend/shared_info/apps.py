@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SharedInfoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shared_info'
+
+    def ready(self):
+        import shared_info.signals  # noqa: F401
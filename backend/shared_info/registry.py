@@ -0,0 +1,122 @@
+import time
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from core.cache import get_cache_version, invalidation_listener
+from core.constants.shared_info import REFERENCE_REGISTRY_CHECK_INTERVAL
+from core.db_router import use_primary
+from shared_info.models import (Course, EducationLevel, Location, Schedule,
+                                Skill, Specialization)
+
+REFERENCE_VERSION = 'reference'
+
+
+class ReferenceItem:
+    """
+    Неизменяемая запись справочника.
+
+    Attributes:
+        - id (int): Идентификатор записи.
+        - name (str): Название.
+    """
+    __slots__ = ('id', 'name')
+
+    def __init__(self, id: int, name: str):
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'name', name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('Запись справочника нельзя изменить.')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('Запись справочника нельзя изменить.')
+
+    def __repr__(self) -> str:
+        return f'ReferenceItem(id={self.id}, name={self.name!r})'
+
+
+class ReferenceRegistry:
+    """
+    Справочники shared_info в памяти процесса.
+
+    Все справочники загружаются одним набором запросов при первом
+    обращении и хранятся как неизменяемые словари ReferenceItem по ID.
+    Загрузка повторяется после смены версии reference, которую
+    сигналы меняют при сохранении и удалении записей справочников:
+    сообщение о смене приходит через invalidation_listener, а на случай
+    потерянного сообщения версия ещё и сверяется не чаще раза в
+    REFERENCE_REGISTRY_CHECK_INTERVAL секунд.
+
+    Methods:
+        - get(model, pk): Возвращает запись справочника по ID.
+        - get_many(model, ids): Возвращает записи в порядке ids.
+        - all(model): Возвращает все записи справочника.
+    """
+    models = (Skill, EducationLevel, Specialization, Schedule, Course,
+              Location)
+
+    def __init__(self):
+        self._items: Optional[Dict[type, Mapping[int, ReferenceItem]]] = None
+        self._version = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = Lock()
+        invalidation_listener.register(self)
+
+    def _get_items(self) -> Dict[type, Mapping[int, ReferenceItem]]:
+        items = self._items
+        if (items is not None and time.monotonic() - self._checked_at
+                >= REFERENCE_REGISTRY_CHECK_INTERVAL):
+            self._checked_at = time.monotonic()
+            if get_cache_version(REFERENCE_VERSION) != self._version:
+                self.clear_local()
+                items = None
+        if items is None:
+            items = self._load()
+        return items
+
+    def _load(self) -> Dict[type, Mapping[int, ReferenceItem]]:
+        with self._lock:
+            # Справочники мог уже загрузить другой поток.
+            if self._items is not None:
+                return self._items
+            generation = self._generation
+            # Версия читается до загрузки: изменение во время загрузки
+            # сменит её, и справочники будут загружены ещё раз.
+            version = get_cache_version(REFERENCE_VERSION)
+            with use_primary():
+                items = {
+                    model: MappingProxyType({
+                        pk: ReferenceItem(pk, name)
+                        for pk, name in model.objects.values_list('id',
+                                                                  'name')
+                    })
+                    for model in self.models
+                }
+            if generation == self._generation:
+                self._items = items
+                self._version = version
+                self._checked_at = time.monotonic()
+            return items
+
+    def get(self, model: type, pk: int) -> Optional[ReferenceItem]:
+        return self._get_items()[model].get(pk)
+
+    def get_many(self, model: type, ids: Iterable[int]) -> List[ReferenceItem]:
+        items = self._get_items()[model]
+        return [items[pk] for pk in ids if pk in items]
+
+    def all(self, model: type) -> Mapping[int, ReferenceItem]:
+        return self._get_items()[model]
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        if REFERENCE_VERSION in names:
+            self.clear_local()
+
+    def clear_local(self) -> None:
+        self._generation += 1
+        self._items = None
+
+
+reference_registry = ReferenceRegistry()
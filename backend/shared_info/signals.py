@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_cache_version
+from core.constants.shared_info import REFERENCE_TAGS
+from shared_info.models import (Course, EducationLevel, Location, Schedule,
+                                Skill, Specialization)
+
+
+@receiver((post_save, post_delete), sender=Skill)
+@receiver((post_save, post_delete), sender=EducationLevel)
+@receiver((post_save, post_delete), sender=Specialization)
+@receiver((post_save, post_delete), sender=Schedule)
+@receiver((post_save, post_delete), sender=Course)
+@receiver((post_save, post_delete), sender=Location)
+def invalidate_reference_read_models(sender, **kwargs):
+    """Сбрасывает модели чтения и ответы, построенные по справочникам."""
+    bump_cache_version('reference', REFERENCE_TAGS[sender._meta.model_name])
@@ -6,6 +6,7 @@ from core.constants.students import (NAME_LENGTH, EMAIL_LENGTH,
                                      ROLE_LENGTH, PORTFOLIO_LENGTH,
                                      EXPERIENCE_LENGTH, STUDENT_MAX_AGE,
                                      STUDENT_MIN_AGE)
+from core.storage import avatar_storage
 from core.validators import validate_phone_number
 from shared_info.models import (Skill, EducationLevel, Specialization,
                                 Schedule, Course, Location)
@@ -18,6 +19,8 @@ class Student(models.Model):
 
     Attributes:
         - avatar: Фото студента.
+        - avatar_thumbnails: Пути к миниатюрам фото, заполняются
+        задачей celery после загрузки.
         - first_name: Имя студента.
         - last_name: Фамилия студента.
         - email: Электронная почта студента.
@@ -33,6 +36,8 @@ class Student(models.Model):
         - education_level: Грейд студента.
         - skills: Ключевые навыки студента.
         - schedule: График работы студента.
+        - updated_at: Дата изменения студента, в том числе его навыков
+        и графиков работы.
 
     Methods:
         - __str__(): Возвращает строковое представление студента в
@@ -46,10 +51,17 @@ class Student(models.Model):
 
     avatar = models.ImageField(
         upload_to='avatars/',
+        storage=avatar_storage,
         blank=True,
         verbose_name='Фото студента',
         help_text='Выберите фото'
     )
+    avatar_thumbnails = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Миниатюры фото студента'
+    )
     first_name = models.CharField(
         max_length=NAME_LENGTH,
         verbose_name='Имя студента',
@@ -153,6 +165,11 @@ class Student(models.Model):
         verbose_name='График работы',
         help_text='Выберите график работы'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Студент'
@@ -230,10 +247,92 @@ class StudentSchedule(models.Model):
 
 
 class FavoriteStudent(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    """
+    Модель для хранения избранных студентов пользователя.
+
+    Attributes:
+        - user: Пользователь, добавивший студента в избранное.
+        - student: Студент в избранном.
+        - created: Дата добавления в избранное.
+
+    Meta:
+        - constraints: Студент добавляется в избранное пользователя
+        не более одного раза.
+        - indexes: Индекс для выборки избранного пользователя в порядке
+        добавления.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='favorite_students'
+    )
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name='favorites'
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата добавления',
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = 'Избранный студент'
+        verbose_name_plural = 'Избранные студенты'
+        constraints = (
+            models.UniqueConstraint(fields=('user', 'student'),
+                                    name='unique_favorite_student'),
+        )
+        indexes = (
+            models.Index(fields=('user', '-created'),
+                         name='favorite_student_created_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.user} – {self.student}'
 
 
 class CompareStudent(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    """
+    Модель для хранения списка сравнения студентов пользователя.
+
+    Attributes:
+        - user: Пользователь, добавивший студента в сравнение.
+        - student: Студент в списке сравнения.
+        - created: Дата добавления в список сравнения.
+
+    Meta:
+        - constraints: Студент добавляется в список сравнения
+        пользователя не более одного раза.
+        - indexes: Индекс для выборки списка сравнения пользователя
+        в порядке добавления.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='compare_students'
+    )
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name='compares'
+    )
+    created = models.DateTimeField(
+        verbose_name='Дата добавления',
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = 'Студент в сравнении'
+        verbose_name_plural = 'Студенты в сравнении'
+        constraints = (
+            models.UniqueConstraint(fields=('user', 'student'),
+                                    name='unique_compare_student'),
+        )
+        indexes = (
+            models.Index(fields=('user', '-created'),
+                         name='compare_student_created_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.user} – {self.student}'
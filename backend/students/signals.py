@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_cache_version
+from core.conditional import touch
+from core.images import avatar_changed
+from students.models import Student, StudentSchedule, StudentSkills
+from students.tasks import make_student_avatar_thumbnails
+
+
+@receiver((post_save, post_delete), sender=Student)
+@receiver((post_save, post_delete), sender=StudentSkills)
+@receiver((post_save, post_delete), sender=StudentSchedule)
+@receiver(m2m_changed, sender=StudentSkills)
+@receiver(m2m_changed, sender=StudentSchedule)
+def invalidate_student_read_models(sender, instance, action=None,
+                                   reverse=False, pk_set=None, **kwargs):
+    """
+    Сбрасывает модели чтения и ответы с изменёнными студентами, а при
+    изменении навыков и графиков работы обновляет дату изменения
+    студентов.
+    """
+    if action is None:
+        student_ids = (getattr(instance, 'student_id', instance.pk),)
+    elif action.startswith('post_'):
+        student_ids = (pk_set or ()) if reverse else (instance.pk,)
+    else:
+        return
+    if sender is not Student:
+        touch(Student, student_ids)
+    bump_cache_version('students', *(f'student:{student_id}'
+                                     for student_id in student_ids))
+
+
+@receiver(post_save, sender=Student)
+def schedule_avatar_thumbnails(sender, instance, raw=False, **kwargs):
+    """Ставит в очередь обработку фото студента после его загрузки."""
+    if not raw and avatar_changed(instance):
+        transaction.on_commit(
+            lambda: make_student_avatar_thumbnails.delay(instance.pk))
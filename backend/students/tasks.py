@@ -0,0 +1,20 @@
+from celery import shared_task
+
+from core.cache import bump_cache_version
+from core.conditional import touch
+from core.images import update_avatar_thumbnails
+from students.models import Student
+
+
+@shared_task(acks_late=True)
+def make_student_avatar_thumbnails(student_id) -> None:
+    """
+    Формирует миниатюры фото студента в WebP и JPEG.
+
+    :param student_id: ID студента.
+    """
+    if update_avatar_thumbnails(Student, student_id):
+        # QuerySet.update не отправляет сигналы и не меняет updated_at,
+        # поэтому дата изменения и кэш ответов обновляются здесь.
+        touch(Student, (student_id,))
+        bump_cache_version('students', f'student:{student_id}')
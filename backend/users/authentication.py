@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from users.snapshots import get_user_snapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя к БД на каждый запрос.
+
+    Вместо загрузки строки User используется снимок (id, role,
+    is_active, is_staff) из get_user_snapshot. Из снимка собирается
+    экземпляр User с отложенными остальными полями: проверки ролей
+    (is_admin, IsAuthorOrAdmin, IsAdminUser) и сравнение с автором
+    работают без запросов, а остальные поля догружаются одним
+    запросом при первом обращении.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification'))
+
+        snapshot = get_user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_('User not found'),
+                                       code='user_not_found')
+        if not snapshot['is_active']:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+
+        user_model = get_user_model()
+        field_names = [field.attname
+                       for field in user_model._meta.concrete_fields
+                       if field.attname in snapshot]
+        user = user_model.from_db(
+            DEFAULT_DB_ALIAS, field_names,
+            [snapshot[name] for name in field_names]
+        )
+        user.is_snapshot = True
+        return user
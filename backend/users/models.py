@@ -5,6 +5,7 @@ from django.db import models
 from core.constants.users import (NAME_LENGTH, EMAIL_LENGTH,
                                   TELEGRAM_LENGTH, PHONE_NUMBER_LENGTH,
                                   COMPANY_NAME_LENGTH, ROLE_LENGTH)
+from core.storage import avatar_storage
 from core.validators import validate_phone_number
 
 
@@ -97,6 +98,8 @@ class User(AbstractUser):
 
     Fields:
         - avatar: Поле для загрузки аватара пользователя (не обязательно).
+        - avatar_thumbnails: Пути к миниатюрам аватара, заполняются
+        задачей celery после загрузки.
         - first_name: Поле для имени пользователя (обязательно).
         - last_name: Поле для фамилии пользователя (обязательно).
         - email: Поле для email-адреса пользователя (уникальное, обязательно).
@@ -118,6 +121,9 @@ class User(AbstractUser):
     Methods:
         - __str__(): Возвращает строковое представление пользователя
         в формате "Имя Фамилия".
+        - refresh_from_db(using=None, fields=None): Перезагружает поля
+        из БД. Для снимка пользователя из кэша (is_snapshot) догружает
+        все отложенные поля одним запросом.
     """
     USER = 'user'
     ADMIN = 'admin'
@@ -134,9 +140,16 @@ class User(AbstractUser):
     avatar = models.ImageField(
         'Изображение профиля',
         upload_to='avatars/',
+        storage=avatar_storage,
         blank=True,
         help_text='Загрузите картинку'
     )
+    avatar_thumbnails = models.JSONField(
+        'Миниатюры изображения профиля',
+        default=dict,
+        blank=True,
+        editable=False
+    )
     first_name = models.CharField(
         'Имя',
         max_length=NAME_LENGTH
@@ -179,6 +192,7 @@ class User(AbstractUser):
     )
     is_active = models.BooleanField(default=False)
     username = None
+    is_snapshot = False
 
     @property
     def is_admin(self):
@@ -195,3 +209,11 @@ class User(AbstractUser):
         :return: Строковое представление в формате "Имя Фамилия".
         """
         return f'{self.first_name} {self.last_name}'
+
+    def refresh_from_db(self, using=None, fields=None):
+        if self.is_snapshot and fields is not None:
+            # Снимок из users.authentication содержит только часть полей:
+            # догружаем все отложенные поля разом, а не по одному.
+            self.is_snapshot = False
+            fields = {*fields, *self.get_deferred_fields()}
+        super().refresh_from_db(using=using, fields=fields)
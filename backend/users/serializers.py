@@ -1,15 +1,19 @@
 from djoser.serializers import UserSerializer
+
+from core.images import SrcsetField
 from users.models import User
 
 
 class CustomUserSerializer(UserSerializer):
     """Сериализатор работы с пользователями."""
+    avatar_srcset = SrcsetField()
 
     class Meta:
         model = User
         fields = (
             'id',
             'email',
+            'avatar_srcset',
             'first_name',
             'last_name',
             'telegram',
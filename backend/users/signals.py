@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.images import avatar_changed
+from users.snapshots import bump_user_version
+from users.models import User
+from users.tasks import make_user_avatar_thumbnails
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    """Сбрасывает закэшированный снимок пользователя при изменении."""
+    bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def schedule_avatar_thumbnails(sender, instance, raw=False, **kwargs):
+    """Ставит в очередь обработку аватара после его загрузки."""
+    if not raw and avatar_changed(instance):
+        transaction.on_commit(
+            lambda: make_user_avatar_thumbnails.delay(instance.pk))
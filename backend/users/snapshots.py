@@ -0,0 +1,68 @@
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from core.cache import LRUCache
+from core.constants.users import (USER_SNAPSHOT_CACHE_SIZE,
+                                  USER_SNAPSHOT_CACHE_TTL,
+                                  USER_SNAPSHOT_LOCAL_TTL)
+
+USER_SNAPSHOT_FIELDS = ('id', 'role', 'is_active', 'is_staff')
+
+user_snapshots = LRUCache(USER_SNAPSHOT_CACHE_SIZE)
+
+
+def get_user_version_key(user_id) -> str:
+    return f'user:{user_id}:version'
+
+
+def bump_user_version(user_id) -> None:
+    """
+    Меняет версию пользователя, чтобы сбросить его закэшированные снимки.
+
+    Версия – монотонное время в наносекундах, поэтому она не повторяется
+    даже после вытеснения ключа из Redis.
+    """
+    caches[settings.CACHE_BACKEND].set(get_user_version_key(user_id),
+                                       time.time_ns(), None)
+
+
+def get_user_snapshot(user_id) -> Optional[dict]:
+    """
+    Возвращает снимок пользователя (USER_SNAPSHOT_FIELDS).
+
+    Снимок ищется в LRU-кэше процесса, затем в общем кэше по ключу
+    с текущей версией пользователя, и только при промахе загружается
+    из БД. Если версии в общем кэше нет, она создаётся заново, а
+    закэшированные ранее снимки не используются. В LRU снимок хранится
+    не дольше USER_SNAPSHOT_LOCAL_TTL секунд, даже если смена версии
+    до процесса не дошла.
+
+    :param user_id: ID пользователя.
+    :return: Словарь с полями снимка или None, если пользователя нет.
+    """
+    cache = caches[settings.CACHE_BACKEND]
+    version_key = get_user_version_key(user_id)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    else:
+        entry = user_snapshots.get((user_id, version))
+        if (entry is not None
+                and time.monotonic() - entry[0] < USER_SNAPSHOT_LOCAL_TTL):
+            return entry[1]
+
+    snapshot_key = f'user:{user_id}:snapshot:{version}'
+    snapshot = cache.get(snapshot_key)
+    if snapshot is None:
+        snapshot = get_user_model().objects.filter(pk=user_id).values(
+            *USER_SNAPSHOT_FIELDS).first()
+        if snapshot is None:
+            return None
+        cache.set(snapshot_key, snapshot, USER_SNAPSHOT_CACHE_TTL)
+    user_snapshots.set((user_id, version), (time.monotonic(), snapshot))
+    return snapshot
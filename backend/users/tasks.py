@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from core.images import update_avatar_thumbnails
+from users.models import User
+
+
+@shared_task(acks_late=True)
+def make_user_avatar_thumbnails(user_id) -> None:
+    """
+    Формирует миниатюры аватара пользователя в WebP и JPEG.
+
+    :param user_id: ID пользователя.
+    """
+    update_avatar_thumbnails(User, user_id)
@@ -1,8 +1,27 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.cache import caches
 from django.test import TestCase
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
 from users.models import User
 from django.core.exceptions import ValidationError
 
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.celery.celery_app import (activate_user, flush_email_outbox,
+                                    send_activation_email, send_email_batch)
+from core.constants.users import USER_SNAPSHOT_LOCAL_TTL
+from core.mail import EmailOutbox
+from users.authentication import CachedJWTAuthentication
 from users.serializers import CustomUserSerializer
+from users.snapshots import get_user_version_key
+from users.utils import ACTIVATED, ALREADY_ACTIVE
+from vacancies.tasks import archive_vacancies
 
 
 class UserModelTest(TestCase):
@@ -85,3 +104,112 @@ class CustomUserSerializerTest(TestCase):
         self.assertEqual(user.phone_number, data['phone_number'])
         self.assertEqual(user.company, data['company'])
         self.assertTrue(user.check_password(data['password']))
+
+
+class ActivateUserTaskTest(TestCase):
+    """Проверка активации пользователя в воркере"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='activate@example.com',
+            password='testpassword',
+            first_name='John',
+            last_name='Doe'
+        )
+        self.uid = urlsafe_base64_encode(force_bytes(self.user.pk))
+        self.token = default_token_generator.make_token(self.user)
+
+    def test_activate_user_is_idempotent(self):
+        self.assertEqual(activate_user(self.uid, self.token), ACTIVATED)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_active)
+        self.assertEqual(activate_user(self.uid, self.token), ALREADY_ACTIVE)
+
+    def test_activate_user_with_invalid_token(self):
+        activate_user(self.uid, 'invalid-token')
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+
+class ActivationEmailBatchTest(TestCase):
+    """Проверка пакетной отправки писем активации"""
+
+    def test_emails_are_sent_in_one_batch(self):
+        with mock.patch.object(flush_email_outbox, 'apply_async') as flush:
+            for index in range(3):
+                send_activation_email(f'/activate/{index}/',
+                                      [f'user{index}@example.com'])
+        flush.assert_called_once()
+
+        with mock.patch.object(send_email_batch, 'delay') as send:
+            self.assertEqual(flush_email_outbox(), 1)
+        messages = send.call_args.args[0]
+        self.assertEqual([message['to'] for message in messages],
+                         [['user0@example.com'], ['user1@example.com'],
+                          ['user2@example.com']])
+
+        self.assertEqual(send_email_batch(messages), 3)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_locked_flush_is_rescheduled(self):
+        outbox = EmailOutbox()
+        outbox.lock()
+        self.addCleanup(outbox.unlock)
+        with mock.patch.object(flush_email_outbox, 'apply_async') as flush:
+            self.assertEqual(flush_email_outbox(), 0)
+        flush.assert_called_once_with(countdown=settings.EMAIL_BATCH_WINDOW)
+
+    def test_email_tasks_acked_early(self):
+        """Письма не отправляются повторно после падения воркера"""
+        for task in (send_activation_email, flush_email_outbox,
+                     send_email_batch, activate_user):
+            with self.subTest(task=task.name):
+                self.assertFalse(task.acks_late)
+        self.assertTrue(archive_vacancies.acks_late)
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    """Проверка JWT-аутентификации по снимку пользователя из кэша"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='jwt@example.com',
+            password='testpassword',
+            first_name='John',
+            last_name='Doe',
+            is_active=True
+        )
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.authentication.get_user(self.token)
+        with self.assertNumQueries(0):
+            user = self.authentication.get_user(self.token)
+        self.assertEqual(user, self.user)
+        self.assertFalse(user.is_admin)
+        # Остальные поля догружаются одним запросом.
+        with self.assertNumQueries(1):
+            self.assertEqual((user.email, user.first_name),
+                             (self.user.email, self.user.first_name))
+
+    def test_snapshot_is_invalidated_on_save(self):
+        self.authentication.get_user(self.token)
+        self.user.role = User.ADMIN
+        self.user.save()
+        self.assertTrue(self.authentication.get_user(self.token).is_admin)
+
+    def test_local_snapshot_expires(self):
+        self.authentication.get_user(self.token)
+        # Изменение без сигнала: смена версии до процесса не дошла.
+        User.objects.filter(pk=self.user.pk).update(role=User.ADMIN)
+        cache = caches[settings.CACHE_BACKEND]
+        version = cache.get(get_user_version_key(self.user.pk))
+        cache.delete(f'user:{self.user.pk}:snapshot:{version}')
+        self.assertFalse(self.authentication.get_user(self.token).is_admin)
+        expired = time.monotonic() + USER_SNAPSHOT_LOCAL_TTL
+        with mock.patch('users.snapshots.time.monotonic',
+                        return_value=expired):
+            user = self.authentication.get_user(self.token)
+        self.assertTrue(user.is_admin)
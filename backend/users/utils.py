@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
+from djoser import signals
+
+from users.snapshots import bump_user_version
+
+ACTIVATED = 'activated'
+ALREADY_ACTIVE = 'already_active'
+
+
+class ActivationError(ValueError):
+    """Ошибка активации: неверный UID или токен."""
+
+
+def activate_user_by_token(uid: str, token: str) -> str:
+    """
+    Активирует пользователя по UID и токену из письма активации.
+
+    Токен проверяется стандартным генератором default_token_generator,
+    пользователь активируется одним UPDATE только если он ещё не
+    активен, поэтому повторный вызов с тем же токеном безопасен.
+
+    :param uid: UID пользователя в base64.
+    :param token: Токен активации.
+    :return: ACTIVATED, если пользователь активирован, или
+    ALREADY_ACTIVE, если он был активирован ранее.
+    :raises ActivationError: Если UID или токен неверны.
+    """
+    user_model = get_user_model()
+    try:
+        user = user_model.objects.get(pk=force_str(urlsafe_base64_decode(uid)))
+    except (TypeError, ValueError, OverflowError, user_model.DoesNotExist):
+        raise ActivationError('Неверный идентификатор пользователя.')
+
+    if not default_token_generator.check_token(user, token):
+        raise ActivationError('Неверный или устаревший токен активации.')
+
+    activated = user_model.objects.filter(
+        pk=user.pk, is_active=False
+    ).update(is_active=True)
+    if not activated:
+        return ALREADY_ACTIVE
+
+    bump_user_version(user.pk)
+    user.is_active = True
+    signals.user_activated.send(sender=activate_user_by_token, user=user,
+                                request=None)
+    return ACTIVATED
@@ -6,6 +6,7 @@ from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from djoser.views import UserViewSet
 from drf_yasg.utils import swagger_auto_schema
+from kombu.exceptions import OperationalError
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -16,6 +17,7 @@ from core.celery.celery_app import send_activation_email, activate_user
 from core.pagination import CustomPagination
 from users.models import User
 from users.serializers import CustomUserSerializer
+from users.utils import activate_user_by_token, ActivationError
 
 
 class CustomUserViewSet(UserViewSet):
@@ -85,6 +87,9 @@ class CustomUserViewSet(UserViewSet):
         """
         Активирует пользователя с заданным UID и токеном.
 
+        Активация выполняется задачей celery. Если брокер недоступен,
+        пользователь активируется синхронно в текущем процессе.
+
         :param request: Объект запроса.
         :param uid: Уникальный идентификатор пользователя.
         :param token: Токен активации.
@@ -92,8 +97,12 @@ class CustomUserViewSet(UserViewSet):
         :return: Ответ, указывающий на успешную активацию или ошибку.
         """
         try:
-            # Отправляем запрос на активацию аккаунта с помощью celery.
-            activate_user.delay(uid, token)
-        except Exception as error:
-            return Response(error, status=HTTP_400_BAD_REQUEST)
+            # Отправляем задачу активации аккаунта в celery.
+            activate_user.apply_async((uid, token), retry=False)
+        except OperationalError:
+            try:
+                activate_user_by_token(uid, token)
+            except ActivationError as error:
+                return Response({'detail': str(error)},
+                                status=HTTP_400_BAD_REQUEST)
         return Response(status=HTTP_204_NO_CONTENT)
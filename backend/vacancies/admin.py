@@ -1,6 +1,7 @@
 from django.contrib import admin
 from vacancies.models import (Vacancy, VacancySkill, VacancyEducationLevel,
-                              VacancySpecialization, VacancySchedule)
+                              VacancySpecialization, VacancySchedule,
+                              ArchivedVacancy)
 
 
 @admin.register(Vacancy)
@@ -36,3 +37,10 @@ class VacancyScheduleAdmin(admin.ModelAdmin):
     list_display = ('id', 'vacancy', 'schedule')
     list_filter = ('vacancy', 'schedule')
     search_fields = ('vacancy__name', 'schedule__name')
+
+
+@admin.register(ArchivedVacancy)
+class ArchivedVacancyAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'author', 'pub_date', 'archived_at')
+    list_filter = ('pub_date', 'archived_at')
+    search_fields = ('name',)
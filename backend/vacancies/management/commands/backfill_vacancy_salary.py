@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from core.constants.vacancies import VACANCY_BACKFILL_CHUNK_SIZE
+from vacancies.models import Vacancy
+from vacancies.utils import parse_salary
+
+
+class Command(BaseCommand):
+    """
+    Заполняет salary_min, salary_max и currency у существующих вакансий.
+
+    Вакансии читаются потоково через QuerySet.iterator(), изменённые
+    строки сохраняются пачками через bulk_update, поэтому команда
+    не держит в памяти всю таблицу.
+    """
+    help = 'Разбирает зарплаты существующих вакансий на вилку и валюту.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=VACANCY_BACKFILL_CHUNK_SIZE,
+            help='Количество вакансий, обрабатываемых за одну пачку.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        fields = ('salary_min', 'salary_max', 'currency')
+        vacancies = Vacancy.objects.only('id', 'salary', *fields).order_by(
+            'id'
+        )
+        batch = []
+        updated = 0
+        for vacancy in vacancies.iterator(chunk_size=chunk_size):
+            parsed = parse_salary(vacancy.salary)
+            if parsed == (vacancy.salary_min, vacancy.salary_max,
+                          vacancy.currency):
+                continue
+            vacancy.salary_min, vacancy.salary_max, vacancy.currency = parsed
+            batch.append(vacancy)
+            if len(batch) >= chunk_size:
+                Vacancy.objects.bulk_update(batch, fields)
+                updated += len(batch)
+                batch = []
+        if batch:
+            Vacancy.objects.bulk_update(batch, fields)
+            updated += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено вакансий: {updated}')
+        )
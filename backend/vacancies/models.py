@@ -1,9 +1,11 @@
 from django.db import models
 
-from core.constants.vacancies import (VACANCY_NAME_LENGTH, VACANCY_TEXT_LENGTH)
+from core.constants.vacancies import (VACANCY_NAME_LENGTH, VACANCY_TEXT_LENGTH,
+                                      VACANCY_CURRENCY_LENGTH)
 from shared_info.models import (Schedule, Skill, EducationLevel,
                                 Specialization, Location)
 from users.models import User
+from vacancies.utils import parse_salary
 
 
 class Vacancy(models.Model):
@@ -16,18 +18,31 @@ class Vacancy(models.Model):
         - location: Город вакансии.
         - text (str): Описание вакансии.
         - pub_date (datetime): Дата публикации вакансии.
+        - salary (str): Зарплата в свободной форме (для отображения).
+        - salary_min (int): Нижняя граница зарплаты, разобранная из salary.
+        - salary_max (int): Верхняя граница зарплаты, разобранная из salary.
+        - currency (str): Валюта зарплаты, разобранная из salary.
         - schedule (ManyToManyField): График работы.
         - specialization (ManyToManyField): Направление специальности.
         - required_skills (ManyToManyField): Ключевые навыки.
         - required_education_level (ManyToManyField): Грейд.
+        - updated_at (datetime): Дата изменения вакансии, в том числе её
+        навыков, грейдов, графиков работы и направлений.
+        - is_archived (bool): Признак архивной вакансии (всегда False).
 
     Мета:
         - verbose_name: Вакансия.
         - verbose_name_plural: Вакансии.
+        - indexes: Составные индексы для фильтрации и сортировки
+        по зарплате.
 
     Методы:
         - __str__(): Возвращает название вакансии в виде строки.
+        - save(): Разбирает зарплату на границы вилки и валюту
+        перед сохранением и обновляет дату изменения.
     """
+    is_archived = False
+
     name = models.CharField(
         verbose_name='Название вакансии',
         max_length=VACANCY_NAME_LENGTH,
@@ -65,6 +80,24 @@ class Vacancy(models.Model):
         null=False,
         help_text='Введите зарплату или зарплатную вилку'
     )
+    salary_min = models.PositiveIntegerField(
+        verbose_name='Зарплата от',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    salary_max = models.PositiveIntegerField(
+        verbose_name='Зарплата до',
+        null=True,
+        blank=True,
+        editable=False
+    )
+    currency = models.CharField(
+        verbose_name='Валюта',
+        max_length=VACANCY_CURRENCY_LENGTH,
+        blank=True,
+        editable=False
+    )
     schedule = models.ManyToManyField(
         Schedule,
         related_name='vacancies',
@@ -93,14 +126,38 @@ class Vacancy(models.Model):
         verbose_name='Грейд',
         help_text='Выберите грейд'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения'
+    )
 
     class Meta:
         verbose_name = 'Вакансия'
         verbose_name_plural = 'Вакансии'
+        indexes = (
+            models.Index(fields=('salary_min', 'salary_max'),
+                         name='vacancy_salary_range_idx'),
+            models.Index(fields=('currency', 'salary_min', 'salary_max'),
+                         name='vacancy_currency_salary_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.salary_min, self.salary_max, self.currency = parse_salary(
+            self.salary
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            # auto_now сохраняется только вместе с перечисленными полями.
+            update_fields = {*update_fields, 'updated_at'}
+            if 'salary' in update_fields:
+                update_fields |= {'salary_min', 'salary_max', 'currency'}
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
 
 class VacancySkill(models.Model):
     """
@@ -246,3 +303,106 @@ class VacancySpecialization(models.Model):
 
     def __str__(self):
         return f'{self.vacancy} – {self.specialization}'
+
+
+class ArchivedVacancy(models.Model):
+    """
+    Модель, представляющая вакансию в архиве.
+
+    Вакансии старше VACANCY_ARCHIVE_AFTER_DAYS переносятся из Vacancy
+    в эту таблицу задачей archive_vacancies, чтобы таблица и индексы
+    активных вакансий не разрастались за счёт старых публикаций.
+    Идентификатор архивной вакансии совпадает с идентификатором
+    исходной вакансии.
+
+    Атрибуты:
+        - Те же, что и у Vacancy.
+        - archived_at (datetime): Дата переноса вакансии в архив.
+
+    Мета:
+        - verbose_name: Архивная вакансия.
+        - verbose_name_plural: Архивные вакансии.
+
+    Методы:
+        - __str__(): Возвращает название вакансии в виде строки.
+    """
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(
+        verbose_name='Название вакансии',
+        max_length=VACANCY_NAME_LENGTH
+    )
+    author = models.ForeignKey(
+        User,
+        related_name='archived_vacancies',
+        on_delete=models.CASCADE,
+        verbose_name='Автор'
+    )
+    location = models.ForeignKey(
+        Location,
+        related_name='archived_vacancies',
+        on_delete=models.CASCADE,
+        verbose_name='Локация'
+    )
+    text = models.TextField(
+        max_length=VACANCY_TEXT_LENGTH,
+        verbose_name='Описание'
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата публикации'
+    )
+    salary = models.CharField(
+        verbose_name='Зарплата',
+        max_length=VACANCY_NAME_LENGTH
+    )
+    salary_min = models.PositiveIntegerField(
+        verbose_name='Зарплата от',
+        null=True,
+        blank=True
+    )
+    salary_max = models.PositiveIntegerField(
+        verbose_name='Зарплата до',
+        null=True,
+        blank=True
+    )
+    currency = models.CharField(
+        verbose_name='Валюта',
+        max_length=VACANCY_CURRENCY_LENGTH,
+        blank=True
+    )
+    archived_at = models.DateTimeField(
+        verbose_name='Дата архивации',
+        auto_now_add=True
+    )
+    schedule = models.ManyToManyField(
+        Schedule,
+        related_name='archived_vacancies',
+        verbose_name='График работы'
+    )
+    specialization = models.ManyToManyField(
+        Specialization,
+        related_name='archived_vacancies',
+        verbose_name='Направление специальности'
+    )
+    required_skills = models.ManyToManyField(
+        Skill,
+        related_name='archived_vacancies',
+        verbose_name='Ключевые навыки'
+    )
+    required_education_level = models.ManyToManyField(
+        EducationLevel,
+        related_name='archived_vacancies',
+        verbose_name='Грейд'
+    )
+
+    class Meta:
+        verbose_name = 'Архивная вакансия'
+        verbose_name_plural = 'Архивные вакансии'
+        indexes = (
+            models.Index(fields=('author', '-pub_date'),
+                         name='archived_vacancy_author_idx'),
+        )
+
+    def __str__(self):
+        return self.name
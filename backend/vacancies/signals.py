@@ -0,0 +1,57 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_cache_version
+from core.conditional import touch
+from vacancies.models import (ArchivedVacancy, Vacancy, VacancyEducationLevel,
+                              VacancySchedule, VacancySkill,
+                              VacancySpecialization)
+
+
+@receiver(post_save, sender=Vacancy)
+@receiver(post_save, sender=ArchivedVacancy)
+def invalidate_vacancy_counts(sender, instance, created=False, **kwargs):
+    """
+    Сбрасывает ответы с изменённой вакансией, а при появлении новой
+    вакансии ещё и сводку.
+    """
+    if created:
+        bump_cache_version('vacancies', f'vacancy:{instance.pk}')
+    else:
+        bump_cache_version(f'vacancy:{instance.pk}')
+
+
+@receiver(post_delete, sender=Vacancy)
+@receiver(post_delete, sender=ArchivedVacancy)
+@receiver((post_save, post_delete), sender=VacancySkill)
+@receiver((post_save, post_delete), sender=VacancyEducationLevel)
+@receiver((post_save, post_delete), sender=VacancySchedule)
+@receiver((post_save, post_delete), sender=VacancySpecialization)
+def invalidate_vacancy_read_models(sender, instance, **kwargs):
+    """
+    Сбрасывает сводку и подбор студентов для изменённой вакансии, а при
+    изменении её связей обновляет дату изменения вакансии.
+    """
+    vacancy_id = getattr(instance, 'vacancy_id', instance.pk)
+    if sender not in (Vacancy, ArchivedVacancy):
+        touch(Vacancy, (vacancy_id,))
+    bump_cache_version('vacancies', f'vacancy:{vacancy_id}')
+
+
+@receiver(m2m_changed, sender=VacancySkill)
+@receiver(m2m_changed, sender=VacancyEducationLevel)
+@receiver(m2m_changed, sender=VacancySchedule)
+@receiver(m2m_changed, sender=VacancySpecialization)
+def invalidate_vacancy_skills(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    """
+    Сбрасывает подбор студентов и ответы с вакансией и обновляет дату
+    её изменения при изменении навыков, грейдов, графиков работы или
+    направлений.
+    """
+    if not action.startswith('post_'):
+        return
+    vacancy_ids = (pk_set or ()) if reverse else (instance.pk,)
+    touch(Vacancy, vacancy_ids)
+    bump_cache_version('vacancies', *(f'vacancy:{vacancy_id}'
+                                      for vacancy_id in vacancy_ids))
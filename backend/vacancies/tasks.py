@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import bump_cache_version
+from core.constants.vacancies import VACANCY_ARCHIVE_BATCH_SIZE
+from vacancies.models import (ArchivedVacancy, Vacancy, VacancySkill,
+                              VacancyEducationLevel, VacancySchedule,
+                              VacancySpecialization)
+
+ARCHIVED_FIELDS = ('id', 'name', 'author_id', 'location_id', 'text',
+                   'pub_date', 'salary', 'salary_min', 'salary_max',
+                   'currency')
+ARCHIVED_RELATIONS = (
+    ('required_skills', VacancySkill, 'skill_id'),
+    ('required_education_level', VacancyEducationLevel, 'education_level_id'),
+    ('schedule', VacancySchedule, 'schedule_id'),
+    ('specialization', VacancySpecialization, 'specialization_id'),
+)
+
+
+def archive_vacancy_batch(vacancy_ids) -> None:
+    """
+    Переносит вакансии с указанными ID в архив в одной транзакции.
+
+    Копирует поля вакансий и их связи в ArchivedVacancy, после чего
+    удаляет связи и исходные строки массовыми DELETE без сигналов
+    (каскад Django удалял бы связи по одной, и сигнал каждой связи
+    обновлял бы удаляемую вакансию). Кэш вакансий сбрасывается один
+    раз за пачку после фиксации транзакции (см. bump_cache_version).
+
+    Args:
+        vacancy_ids: Список ID вакансий.
+    """
+    with transaction.atomic():
+        ArchivedVacancy.objects.bulk_create(
+            ArchivedVacancy(**values) for values in
+            Vacancy.objects.filter(id__in=vacancy_ids).values(
+                *ARCHIVED_FIELDS)
+        )
+        for field_name, model, related_field in ARCHIVED_RELATIONS:
+            field = ArchivedVacancy._meta.get_field(field_name)
+            through = field.remote_field.through
+            through.objects.bulk_create(
+                through(**{f'{field.m2m_field_name()}_id': vacancy_id,
+                           f'{field.m2m_reverse_field_name()}_id': related_id})
+                for vacancy_id, related_id in model.objects.filter(
+                    vacancy_id__in=vacancy_ids
+                ).values_list('vacancy_id', related_field)
+            )
+        for _, model, _ in ARCHIVED_RELATIONS:
+            queryset = model.objects.filter(vacancy_id__in=vacancy_ids)
+            queryset._raw_delete(queryset.db)
+        queryset = Vacancy.objects.filter(id__in=vacancy_ids)
+        queryset._raw_delete(queryset.db)
+        bump_cache_version('vacancies', *(f'vacancy:{vacancy_id}'
+                                          for vacancy_id in vacancy_ids))
+
+
+@shared_task(acks_late=True)
+def archive_vacancies(max_age_days=None,
+                      batch_size=VACANCY_ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Переносит в архив вакансии старше заданного количества дней.
+
+    Вакансии обрабатываются пачками, каждая пачка переносится в
+    отдельной транзакции, поэтому долгих блокировок таблицы нет.
+
+    :param max_age_days: Возраст вакансии в днях, по умолчанию
+    VACANCY_ARCHIVE_AFTER_DAYS из настроек.
+    :param batch_size: Количество вакансий в одной пачке.
+    :return: Количество перенесённых вакансий.
+    """
+    if max_age_days is None:
+        max_age_days = settings.VACANCY_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    stale = Vacancy.objects.filter(pub_date__lt=cutoff).order_by('id')
+
+    archived = 0
+    while True:
+        vacancy_ids = list(stale.values_list('id', flat=True)[:batch_size])
+        if not vacancy_ids:
+            return archived
+        archive_vacancy_batch(vacancy_ids)
+        archived += len(vacancy_ids)
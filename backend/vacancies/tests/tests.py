@@ -1,56 +1,75 @@
-from django.test import TestCase
+import gzip
+import json
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from users.models import User
-from students.models import Student
+from students.models import CompareStudent, Student
 from shared_info.models import (Location, Specialization, Course,
                                 EducationLevel, Schedule, Skill)
-from vacancies.models import Vacancy
+from vacancies.models import ArchivedVacancy, Vacancy
+from api.v1.tasks import precompute_popular_matches
+from core.cache import get_cache_version
+from core.constants.settings import CACHE_STATS_FLUSH_EVERY
+from core.db.metrics import ConnectionMetrics
+from shared_info.registry import reference_registry
+from vacancies.tasks import archive_vacancies
+from vacancies.utils import parse_salary
 
 
-class StudentViewSetTestCase(TestCase):
+class VacancyTestMixin:
     def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
-            email='test@yandex.ru',
-            password='123456',
-            first_name='Danya',
-            last_name='Nevskiy',
-        )
-        self.user.is_active = True
-
-        self.schedule = Schedule.objects.create(name='Гибкий график')
-        self.skill = Skill.objects.create(name='Python')
-        self.location = Location.objects.create(name='Москва')
-        self.specialization = Specialization.objects.create(name='Разработка')
-        self.course = Course.objects.create(name='Python-разработчик')
-        self.education_level = EducationLevel.objects.create(name='Junior')
-        self.student = Student.objects.create(
-            first_name='Иван',
-            last_name='Иванов',
-            location=self.location,
-            specialization=self.specialization,
-            course=self.course,
-            age=23,
-            education_level=self.education_level,
-        )
-        self.student.schedule.set([self.schedule])
-        self.student.skills.set([self.skill])
-
-        self.vacancy = Vacancy.objects.create(
-            name='Python-разработчик',
-            author=self.user,
-            location=self.location,
-            text='Берем всех',
-            salary='50$'
-        )
-        self.vacancy.schedule.set([self.schedule])
-        self.vacancy.required_skills.set([self.skill])
-        self.vacancy.required_education_level.set([self.education_level])
-        self.vacancy.specialization.set([self.specialization])
-
-        self.authorized_client = APIClient()
-        self.authorized_client.force_authenticate(self.user)
+        # Сигналы меняют версии кэша после фиксации транзакции.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client = APIClient()
+            self.user = User.objects.create_user(
+                email='test@yandex.ru',
+                password='123456',
+                first_name='Danya',
+                last_name='Nevskiy',
+            )
+            self.user.is_active = True
+
+            self.schedule = Schedule.objects.create(name='Гибкий график')
+            self.skill = Skill.objects.create(name='Python')
+            self.location = Location.objects.create(name='Москва')
+            self.specialization = Specialization.objects.create(
+                name='Разработка')
+            self.course = Course.objects.create(name='Python-разработчик')
+            self.education_level = EducationLevel.objects.create(name='Junior')
+            self.student = Student.objects.create(
+                first_name='Иван',
+                last_name='Иванов',
+                location=self.location,
+                specialization=self.specialization,
+                course=self.course,
+                age=23,
+                education_level=self.education_level,
+            )
+            self.student.schedule.set([self.schedule])
+            self.student.skills.set([self.skill])
+
+            self.vacancy = Vacancy.objects.create(
+                name='Python-разработчик',
+                author=self.user,
+                location=self.location,
+                text='Берем всех',
+                salary='50$'
+            )
+            self.vacancy.schedule.set([self.schedule])
+            self.vacancy.required_skills.set([self.skill])
+            self.vacancy.required_education_level.set([self.education_level])
+            self.vacancy.specialization.set([self.specialization])
+
+            self.authorized_client = APIClient()
+            self.authorized_client.force_authenticate(self.user)
 
+
+class VacancyViewSetTestCase(VacancyTestMixin, TestCase):
     def test_vacancy_match(self):
         response = self.authorized_client.get('/api/matching/1/')
         self.assertEqual(response.status_code, 200)
@@ -58,3 +77,271 @@ class StudentViewSetTestCase(TestCase):
         self.assertTrue(
             any(item['id'] == desired_vacancy_id for item in response.data)
         )
+
+    def test_vacancy_match_loads_vacancy_once(self):
+        """Вакансия и её навыки загружаются один раз за запрос."""
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Student.objects.create(
+                first_name='Пётр',
+                email='petrov@example.com',
+                last_name='Петров',
+                location=self.location,
+                specialization=self.specialization,
+                course=self.course,
+                age=25,
+                education_level=self.education_level,
+            )
+            other.skills.set([self.skill])
+        precompute_popular_matches()
+        reference_registry.all(Location)
+        # Вакансия, навыки вакансии, студенты, их навыки и графики,
+        # подбор берётся из кэша, справочники — из реестра.
+        with self.assertNumQueries(5):
+            response = self.authorized_client.get(
+                f'/api/matching/{self.vacancy.id}/')
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0]['matching_percentage'], 100)
+
+    def test_vacancy_match_export(self):
+        """Подбор и каталог студентов выгружаются потоковым CSV."""
+        response = self.authorized_client.get(
+            f'/api/matching/{self.vacancy.id}/export/')
+        self.assertEqual(response.status_code, 200)
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(rows[0].startswith('\ufeffID,'))
+        self.assertEqual(rows[1].split(',')[-2:], ['Python', '100'])
+
+        self.user.role = User.ADMIN
+        self.user.save()
+        response = self.authorized_client.get('/api/students/export/')
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(rows), 2)
+
+    def test_read_models_are_invalidated(self):
+        """Предрассчитанные модели чтения сбрасываются при изменениях."""
+        self.user.role = User.ADMIN
+        self.user.save()
+        response = self.authorized_client.get('/api/students/facets/')
+        self.assertEqual(response.data['skills'][0]['count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.skills.clear()
+        response = self.authorized_client.get('/api/students/facets/')
+        self.assertEqual(response.data['skills'], [])
+
+        response = self.authorized_client.get('/api/dashboard/')
+        self.assertEqual(response.data['top_skills'][0]['students'], 0)
+
+    def test_vacancy_salary_filter(self):
+        """Фильтры salary_gte/salary_lte работают по разобранной вилке."""
+        response = self.authorized_client.get(
+            '/api/vacancies/', {'salary_gte': 40, 'salary_lte': 60}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+
+        response = self.authorized_client.get(
+            '/api/vacancies/', {'salary_gte': 100}
+        )
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.authorized_client.get(
+            '/api/vacancies/', {'salary_gte': 'много'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_metrics(self):
+        """Метрики задач собираются сигналами и доступны администратору."""
+        archive_vacancies.apply(kwargs={'max_age_days': 0})
+        response = self.authorized_client.get('/api/tasks/metrics/')
+        self.assertEqual(response.status_code, 403)
+
+        self.user.role = User.ADMIN
+        self.user.save()
+        response = self.authorized_client.get('/api/tasks/metrics/')
+        metrics = response.data['vacancies.tasks.archive_vacancies']
+        self.assertEqual(metrics['succeeded'], 1)
+        self.assertEqual(metrics['failed'], 0)
+
+    def test_db_metrics(self):
+        """Открытие соединений учитывается и доступно администратору."""
+        self.user.role = User.ADMIN
+        self.user.save()
+        new_connection = connections.create_connection('default')
+        new_connection.ensure_connection()
+        new_connection.close()
+        response = self.authorized_client.get('/api/db/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(response.data['default']['opened'], 1)
+
+    def test_db_metrics_survive_cache_errors(self):
+        """Ошибка кэша метрик не мешает открывать соединения."""
+        metrics = ConnectionMetrics('test:db:metrics')
+        with mock.patch.object(LocMemCache, 'incr',
+                               side_effect=ConnectionError), \
+                self.assertLogs('core.db.metrics', 'ERROR'):
+            for _ in range(CACHE_STATS_FLUSH_EVERY):
+                metrics.incr('default', 'opened')
+        with mock.patch.object(LocMemCache, 'incr') as incr:
+            metrics.incr('default', 'reused')
+            metrics.observe('default', 'wait', 7)
+        incr.assert_not_called()
+        values = metrics.get(['default'])['default']
+        self.assertEqual(values['reused'], 1)
+        self.assertEqual(values['wait_max_ms'], 7)
+
+    def test_compare_matrix(self):
+        """Матрица сравнения с покрытием навыков вакансии."""
+        other_skill = Skill.objects.create(name='Django')
+        self.vacancy.required_skills.add(other_skill)
+        CompareStudent.objects.create(user=self.user, student=self.student)
+
+        response = self.authorized_client.get(
+            '/api/compare/',
+            {'mode': 'matrix', 'vacancy_id': self.vacancy.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['students'][0]['coverage'], 50)
+        skills = {row['name']: row for row in response.data['skills']}
+        self.assertEqual(skills['Python']['students'], [True])
+        self.assertEqual(skills['Django']['students'], [False])
+        self.assertTrue(skills['Django']['required'])
+        self.assertEqual(response.data['schedules'][0]['students'], [True])
+        self.assertEqual(
+            response.data['attributes']['locations'][0]['name'], 'Москва'
+        )
+
+    def test_vacancy_ordering_ignored_outside_list(self):
+        """Неизвестная сортировка – ошибка только для списка вакансий."""
+        response = self.authorized_client.get(
+            f'/api/vacancies/{self.vacancy.id}/', {'ordering': 'name'})
+        self.assertEqual(response.status_code, 200)
+        response = self.authorized_client.get(
+            '/api/vacancies/', {'ordering': 'name'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ReferenceBundleTestCase(VacancyTestMixin, TestCase):
+    def test_reference_not_modified(self):
+        """Справочники отдаются с ETag и 304 до изменения справочника."""
+        response = self.client.get('/api/reference/')
+        self.assertEqual(response.json()['skills'],
+                         [{'id': self.skill.id, 'name': 'Python'}])
+        etag = response['ETag']
+        response = self.client.get('/api/reference/',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Django')
+        response = self.client.get('/api/reference/',
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['skills']), 2)
+
+    def test_reference_gzip(self):
+        """Сжатый ответ имеет свой ETag, gzip;q=0 отключает сжатие."""
+        response = self.client.get('/api/reference/')
+        etag = response['ETag']
+        response = self.client.get('/api/reference/',
+                                   HTTP_IF_NONE_MATCH=etag,
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertNotEqual(response['ETag'], etag)
+        skills = json.loads(gzip.decompress(response.content))['skills']
+        self.assertEqual(len(skills), 1)
+        response = self.client.get('/api/reference/',
+                                   HTTP_IF_NONE_MATCH=response['ETag'],
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 304)
+
+        for accept_encoding in ('gzip;q=0', 'x-gzip', 'br'):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(
+                    '/api/reference/', HTTP_ACCEPT_ENCODING=accept_encoding)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response['ETag'], etag)
+
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_SIZE=0)
+    def test_reference_brotli_weak_etag(self):
+        """Слабый ETag ответа, сжатого brotli, даёт 304."""
+        brotli = mock.Mock(compress=mock.Mock(return_value=b'br'))
+        with mock.patch('core.middleware.brotli', brotli):
+            response = self.client.get('/api/reference/',
+                                       HTTP_ACCEPT_ENCODING='br')
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertTrue(response['ETag'].startswith('W/'))
+            response = self.client.get('/api/reference/',
+                                       HTTP_IF_NONE_MATCH=response['ETag'],
+                                       HTTP_ACCEPT_ENCODING='br')
+        self.assertEqual(response.status_code, 304)
+
+
+class ParseSalaryTestCase(VacancyTestMixin, TestCase):
+    def test_vacancy_salary_parsed_on_save(self):
+        """Зарплата разбирается на вилку и валюту при сохранении."""
+        self.vacancy.salary = 'от 100 000 до 150 000 руб.'
+        self.vacancy.save()
+        self.vacancy.refresh_from_db()
+        self.assertEqual(self.vacancy.salary_min, 100000)
+        self.assertEqual(self.vacancy.salary_max, 150000)
+        self.assertEqual(self.vacancy.currency, 'RUB')
+
+    def test_parse_salary(self):
+        """Вилкой считаются только числа, разделённые тире или «до»."""
+        cases = (
+            ('120 000 ₽ на руки, 13-я зп', (120000, 120000, 'RUB')),
+            ('2023 год, 100000', (100000, 100000, '')),
+            ('100-150 тыс.', (100000, 150000, '')),
+            ('от 100 000 до 150 000 руб.', (100000, 150000, 'RUB')),
+            ('до 200 тыс. ₽', (None, 200000, 'RUB')),
+            ('99999999999', (None, None, '')),
+        )
+        for salary, expected in cases:
+            with self.subTest(salary=salary):
+                self.assertEqual(tuple(parse_salary(salary)), expected)
+
+    def test_vacancy_salary_out_of_range_saved_empty(self):
+        """Слишком большая зарплата не попадает в поля вилки."""
+        self.vacancy.salary = '99999999999'
+        self.vacancy.save()
+        self.vacancy.refresh_from_db()
+        self.assertIsNone(self.vacancy.salary_min)
+        self.assertIsNone(self.vacancy.salary_max)
+
+
+class VacancyArchiveTestCase(VacancyTestMixin, TestCase):
+    def test_vacancy_archive(self):
+        """Старые вакансии уходят в архив и доступны по include_archived."""
+        self.assertEqual(archive_vacancies(max_age_days=0), 1)
+        self.assertFalse(Vacancy.objects.exists())
+        archived = ArchivedVacancy.objects.get(id=self.vacancy.id)
+        self.assertEqual(list(archived.required_skills.all()), [self.skill])
+
+        response = self.authorized_client.get('/api/vacancies/')
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.authorized_client.get(
+            '/api/vacancies/', {'include_archived': 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertTrue(response.data['results'][0]['is_archived'])
+
+    def test_vacancy_archive_batch_queries(self):
+        """Пачка архивируется без запросов на каждую связь вакансии."""
+        for number in range(5):
+            vacancy = Vacancy.objects.create(
+                name=f'Вакансия {number}', author=self.user,
+                location=self.location, text='Берем всех')
+            vacancy.required_skills.set([self.skill])
+            vacancy.schedule.set([self.schedule])
+        version = get_cache_version('vacancies')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(archive_vacancies(max_age_days=0), 6)
+        self.assertFalse(any(query['sql'].startswith('UPDATE')
+                             for query in queries.captured_queries))
+        self.assertEqual(len(callbacks), 1)
+        self.assertNotEqual(get_cache_version('vacancies'), version)
+        self.assertEqual(ArchivedVacancy.objects.count(), 6)
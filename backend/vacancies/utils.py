@@ -0,0 +1,143 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from core.constants.vacancies import SALARY_MAX_AMOUNT
+
+SALARY_NUMBER_PATTERN = re.compile(
+    r'(?P<number>\d+(?:[ \u00a0\u202f]\d{3})*(?:[.,]\d+)?)(?!\d)'
+    r'(?:\s*(?P<multiplier>k|к|тыс\w*\.?|млн\.?|m)(?![a-zа-яё]))?',
+    re.IGNORECASE
+)
+SALARY_MULTIPLIERS = {
+    'k': 1_000,
+    'к': 1_000,
+    'тыс': 1_000,
+    'млн': 1_000_000,
+    'm': 1_000_000,
+}
+SALARY_CURRENCIES = (
+    ('RUB', ('₽', 'руб', 'rub', 'р.')),
+    ('USD', ('$', 'usd', 'долл')),
+    ('EUR', ('€', 'eur', 'евро')),
+)
+SALARY_UPPER_BOUND_PATTERN = re.compile(r'(^|\s)(до|to|up to)\s*$',
+                                        re.IGNORECASE)
+SALARY_LOWER_BOUND_PATTERN = re.compile(r'(^|\s)(от|from)\s*$',
+                                        re.IGNORECASE)
+SALARY_RANGE_SEPARATOR_PATTERN = re.compile(r'^\s*(-|–|—|до|to)\s*$',
+                                            re.IGNORECASE)
+
+
+class SalaryRange(NamedTuple):
+    """
+    Разобранная зарплатная вилка вакансии.
+
+    Attributes:
+        - salary_min (int | None): Нижняя граница зарплаты.
+        - salary_max (int | None): Верхняя граница зарплаты.
+        - currency (str): Код валюты по ISO 4217 или пустая строка,
+        если валюту определить не удалось.
+    """
+    salary_min: Optional[int]
+    salary_max: Optional[int]
+    currency: str
+
+
+def _parse_amount(number: str, multiplier: Optional[str]) -> Optional[int]:
+    """
+    Переводит найденное в строке число в целое значение зарплаты.
+
+    Возвращает None, если значение больше SALARY_MAX_AMOUNT: такое
+    число не может быть зарплатой (и не поместится в поле integer).
+    """
+    number = re.sub(r'[ \u00a0\u202f]', '', number).replace(',', '.')
+    amount = float(number)
+    if multiplier:
+        amount *= SALARY_MULTIPLIERS[multiplier.lower().rstrip('.')[:3]]
+    if amount > SALARY_MAX_AMOUNT:
+        return None
+    return int(amount)
+
+
+def _find_range(salary: str,
+                matches: List[re.Match]) -> Optional[Tuple[int, int]]:
+    """
+    Ищет вилку: два соседних числа, разделённых «-», «–», «—» или «до».
+    """
+    for lower, upper in zip(matches, matches[1:]):
+        if not SALARY_RANGE_SEPARATOR_PATTERN.match(
+                salary[lower.end():upper.start()]):
+            continue
+        # В вилках вида «100-150 тыс.» множитель указан только у второго
+        # числа, но относится к обоим.
+        multiplier = upper.group('multiplier')
+        amounts = (
+            _parse_amount(lower.group('number'),
+                          lower.group('multiplier') or multiplier),
+            _parse_amount(upper.group('number'), multiplier),
+        )
+        if None not in amounts:
+            return min(amounts), max(amounts)
+    return None
+
+
+def parse_currency(salary: str) -> str:
+    """
+    Определяет валюту зарплаты по символам и сокращениям в строке.
+
+    Args:
+        salary (str): Зарплата в свободной форме.
+
+    Returns:
+        str: Код валюты или пустая строка.
+    """
+    lowered = salary.lower()
+    for code, markers in SALARY_CURRENCIES:
+        if any(marker in lowered for marker in markers):
+            return code
+    return ''
+
+
+def parse_salary(salary: str) -> SalaryRange:
+    """
+    Разбирает зарплату в свободной форме на границы вилки и валюту.
+
+    Поддерживаются форматы вида «50$», «100 000 – 150 000 руб.»,
+    «от 100k», «до 200 тыс. ₽». Вилкой считаются только два числа,
+    разделённые тире или «до». Иначе зарплатой считается наибольшее
+    число не больше SALARY_MAX_AMOUNT (в строке могут быть и другие
+    числа: «13-я зп», «2023 год»), а без предлогов «от»/«до» она
+    считается фиксированной.
+
+    Args:
+        salary (str): Зарплата в свободной форме.
+
+    Returns:
+        SalaryRange: Границы вилки и валюта. Если чисел в строке нет
+        (например, «по договорённости»), границы равны None.
+    """
+    salary = salary or ''
+    matches = list(SALARY_NUMBER_PATTERN.finditer(salary))
+    currency = parse_currency(salary)
+    if not matches:
+        return SalaryRange(None, None, currency)
+
+    salary_range = _find_range(salary, matches)
+    if salary_range is not None:
+        return SalaryRange(*salary_range, currency)
+
+    amounts = [
+        (_parse_amount(match.group('number'), match.group('multiplier')),
+         match) for match in matches
+    ]
+    amounts = [(amount, match) for amount, match in amounts
+               if amount is not None]
+    if not amounts:
+        return SalaryRange(None, None, currency)
+    amount, match = max(amounts, key=lambda item: item[0])
+    prefix = salary[:match.start()]
+    if SALARY_UPPER_BOUND_PATTERN.search(prefix):
+        return SalaryRange(None, amount, currency)
+    if SALARY_LOWER_BOUND_PATTERN.search(prefix):
+        return SalaryRange(amount, None, currency)
+    return SalaryRange(amount, amount, currency)